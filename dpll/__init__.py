@@ -1 +1,9 @@
-from dpll.main import dpll, dpll_model, dpll_equiv, dpll_equiv_with_cex, dpll_valid, dpll_valid_with_cex # noqa
\ No newline at end of file
+from dpll.main import dpll, dpll_batch, dpll_core, dpll_count, dpll_export, dpll_model, dpll_models, dpll_result, dpll_equiv, dpll_equiv_core, dpll_equiv_with_cex, dpll_valid, dpll_valid_core, dpll_valid_with_cex # noqa
+from dpll.budget import UNKNOWN, CancellationToken # noqa
+from dpll.cardinality import CardinalityEncoding # noqa
+from dpll.dimacs import iter_dimacs, read_dimacs, read_names, write_dimacs # noqa
+from dpll.heuristics import Heuristic # noqa
+from dpll.local_search import LocalSearchMethod # noqa
+from dpll.restarts import Restart # noqa
+from dpll.solver import SolverAlgorithm, SolverConfig # noqa
+from dpll.incremental import IncrementalSolver # noqa
@@ -0,0 +1,143 @@
+from collections import OrderedDict, deque
+from dataclasses import replace
+import logging
+import multiprocessing
+from multiprocessing.pool import AsyncResult
+import os
+from typing import Iterable, Iterator, NamedTuple
+
+from dpll.budget import Unknown
+from dpll.cnf_transformer import Config, Transformer
+from dpll.logic_tree import LogicTree
+from dpll.parser import Parser
+from dpll.solver import Solver, SolverAlgorithm, SolverConfig
+
+
+_logger = logging.getLogger(f"{__name__}")
+
+# Batch of each worker process, set up once by Batch._init_worker and reused for every chunk
+_worker_batch: "Batch | None" = None
+
+
+class BatchResult(NamedTuple):
+    """The answer for the expression at index of the batch, or the error it raised (as "Type: message") with satisfiable None"""
+    index: int
+    expression: str
+    satisfiable: bool | Unknown | None
+    error: str | None = None
+
+
+class Batch:
+    """
+    Solves many expressions, in this process or fanned out over a process pool.
+
+    Parsing and transforming usually cost far more than solving small formulas, so every
+    process keeps the clauses of the last cache_size expressions it transformed, evicting the
+    least recently used first. Repeated expressions then only pay for the search. Solver.solve
+    does not change the clauses it is given, so they can be shared between solves.
+
+    A pool hands out chunksize expressions at a time, which spreads the cost of sending tasks
+    and results between processes over many expressions. Only two chunks per process are in
+    flight at once, so a long generator of expressions is read as fast as it is solved rather
+    than all at once.
+    """
+
+    _CHUNKS_PER_PROCESS = 2
+
+    def __init__(self, algorithm: SolverAlgorithm, config: SolverConfig | None, transform_config: Config,
+                 cache_size: int = 1024):
+        self.algorithm = algorithm
+        self.config = config
+        self.transform_config = transform_config
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self._cache: OrderedDict[str, set[LogicTree]] = OrderedDict()
+
+    def _clauses(self, exp: str) -> set[LogicTree]:
+        clauses = self._cache.get(exp)
+        if clauses is not None:
+            self._cache.move_to_end(exp)
+            self.cache_hits += 1
+            return clauses
+        clauses = Transformer.transform(Parser.parse(exp), self.transform_config)
+        self._cache[exp] = clauses
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return clauses
+
+    def solve_one(self, index: int, exp: str) -> BatchResult:
+        """Solves exp, turning any exception into the error of its result"""
+        try:
+            satisfiable = Solver.solve(self._clauses(exp), algorithm=self.algorithm, config=self.config).satisfiable
+        except Exception as error:
+            _logger.debug(f"Expression {index} failed: {error!r}")
+            return BatchResult(index, exp, None, f"{type(error).__name__}: {error}")
+        return BatchResult(index, exp, satisfiable)
+
+    @staticmethod
+    def _init_worker(batch: "Batch") -> None:
+        global _worker_batch
+        _worker_batch = batch
+
+    @staticmethod
+    def _solve_chunk(chunk: list[tuple[int, str]]) -> list[BatchResult]:
+        assert _worker_batch is not None
+        return [_worker_batch.solve_one(index, exp) for index, exp in chunk]
+
+    @staticmethod
+    def _chunks(expressions: Iterable[str], chunksize: int) -> Iterator[list[tuple[int, str]]]:
+        """The numbered expressions in lists of chunksize, so each task and its results travel between processes at once"""
+        chunk: list[tuple[int, str]] = []
+        for item in enumerate(expressions):
+            chunk.append(item)
+            if len(chunk) == chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def run(self, expressions: Iterable[str], jobs: int | None = 1, ordered: bool = True,
+            chunksize: int = 64) -> Iterator[BatchResult]:
+        """
+        Yields a result for every expression, lazily. With jobs other than 1, jobs processes (one
+        per CPU if None) solve chunks of chunksize expressions; ordered yields the results in
+        input order, otherwise those of each chunk as soon as it is done.
+
+        The budget of the config applies to each expression separately. Its cancellation token
+        stops the whole batch: no more results are yielded once it is cancelled.
+        """
+        cancel = self.config.cancel if self.config is not None else None
+        if jobs == 1:
+            for index, exp in enumerate(expressions):
+                if cancel is not None and cancel.cancelled:
+                    return
+                yield self.solve_one(index, exp)
+            return
+
+        # Tokens and callbacks only work within one process; the token is polled here instead
+        worker = Batch(self.algorithm, replace(self.config, cancel=None, progress=None) if self.config is not None else None,
+                       self.transform_config, self.cache_size)
+        window = Batch._CHUNKS_PER_PROCESS * (jobs if jobs is not None else os.cpu_count() or 1)
+        chunks = Batch._chunks(expressions, chunksize)
+        pending: deque[AsyncResult[list[BatchResult]]] = deque()
+        with multiprocessing.Pool(jobs, Batch._init_worker, (worker,)) as pool:
+            while True:
+                while len(pending) < window:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    pending.append(pool.apply_async(Batch._solve_chunk, (chunk,)))
+                if not pending:
+                    return
+                if cancel is not None and cancel.cancelled:
+                    _logger.info("Batch cancelled")
+                    return
+                if ordered:
+                    done = pending[0] if pending[0].ready() else None
+                else:
+                    done = next((result for result in pending if result.ready()), None)
+                if done is None:
+                    pending[0].wait(0.05)
+                    continue
+                pending.remove(done)
+                yield from done.get()
@@ -0,0 +1,381 @@
+import argparse
+from dataclasses import replace
+import datetime
+import io
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, NamedTuple
+
+from dpll.cdcl import CDCLSolver
+from dpll.dimacs import iter_dimacs
+from dpll.main import dpll_result
+from dpll.proof import DratWriter, check_drat
+from dpll.restarts import Restart, make_restart_policy
+from dpll.solver import Solver, SolverAlgorithm, SolverConfig, SolverResult, default_solver_config
+
+
+_logger = logging.getLogger(f"{__name__}")
+
+INSTANCE_DIR = os.path.join(os.path.dirname(__file__), "benchmark_instances")
+
+
+class Instance(NamedTuple):
+    name: str
+    family: str
+    expected: bool  # satisfiability of what solve() checks
+    solve: Callable[[SolverAlgorithm, SolverConfig], SolverResult]
+
+
+class Families:
+    """
+    The benchmark families, all available offline.
+
+    rand3-<n> holds uniform random 3-SAT formulas over n variables at the 4.26 clauses per
+    variable threshold, satisfiable or not. generate() draws them once and bundles them as
+    DIMACS files whose headers say how each was drawn and how its answer was checked. uf50
+    and uuf50 are the first satisfiable and unsatisfiable instances of SATLIB's families of
+    those names. Pigeonhole, parity and equivalence instances are built on the fly.
+    """
+
+    RANDOM_CLAUSES = {20: 91, 50: 218, 75: 325, 100: 430, 125: 538, 150: 645, 175: 753, 200: 860, 225: 960, 250: 1065}
+    SATLIB = ("uf50", "uuf50")
+    BRUTE_FORCE_VARS = 20
+    DPLL_VARS = 150  # DPLL takes minutes to label larger ones
+    # Pairs that dpll_equiv should find equivalent, except where marked
+    EQUIVALENCES = {
+        "distributivity": ("a ∧ (b1 ∨ b2 ∨ b3 ∨ b4 ∨ b5 ∨ b6)",
+                           "(a ∧ b1) ∨ (a ∧ b2) ∨ (a ∧ b3) ∨ (a ∧ b4) ∨ (a ∧ b5) ∨ (a ∧ b6)", True),
+        "de-morgan": ("¬(x1 ∧ x2 ∧ x3 ∧ x4 ∧ x5 ∧ x6 ∧ x7 ∧ x8)", "¬x1 ∨ ¬x2 ∨ ¬x3 ∨ ¬x4 ∨ ¬x5 ∨ ¬x6 ∨ ¬x7 ∨ ¬x8", True),
+        "xor-association": ("¬(¬(¬(¬(x1 ↔ x2) ↔ x3) ↔ x4) ↔ x5)", "¬(x1 ↔ ¬(x2 ↔ ¬(x3 ↔ ¬(x4 ↔ x5))))", True),
+        "contraposition": ("(p1 ∧ p2 ∧ p3) → (q1 ∨ q2)", "(¬q1 ∧ ¬q2) → (¬p1 ∨ ¬p2 ∨ ¬p3)", True),
+        "absorption-mismatch": ("a ∨ (a ∧ b) ∨ (c ∧ (d ∨ e))", "a ∨ (c ∧ d)", False),
+    }
+
+    @staticmethod
+    def uniform_3sat(num_vars: int, num_clauses: int, rng: random.Random) -> list[list[int]]:
+        clauses = []
+        for _ in range(num_clauses):
+            clauses.append([var if rng.random() < 0.5 else -var for var in rng.sample(range(1, num_vars + 1), 3)])
+        return clauses
+
+    @staticmethod
+    def brute_force(clauses: list[list[int]], num_vars: int) -> bool:
+        """Whether any assignment satisfies clauses, trying all of them at once: bit a of each mask is a value under assignment a"""
+        everything = (1 << (1 << num_vars)) - 1
+        masks = []
+        for var in range(num_vars):
+            mask, width = ((1 << (1 << var)) - 1) << (1 << var), 1 << (var + 1)
+            while width < 1 << num_vars:
+                mask |= mask << width
+                width *= 2
+            masks.append(mask)
+        satisfied = everything
+        for clause in clauses:
+            holds = 0
+            for lit in clause:
+                holds |= masks[lit - 1] if lit > 0 else everything ^ masks[-lit - 1]
+            satisfied &= holds
+        return satisfied != 0
+
+    @staticmethod
+    def pigeonhole(holes: int) -> list[list[int]]:
+        """holes + 1 pigeons in holes holes; variable p * holes + h + 1 puts pigeon p in hole h"""
+        clauses = [[p * holes + h + 1 for h in range(holes)] for p in range(holes + 1)]
+        for h in range(holes):
+            for p in range(holes + 1):
+                for q in range(p + 1, holes + 1):
+                    clauses.append([-(p * holes + h + 1), -(q * holes + h + 1)])
+        return clauses
+
+    @staticmethod
+    def parity(size: int, seed: int) -> list[list[int]]:
+        """
+        The parity of variables 1..size asserted odd along one chain of XOR definitions and even
+        along a chain in shuffled order, which refutes it only after relating the two chains
+        """
+        clauses: list[list[int]] = []
+        next_var = size + 1
+        for order, parity in ((list(range(1, size + 1)), True), (random.Random(seed).sample(range(1, size + 1), size), False)):
+            acc = order[0]
+            for var in order[1:]:
+                out, next_var = next_var, next_var + 1  # out = acc xor var
+                clauses += [[-out, acc, var], [-out, -acc, -var], [out, -acc, var], [out, acc, -var]]
+                acc = out
+            clauses.append([acc if parity else -acc])
+        return clauses
+
+    @staticmethod
+    def _cnf_instance(name: str, family: str, expected: bool, clauses: list[list[int]]) -> Instance:
+        num_vars = max((abs(lit) for clause in clauses for lit in clause), default=0)
+
+        def solve(algorithm: SolverAlgorithm, config: SolverConfig) -> SolverResult:
+            return Solver.solve_cnf(clauses, num_vars, algorithm, config)
+        return Instance(name, family, expected, solve)
+
+    @staticmethod
+    def _equivalence_instance(name: str, expr1: str, expr2: str, equivalent: bool) -> Instance:
+        def solve(algorithm: SolverAlgorithm, config: SolverConfig) -> SolverResult:
+            # The formula dpll_equiv refutes; taken through dpll_result to keep the stats
+            return dpll_result(f"¬(({expr1}) = ({expr2}))", algorithm=algorithm, config=config)
+        return Instance(name, "equivalence", not equivalent, solve)
+
+    @staticmethod
+    def names() -> list[str]:
+        return [f"rand3-{n}" for n in Families.RANDOM_CLAUSES] + [*Families.SATLIB, "pigeonhole", "parity", "equivalence"]
+
+    @staticmethod
+    def _expected(path: str) -> bool:
+        """The answer a bundled file states in its "c expected: ..." header line"""
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("c expected: "):
+                    return line.split()[2] == "satisfiable"
+        raise ValueError(f"{path} does not state its expected answer")
+
+    @staticmethod
+    def load(family: str) -> list[Instance]:
+        match family:
+            case "pigeonhole":
+                return [Families._cnf_instance(f"php{holes}", family, False, Families.pigeonhole(holes)) for holes in (4, 5, 6)]
+            case "parity":
+                return [Families._cnf_instance(f"parity{size}", family, False, Families.parity(size, size))
+                        for size in (8, 12, 16)]
+            case "equivalence":
+                return [Families._equivalence_instance(name, *pair) for name, pair in Families.EQUIVALENCES.items()]
+            case _ if family in Families.names():
+                instances = []
+                for file in sorted(os.listdir(INSTANCE_DIR)):
+                    if file.startswith(f"{family}-") and file.endswith(".cnf"):
+                        path = os.path.join(INSTANCE_DIR, file)
+                        instances.append(Families._cnf_instance(file[:-4], family, Families._expected(path),
+                                                                list(iter_dimacs(path))))
+                return instances
+            case _:
+                raise ValueError(f"Unknown benchmark family {family}; choose from {', '.join(Families.names())}")
+
+    @staticmethod
+    def label(clauses: list[list[int]], num_vars: int) -> tuple[bool, str]:
+        """
+        Whether clauses are satisfiable and how that was found: by brute force for up to
+        BRUTE_FORCE_VARS variables and by DPLL for up to DPLL_VARS, which CDCL has to agree with.
+        Above that, CDCL's model is checked against the clauses or its DRAT proof with
+        check_drat, and CDCL with another seed and restart schedule has to agree.
+        """
+        if num_vars <= Families.BRUTE_FORCE_VARS:
+            satisfiable, engine = Families.brute_force(clauses, num_vars), "brute force over all assignments, CDCL agrees"
+        elif num_vars <= Families.DPLL_VARS:
+            answer = Solver.solve_cnf(clauses, num_vars, SolverAlgorithm.DPLL).satisfiable
+            assert isinstance(answer, bool)
+            satisfiable, engine = answer, "DPLL, CDCL agrees"
+        else:
+            proof = io.BytesIO()
+            solver = CDCLSolver(clauses, num_vars)
+            solver.proof = DratWriter(proof, binary=True)
+            answer = solver.solve()
+            solver.proof.flush()
+            assert isinstance(answer, bool)
+            if answer:
+                values = solver.model()
+                checked = all(any(values[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+            else:
+                checked = check_drat(clauses, proof.getvalue(), binary=True)
+            if not checked:
+                raise AssertionError(f"CDCL's {'model' if answer else 'proof'} does not check")
+            satisfiable = answer
+            engine = f"CDCL, {'model' if answer else 'DRAT proof'} checked, CDCL with another configuration agrees"
+        other = CDCLSolver(clauses, num_vars, restarts=make_restart_policy(Restart.GLUCOSE), seed=1)
+        if other.solve() is not satisfiable:
+            raise AssertionError(f"{engine.split(',')[0]} and CDCL disagree")
+        return satisfiable, engine
+
+    @staticmethod
+    def generate(directory: str = INSTANCE_DIR) -> None:
+        """
+        Draws the bundled rand3 instances again: the first three formulas from a generator
+        seeded with the variable count, up to 100 variables, and the first two above. None are
+        passed over, so the families are as hard as the draw makes them and mix both answers.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for num_vars, num_clauses in Families.RANDOM_CLAUSES.items():
+            rng = random.Random(num_vars)
+            for k in range(1, (3 if num_vars <= 100 else 2) + 1):
+                clauses = Families.uniform_3sat(num_vars, num_clauses, rng)
+                satisfiable, engine = Families.label(clauses, num_vars)
+                name = f"rand3-{num_vars}-{k:02}"
+                with open(os.path.join(directory, f"{name}.cnf"), "w", encoding="utf-8") as file:
+                    file.write(f"c {name}: uniform random 3-SAT over {num_vars} variables, not a SATLIB instance\n"
+                               f"c Formula {k} drawn from random.Random({num_vars}) by dpll.benchmark.Families.generate:\n"
+                               f"c {num_clauses} clauses of three distinct variables, each negated with probability 1/2\n"
+                               f"c expected: {'satisfiable' if satisfiable else 'unsatisfiable'} ({engine})\n"
+                               f"p cnf {num_vars} {num_clauses}\n")
+                    file.writelines(" ".join([*map(str, clause), "0\n"]) for clause in clauses)
+                _logger.info(f"Wrote {name}")
+
+
+class Benchmark:
+    """
+    Repeated timed runs over benchmark families, with a JSON history and regression checks.
+
+    Each instance runs repeats times. Its record holds the median and fastest wall time,
+    the peak memory Python allocated during one more run (tracemalloc slows the run down,
+    so it is never timed) and the search counters of SolverStats. A wrong answer raises
+    AssertionError, since its timing would mean nothing.
+
+    Formulas go through a set of clause trees on their way to CNF, so the clause order, and
+    with it the search, can change between runs of the same instance. Records note whether
+    the counters agreed across the repeats.
+    """
+
+    @staticmethod
+    def run_instance(instance: Instance, algorithm: SolverAlgorithm, config: SolverConfig,
+                     repeats: int = 3, memory: bool = True) -> dict[str, Any]:
+        times = []
+        counters = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = instance.solve(algorithm, config)
+            times.append(time.perf_counter() - start)
+            if result.satisfiable is not instance.expected:
+                raise AssertionError(f"{instance.name}: expected {instance.expected}, got {result.satisfiable}")
+            assert result.stats is not None
+            stats = result.stats.as_dict()
+            del stats["phases"]
+            counters.append(stats)
+        record: dict[str, Any] = {"family": instance.family, "median_time": statistics.median(times), "min_time": min(times),
+                                  "stats": counters[0], "deterministic": all(stats == counters[0] for stats in counters)}
+        if memory:
+            tracemalloc.start()
+            instance.solve(algorithm, config)
+            record["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return record
+
+    @staticmethod
+    def run(families: list[str], algorithm: SolverAlgorithm = SolverAlgorithm.CDCL, config: SolverConfig | None = None,
+            repeats: int = 3, memory: bool = True) -> dict[str, Any]:
+        """One history entry: the environment, and a record per instance name"""
+        solver_config = config if config is not None else default_solver_config
+        results: dict[str, Any] = {}
+        for family in families:
+            for instance in Families.load(family):
+                results[instance.name] = Benchmark.run_instance(instance, algorithm, solver_config, repeats, memory)
+                _logger.info(f"{instance.name}: {results[instance.name]['median_time']:.3f}s")
+        return {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "algorithm": str(algorithm),
+            "repeats": repeats,
+            "results": results,
+        }
+
+    @staticmethod
+    def speedup(families: list[str], workers: list[int], config: SolverConfig | None = None,
+                repeats: int = 3) -> dict[str, Any]:
+        """
+        Portfolio speedup curve: the total median time over the instances for each worker count,
+        and the speedup of each count over the first one
+        """
+        solver_config = config if config is not None else default_solver_config
+        instances = [instance for family in families for instance in Families.load(family)]
+        totals: dict[int, float] = {}
+        for count in workers:
+            worker_config = replace(solver_config, workers=count)
+            totals[count] = sum(Benchmark.run_instance(instance, SolverAlgorithm.PORTFOLIO, worker_config, repeats,
+                                                       memory=False)["median_time"] for instance in instances)
+            _logger.info(f"{count} workers: {totals[count]:.3f}s")
+        base = totals[workers[0]]
+        return {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "families": families,
+            "curve": [{"workers": count, "time": total, "speedup": base / total if total > 0 else 0.0}
+                      for count, total in totals.items()],
+        }
+
+    @staticmethod
+    def append_history(path: str, entry: dict[str, Any]) -> None:
+        """Appends entry to the JSON list in path, creating the file if needed"""
+        history: list[dict[str, Any]] = []
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                history = json.load(file)
+        history.append(entry)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(history, file, indent=1)
+
+    @staticmethod
+    def regressions(entry: dict[str, Any], baseline: dict[str, Any], time_tolerance: float = 0.25,
+                    min_seconds: float = 0.05, counter_tolerance: float = 0.1) -> list[str]:
+        """
+        Instances of entry that got worse than in baseline, as messages. The median time regressed
+        if it grew by more than time_tolerance (as a fraction) and min_seconds, which keeps
+        timer noise on fast instances quiet. Decisions, conflicts and propagations do not depend
+        on the machine, so growing by more than counter_tolerance flags a regression too, for
+        instances whose counters were deterministic in both runs.
+        """
+        messages = []
+        for name, record in entry["results"].items():
+            old = baseline["results"].get(name)
+            if old is None:
+                continue
+            if (record["median_time"] > old["median_time"] * (1 + time_tolerance)
+                    and record["median_time"] - old["median_time"] > min_seconds):
+                messages.append(f"{name}: median time {old['median_time']:.3f}s -> {record['median_time']:.3f}s")
+            if not (record["deterministic"] and old["deterministic"]):
+                continue
+            for counter in ("decisions", "conflicts", "propagations"):
+                before, after = old["stats"][counter], record["stats"][counter]
+                if after > before * (1 + counter_tolerance) and after - before > 10:
+                    messages.append(f"{name}: {counter} {before} -> {after}")
+        return messages
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m dpll.benchmark", description=Benchmark.__doc__.splitlines()[1].strip())
+    parser.add_argument("--families", default=",".join(Families.names()),
+                        help=f"comma separated, from {', '.join(Families.names())}")
+    parser.add_argument("--algorithm", default=str(SolverAlgorithm.CDCL), choices=[str(a) for a in SolverAlgorithm])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the extra run that measures peak memory")
+    parser.add_argument("--history", default="benchmark_history.json", help="JSON file every run is appended to")
+    parser.add_argument("--baseline", default="benchmark_baseline.json", help="run to compare against, if the file exists")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--speedup", metavar="WORKERS", help="portfolio speedup curve instead, e.g. 1,2,4,8")
+    args = parser.parse_args(argv)
+    families = args.families.split(",")
+
+    if args.speedup:
+        entry = Benchmark.speedup(families, [int(count) for count in args.speedup.split(",")], repeats=args.repeats)
+        for point in entry["curve"]:
+            print(f"{point['workers']:>3} workers  {point['time']:8.3f}s  speedup {point['speedup']:.2f}")
+        Benchmark.append_history(args.history, {"speedup": entry})
+        return 0
+
+    entry = Benchmark.run(families, SolverAlgorithm(args.algorithm), repeats=args.repeats, memory=not args.no_memory)
+    for name, record in entry["results"].items():
+        memory = f"  {record['peak_memory'] / 1024:8.0f} KiB" if "peak_memory" in record else ""
+        print(f"{name:<24} {record['median_time']:8.3f}s{memory}  {record['stats']['conflicts']:>8} conflicts")
+    Benchmark.append_history(args.history, entry)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(entry, file, indent=1)
+        return 0
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, encoding="utf-8") as file:
+        messages = Benchmark.regressions(entry, json.load(file))
+    for message in messages:
+        print(f"REGRESSION {message}")
+    return 1 if messages else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
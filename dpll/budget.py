@@ -0,0 +1,98 @@
+import math
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from dpll.stats import SolverStats
+
+if TYPE_CHECKING:
+    from dpll.solver import SolverConfig
+
+
+class Unknown:
+    """
+    Result of a search that ran out of budget or was cancelled before deciding satisfiability.
+    It has no truth value, so code that treats a result as a bool fails loudly instead of
+    mistaking UNKNOWN for UNSAT; compare with `is UNKNOWN` first.
+    """
+    _instance: "Unknown | None" = None
+
+    def __new__(cls) -> "Unknown":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __repr__(self) -> str:
+        return "UNKNOWN"
+
+    def __bool__(self) -> bool:
+        raise TypeError("UNKNOWN has no truth value, check `result is UNKNOWN` first")
+
+    def __reduce__(self) -> str:
+        return "UNKNOWN"  # unpickles to the module level singleton
+
+
+UNKNOWN = Unknown()
+
+
+class CancellationToken:
+    """Stops a running search from another thread; the search notices within a few hundred conflicts or decisions"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class Budget:
+    """
+    Resource limits for one call to a search engine. start() turns them into absolute targets
+    on the engine's counters, so an incremental engine gets the full budget on every call.
+
+    Engines call exhausted() at every conflict and decision. The counter limits are plain int
+    comparisons; the clock and the cancellation token are only read every 256th call.
+    """
+
+    _CHECK_MASK = 255
+
+    def __init__(self, timeout: float | None = None, max_conflicts: int | None = None, max_decisions: int | None = None,
+                 max_propagations: int | None = None, cancel: CancellationToken | None = None):
+        self.timeout = timeout
+        self.max_conflicts = max_conflicts
+        self.max_decisions = max_decisions
+        self.max_propagations = max_propagations
+        self.cancel = cancel
+
+    @staticmethod
+    def from_config(config: "SolverConfig") -> "Budget | None":
+        """The budget set by config, or None if it sets no limit"""
+        if (config.timeout is None and config.max_conflicts is None and config.max_decisions is None
+                and config.max_propagations is None and config.cancel is None):
+            return None
+        return Budget(config.timeout, config.max_conflicts, config.max_decisions, config.max_propagations, config.cancel)
+
+    def start(self, stats: SolverStats) -> None:
+        self._deadline = time.monotonic() + self.timeout if self.timeout is not None else math.inf
+        self._conflict_limit = stats.conflicts + self.max_conflicts if self.max_conflicts is not None else math.inf
+        self._decision_limit = stats.decisions + self.max_decisions if self.max_decisions is not None else math.inf
+        self._propagation_limit = (stats.propagations + self.max_propagations
+                                   if self.max_propagations is not None else math.inf)
+        self._ticks = self._CHECK_MASK  # so the first call already looks at the clock and the token
+
+    def exhausted(self, stats: SolverStats) -> bool:
+        if (stats.conflicts >= self._conflict_limit or stats.decisions >= self._decision_limit
+                or stats.propagations >= self._propagation_limit):
+            return True
+        self._ticks += 1
+        if self._ticks & self._CHECK_MASK:
+            return False
+        return self.out_of_time()
+
+    def out_of_time(self) -> bool:
+        """True once the timeout has passed or the token was cancelled"""
+        return time.monotonic() >= self._deadline or (self.cancel is not None and self.cancel.cancelled)
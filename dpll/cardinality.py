@@ -0,0 +1,81 @@
+from typing import Callable, Sequence
+
+from strenum import StrEnum
+
+from dpll.logic_tree import LogicTree
+from dpll.types import Operator
+
+# Encoders count literal trees (variables or negated variables) into unary outputs: outputs[j - 1]
+# is a fresh variable that holds exactly when at least j of the literals do, for j up to a cap.
+# Both directions are encoded, so the outputs can be used under any polarity.
+Fresh = Callable[[], LogicTree]
+
+
+class CardinalityEncoding(StrEnum):
+    """How Transformer lowers atmost/atleast/exactly constraints to clauses"""
+    SEQUENTIAL_COUNTER = "sequential"  # Sinz: O(n * k) clauses and variables
+    TOTALIZER = "totalizer"  # Bailleux and Boufkhad: O(n * k) variables, O(n * k) clauses in a balanced tree
+
+
+def negate(lit: LogicTree) -> LogicTree:
+    if lit.value is Operator.NEGATION:
+        assert lit.left is not None
+        return LogicTree(lit.left.value)
+    return LogicTree(Operator.NEGATION, left=LogicTree(lit.value))
+
+
+def clause(lits: Sequence[LogicTree | None]) -> LogicTree:
+    """The disjunction of copies of the literals; None stands for a false literal and is left out"""
+    present = [negate(negate(lit)) for lit in lits if lit is not None]
+    assert present
+    tree = present[0]
+    for lit in present[1:]:
+        tree = LogicTree(Operator.DISJUNCTION, left=tree, right=lit)
+    return tree
+
+
+def sequential_counter(lits: list[LogicTree], cap: int, fresh: Fresh, clauses: list[LogicTree]) -> list[LogicTree]:
+    """
+    Registers s[i][j] hold when at least j + 1 of the first i + 1 literals do:
+    s[i][j] = s[i - 1][j] ∨ (lits[i] ∧ s[i - 1][j - 1]), with s[i][j] false for j > i.
+    """
+    previous: list[LogicTree] = []
+    for i, lit in enumerate(lits):
+        current = [fresh() for _ in range(min(i + 1, cap))]
+        for j, register in enumerate(current):
+            below = previous[j - 1] if j > 0 else None  # at least j of the previous literals; true for j = 0
+            same = previous[j] if j < len(previous) else None  # at least j + 1 of them; false past i
+            if same is not None:
+                clauses.append(clause([negate(same), register]))
+            clauses.append(clause([negate(lit), negate(below) if below is not None else None, register]))
+            clauses.append(clause([negate(register), same, lit]))
+            if below is not None:
+                clauses.append(clause([negate(register), same, below]))
+        previous = current
+    return previous
+
+
+def totalizer(lits: list[LogicTree], cap: int, fresh: Fresh, clauses: list[LogicTree]) -> list[LogicTree]:
+    """
+    Counts each half recursively, then sets the outputs of the sum: at least i on the left and
+    j on the right give at least i + j, and at most i and at most j give at most i + j.
+    """
+    if len(lits) == 1:
+        return list(lits)
+    left = totalizer(lits[:len(lits) // 2], cap, fresh, clauses)
+    right = totalizer(lits[len(lits) // 2:], cap, fresh, clauses)
+    outputs = [fresh() for _ in range(min(len(lits), cap))]
+    for i in range(len(left) + 1):
+        for j in range(len(right) + 1):
+            if 0 < i + j:
+                # left[i - 1] ∧ right[j - 1] → outputs[i + j - 1], where index -1 stands for true
+                clauses.append(clause([negate(left[i - 1]) if i > 0 else None, negate(right[j - 1]) if j > 0 else None,
+                                       outputs[min(i + j, len(outputs)) - 1]]))
+            if i + j < len(outputs):
+                # ¬left[i] ∧ ¬right[j] → ¬outputs[i + j], where an index past the end stands for false
+                clauses.append(clause([left[i] if i < len(left) else None, right[j] if j < len(right) else None,
+                                       negate(outputs[i + j])]))
+    return outputs
+
+
+ENCODERS = {CardinalityEncoding.SEQUENTIAL_COUNTER: sequential_counter, CardinalityEncoding.TOTALIZER: totalizer}
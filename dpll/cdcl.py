@@ -0,0 +1,393 @@
+import logging
+import random
+
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence
+
+from dpll.budget import UNKNOWN, Budget, Unknown
+from dpll.heuristics import BranchingHeuristic, VSIDS
+from dpll.propagation import NO_REASON, WatchedPropagator
+from dpll.restarts import Luby, RestartPolicy
+
+if TYPE_CHECKING:
+    from dpll.portfolio import ClauseExchange
+    from dpll.proof import DratWriter
+
+
+_logger = logging.getLogger(f"{__name__}")
+
+
+class CDCLSolver(WatchedPropagator):
+    """
+    Conflict-driven clause learning search over integer clauses.
+
+    Learns 1-UIP clauses on every conflict and backjumps non-chronologically
+    to the second highest decision level of the learned clause. Decisions come from
+    the given heuristic, VSIDS by default, which is bumped with every variable seen
+    during conflict analysis.
+
+    The restart policy (Luby by default) decides when to drop back to level 0. With
+    phase saving, a variable is decided with the polarity it last had on the trail,
+    so a restarted search quickly rebuilds its previous assignment.
+
+    Learned clauses are reduced every reduce_interval conflicts, or sooner once more
+    than max_learned are stored: glue clauses (LBD <= 2) are kept for good, and the worse
+    half of the rest, by LBD and then activity, is deleted before storage is compacted.
+
+    The solver is incremental: clauses can be added between calls to solve, which keep
+    learned clauses and heuristic state, and each call can take assumption literals.
+    Clauses added after push() are guarded by a fresh selector variable that solve
+    assumes true; pop() asserts it false, which retires those clauses and everything
+    learned from them.
+
+    A seed gives every variable a random initial phase, which is how portfolio workers
+    with otherwise equal settings end up searching different parts of the space. With
+    an exchange attached, short learned clauses are published to it and clauses learned
+    by other workers are imported at every restart.
+
+    With a DratWriter as proof, every learned clause is written to it as a lemma, every
+    clause dropped by a reduction as a deletion, and the empty clause once the clauses are
+    found unsatisfiable. Imported clauses have no derivation, so proofs need a solver
+    without an exchange.
+    """
+
+    def __init__(self, clauses: Iterable[Iterable[int]], num_vars: int, heuristic: BranchingHeuristic | None = None,
+                 restarts: RestartPolicy | None = None, phase_saving: bool = True,
+                 reduce_interval: int = 2000, max_learned: int = 10000, seed: int | None = None):
+        super().__init__(num_vars, heuristic if heuristic is not None else VSIDS())
+        self._seen: list[bool] = [False] * (num_vars + 1)
+        self._restarts = restarts if restarts is not None else Luby()
+        self._phase_saving = phase_saving
+        self._saved_phase: list[int] = [0] * (num_vars + 1)  # 1 positive, -1 negative, 0 never assigned
+        self._random = random.Random(seed) if seed is not None else None
+        if self._random is not None:
+            self._saved_phase[1:] = [self._random.choice((1, -1)) for _ in range(num_vars)]
+
+        self._reduce_interval = reduce_interval
+        self._max_learned = max_learned
+        self._clause_increment = 1.0
+
+        self._scopes: list[int] = []  # selector variable of every open push()
+        self.failed_assumptions: list[int] = []
+        self.exchange: "ClauseExchange | None" = None
+        self.proof: "DratWriter | None" = None
+
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def _grow(self, num_vars: int) -> None:
+        extra = num_vars - self.num_vars
+        if extra > 0:
+            self._seen.extend([False] * extra)
+            if self._random is not None:
+                self._saved_phase.extend(self._random.choice((1, -1)) for _ in range(extra))
+            else:
+                self._saved_phase.extend([0] * extra)
+        super()._grow(num_vars)
+
+    def set_phases(self, values: Sequence[bool]) -> None:
+        """Decides every variable with the polarity it has in values (index 0 unused) until it is assigned otherwise"""
+        for var, value in enumerate(values[1:self.num_vars + 1], start=1):
+            self._saved_phase[var] = 1 if value else -1
+
+    def new_var(self) -> int:
+        self._grow(self.num_vars + 1)
+        return self.num_vars
+
+    def add_clause(self, clause: Iterable[int]) -> None:
+        """Adds a clause; inside a push() it only holds until the matching pop()"""
+        if self._scopes:
+            clause = [*clause, -self._scopes[-1]]
+        super().add_clause(clause)
+
+    def push(self, selector: int | None = None) -> None:
+        """Opens a scope guarded by selector, a fresh variable unless one is given"""
+        selector = selector if selector is not None else self.new_var()
+        self._grow(selector)
+        self._scopes.append(selector)
+
+    def pop(self) -> None:
+        """Permanently disables every clause added since the matching push()"""
+        selector = self._scopes.pop()
+        self.add_clause([-selector])
+
+    def _analyze(self, conflict: int) -> tuple[list[int], int]:
+        """
+        1-UIP conflict analysis. Returns the learned clause (asserting literal first)
+        and the level to backjump to.
+        """
+        seen = self._seen
+        level = self._level
+        trail = self._trail
+        lits = self._db.lits
+        starts = self._db.starts
+        sizes = self._db.sizes
+        current_level = self._decision_level()
+
+        learnt: list[int] = [0]
+        bumped: list[int] = []
+        pending = 0  # literals of the current level still to be resolved away
+        pivot = 0
+        index = len(trail) - 1
+        cid = conflict
+
+        while True:
+            assert cid != NO_REASON
+            start = starts[cid]
+            if self._db.learnt[cid]:
+                self._bump_clause(cid)
+            for lit in lits[start:start + sizes[cid]]:
+                var = abs(lit)
+                if var == pivot or seen[var] or level[var] == 0:
+                    continue
+                seen[var] = True
+                bumped.append(var)
+                if level[var] == current_level:
+                    pending += 1
+                else:
+                    learnt.append(lit)
+
+            while not seen[abs(trail[index])]:
+                index -= 1
+            pivot_lit = trail[index]
+            pivot = abs(pivot_lit)
+            index -= 1
+            seen[pivot] = False
+            pending -= 1
+            if pending == 0:
+                break
+            cid = self._reason[pivot]
+
+        learnt[0] = -pivot_lit
+        for lit in learnt[1:]:
+            seen[abs(lit)] = False
+        self._heuristic.on_conflict(bumped)
+
+        if len(learnt) == 1:
+            return learnt, 0
+
+        # Second watched position holds the literal with the highest level below the current one
+        max_i = max(range(1, len(learnt)), key=lambda i: level[abs(learnt[i])])
+        learnt[1], learnt[max_i] = learnt[max_i], learnt[1]
+        return learnt, level[abs(learnt[1])]
+
+    def _backtrack(self, target_level: int) -> None:
+        if self._phase_saving and len(self._trail_lim) > target_level:
+            saved_phase = self._saved_phase
+            for lit in self._trail[self._trail_lim[target_level]:]:
+                saved_phase[abs(lit)] = 1 if lit > 0 else -1
+        super()._backtrack(target_level)
+
+    def _lbd(self, clause: Iterable[int]) -> int:
+        """Literal block distance: the number of distinct decision levels in the clause"""
+        level = self._level
+        return len({level[abs(lit)] for lit in clause})
+
+    def _bump_clause(self, cid: int) -> None:
+        """Raises the activity of a learned clause used in conflict analysis and tightens its LBD"""
+        db = self._db
+        db.activity[cid] += self._clause_increment
+        if db.activity[cid] > 1e20:
+            for i in range(len(db.activity)):
+                db.activity[i] *= 1e-20
+            self._clause_increment *= 1e-20
+        if db.lbd[cid] > 2:
+            start = db.starts[cid]
+            db.lbd[cid] = min(db.lbd[cid], self._lbd(db.lits[start:start + db.sizes[cid]]))
+
+    def _reduce_db(self) -> None:
+        db = self._db
+        locked = {self._reason[abs(lit)] for lit in self._trail}
+        candidates = [cid for cid in range(len(db)) if db.learnt[cid] and db.lbd[cid] > 2 and cid not in locked]
+        candidates.sort(key=lambda cid: (-db.lbd[cid], db.activity[cid]))
+        removed = candidates[:len(candidates) // 2]
+        for cid in removed:
+            db.delete(cid)
+            if self.proof is not None:
+                self.proof.delete(db.clause(cid))
+
+        remap = db.compact()
+        reason = self._reason
+        for lit in self._trail:
+            if reason[abs(lit)] != NO_REASON:
+                reason[abs(lit)] = remap[reason[abs(lit)]]
+        # Watched literals sit in the first two positions, which compaction keeps
+        self._watches = [[] for _ in range(2 * self.num_vars + 1)]
+        for cid in range(len(db)):
+            self._attach(cid)
+
+        self.stats.reductions += 1
+        self.stats.deleted_clauses += len(removed)
+        _logger.debug(f"Reduced learned clauses by {len(removed)} to {db.num_learnt}")
+
+    def _import_shared(self) -> None:
+        """Adds the clauses other workers published since the last import; only called at level 0"""
+        assert self.exchange is not None
+        for clause in self.exchange.collect():
+            if any(self._lit_value[lit] == 1 for lit in clause):
+                continue
+            lits = [lit for lit in clause if self._lit_value[lit] == 0]
+            if not lits:
+                self._ok = False
+                return
+            if len(lits) == 1:
+                self._assign(lits[0], NO_REASON)
+            else:
+                cid = self._db.add(lits, learnt=True, lbd=len(lits))  # the length bounds the unknown LBD
+                self._attach(cid)
+            self.stats.imported_clauses += 1
+
+    def _analyze_final(self, lit: int) -> list[int]:
+        """
+        Assumptions that together imply lit, where lit is the negation of an assumption found
+        false. Returns them together with that assumption.
+        """
+        failed = [-lit]
+        if self._level[abs(lit)] == 0:
+            return failed
+        seen = self._seen
+        reason = self._reason
+        level = self._level
+        seen[abs(lit)] = True
+        for trail_lit in reversed(self._trail[self._trail_lim[0]:]):
+            var = abs(trail_lit)
+            if not seen[var]:
+                continue
+            if reason[var] == NO_REASON:
+                failed.append(trail_lit)  # only assumptions have been decided so far
+            else:
+                for other in self._db.clause(reason[var]):
+                    if level[abs(other)] > 0:
+                        seen[abs(other)] = True
+            seen[var] = False
+        return failed
+
+    def _refuted(self) -> bool:
+        """Records that the clauses are unsatisfiable on their own, ending the proof; returns False"""
+        self._ok = False
+        if self.proof is not None:
+            self.proof.add([])
+        return False
+
+    def solve(self, assumptions: Sequence[int] = (), budget: Budget | None = None) -> bool | Unknown:
+        """
+        Searches for a model in which every assumption literal holds. After an unsatisfiable
+        call, failed_assumptions holds the assumptions responsible (empty if the clauses
+        are unsatisfiable on their own). Returns UNKNOWN if the budget runs out first.
+        """
+        self.failed_assumptions = []
+        self._backtrack(0)
+        if not self._ok or self.propagate() != NO_REASON:
+            return self._refuted()
+
+        assumptions = [*self._scopes, *assumptions]
+        self._grow(max((abs(lit) for lit in assumptions), default=0))
+
+        stats = self.stats
+        if budget is not None:
+            budget.start(stats)
+        restarts = self._restarts
+        restarts.reset()
+        next_reduce = stats.conflicts + self._reduce_interval
+        learned_limit = self._max_learned
+        while True:
+            conflict = self.propagate()
+            if conflict != NO_REASON:
+                stats.conflicts += 1
+                if self._decision_level() == 0:
+                    return self._refuted()
+                if budget is not None and budget.exhausted(stats):
+                    self._backtrack(0)
+                    return UNKNOWN
+                learnt, backjump_level = self._analyze(conflict)
+                lbd = self._lbd(learnt)
+                restarts.on_conflict(lbd)
+                _logger.debug(f"Learned {learnt}, backjumping to level {backjump_level}")
+                self._backtrack(backjump_level)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], NO_REASON)
+                else:
+                    cid = self._db.add(learnt, learnt=True, lbd=lbd)
+                    self._db.activity[cid] = self._clause_increment
+                    self._attach(cid)
+                    self._assign(learnt[0], cid)
+                stats.learned_clauses += 1
+                self._clause_increment /= 0.999
+                if self.proof is not None:
+                    self.proof.add(learnt)
+                if self.exchange is not None:
+                    self.exchange.export(learnt, lbd)
+
+                if stats.conflicts >= next_reduce or self._db.num_learnt > learned_limit:
+                    self._reduce_db()
+                    next_reduce = stats.conflicts + self._reduce_interval
+                    # Glue and locked clauses survive every reduction; leave headroom above them
+                    learned_limit = max(self._max_learned, self._db.num_learnt + self._max_learned // 2)
+            else:
+                if restarts.should_restart() and self._decision_level() > 0:
+                    stats.restarts += 1
+                    restarts.on_restart()
+                    self._backtrack(0)
+                    if self.exchange is not None:
+                        self._import_shared()
+                        if not self._ok:
+                            return False
+                    continue
+
+                if self._decision_level() < len(assumptions):
+                    lit = assumptions[self._decision_level()]
+                    if self._lit_value[lit] == -1:
+                        failed = self._analyze_final(-lit)
+                        self.failed_assumptions = [lit for lit in dict.fromkeys(failed) if lit not in self._scopes]
+                        return False
+                    # An assumption that already holds still gets its own (empty) decision level
+                    self._trail_lim.append(len(self._trail))
+                    if self._lit_value[lit] == 0:
+                        self._assign(lit, NO_REASON)
+                    continue
+
+                if budget is not None and budget.exhausted(stats):
+                    self._backtrack(0)
+                    return UNKNOWN
+                lit = self._heuristic.pick()
+                if lit == 0:
+                    self._complete_xors()
+                    return True
+                if self._saved_phase[abs(lit)] != 0:
+                    lit = abs(lit) * self._saved_phase[abs(lit)]
+                stats.decisions += 1
+                self._trail_lim.append(len(self._trail))
+                if len(self._trail_lim) > stats.max_depth:
+                    stats.max_depth = len(self._trail_lim)
+                self._assign(lit, NO_REASON)
+
+    def models(self, projection: Sequence[int]) -> Iterator[list[int]]:
+        """
+        Lazily yields every assignment to the projection variables that extends to a model,
+        each exactly once, as literals in projection order.
+
+        The projection variables are searched chronologically as assumptions: a model fixes the
+        remaining ones, and then the last one not yet flipped is flipped. No blocking clauses are
+        added, so memory stays constant however many models there are. Clauses should not be
+        added while iterating.
+        """
+        self._grow(max(projection, default=0))
+        cube: list[int] = []
+        flipped: list[bool] = []  # per cube literal, whether it is the second branch
+        while True:
+            if self.solve(cube):
+                values = self.model()
+                for var in projection[len(cube):]:
+                    cube.append(var if values[var] else -var)
+                    flipped.append(False)
+                yield list(cube)
+            while flipped and flipped[-1]:
+                cube.pop()
+                flipped.pop()
+            if not flipped:
+                return
+            cube[-1] = -cube[-1]
+            flipped[-1] = True
+
+    def model(self) -> list[bool]:
+        """Value of each variable (index 0 unused) after a satisfiable solve()"""
+        return [False] + [self._lit_value[var] == 1 for var in range(1, self.num_vars + 1)]
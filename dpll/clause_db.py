@@ -0,0 +1,151 @@
+from array import array
+from typing import Iterable, Iterator
+
+
+class VariableMap:
+    """Interns variable names as ints numbered from 1, in order of first appearance"""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._names: list[str] = [""]  # index 0 unused
+        self._numbers: dict[str, int] = {}
+        for name in names:
+            self.number(name)
+
+    def __len__(self) -> int:
+        return len(self._names) - 1
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._numbers
+
+    def number(self, name: str) -> int:
+        """Number of the variable called name, allocating the next free number if it is new"""
+        number = self._numbers.get(name)
+        if number is None:
+            number = len(self._names)
+            self._numbers[name] = number
+            self._names.append(name)
+        return number
+
+    def literal(self, name: str, polarity: bool) -> int:
+        number = self.number(name)
+        return number if polarity else -number
+
+    def name(self, var: int) -> str:
+        return self._names[abs(var)]
+
+    def names(self) -> list[str]:
+        """Every name, in numbering order (variable 1 first)"""
+        return self._names[1:]
+
+
+class ClauseDatabase:
+    """
+    Clauses as DIMACS style signed int literals packed into one flat array('i').
+
+    Clause i occupies lits[starts[i]:starts[i] + sizes[i]]; clause ids are dense
+    so per-clause data can live in parallel arrays indexed by id. Learned clauses
+    also carry their literal block distance (lbd) and an activity score.
+    """
+
+    def __init__(self, clauses: Iterable[Iterable[int]] = ()):
+        self.lits = array('i')
+        self.starts = array('i')
+        self.sizes = array('i')
+        self.learnt = array('b')
+        self.lbd = array('i')
+        self.activity = array('d')
+        self.num_vars = 0
+        self.num_learnt = 0
+        self._deleted: set[int] = set()
+        for clause in clauses:
+            self.add(clause)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[list[int]]:
+        for cid in range(len(self.starts)):
+            yield self.clause(cid)
+
+    def add(self, clause: Iterable[int], learnt: bool = False, lbd: int = 0) -> int:
+        """Appends a clause and returns its id"""
+        start = len(self.lits)
+        self.lits.extend(clause)
+        size = len(self.lits) - start
+        if size:
+            self.num_vars = max(self.num_vars, max(abs(lit) for lit in self.lits[start:]))
+        self.starts.append(start)
+        self.sizes.append(size)
+        self.learnt.append(learnt)
+        self.lbd.append(lbd)
+        self.activity.append(0.0)
+        self.num_learnt += learnt
+        return len(self.starts) - 1
+
+    def add_packed(self, packed: array) -> None:
+        """
+        Appends every clause of packed, an array('i') in which each clause ends with a 0 like in
+        DIMACS. Loads many clauses far faster than add(), as the literals are only copied in slices.
+        """
+        if not packed:
+            return
+        self.num_vars = max(self.num_vars, max(packed), -min(packed))
+        lits, starts, sizes = self.lits, self.starts, self.sizes
+        count = 0
+        start = 0
+        while start < len(packed):
+            end = packed.index(0, start)
+            starts.append(len(lits))
+            sizes.append(end - start)
+            lits.extend(packed[start:end])
+            count += 1
+            start = end + 1
+        self.learnt.frombytes(bytes(count))
+        self.lbd.extend(array('i', [0]) * count)
+        self.activity.extend(array('d', [0.0]) * count)
+
+    def delete(self, cid: int) -> None:
+        """Marks a clause for removal by the next compact()"""
+        self._deleted.add(cid)
+
+    def truncate(self, size: int) -> None:
+        """Drops every clause from id size on, which must be the ones added last; far cheaper than delete() and compact()"""
+        if size >= len(self.starts):
+            return
+        del self.lits[self.starts[size]:]
+        self.num_learnt -= sum(self.learnt[size:])
+        for column in (self.starts, self.sizes, self.learnt, self.lbd, self.activity):
+            del column[size:]
+        self._deleted = {cid for cid in self._deleted if cid < size}
+
+    def compact(self) -> array:
+        """
+        Drops deleted clauses and repacks the rest, preserving their order and literal order.
+        Returns an array mapping every old clause id to its new id, or -1 if it was deleted.
+        """
+        remap = array('i', [-1]) * len(self.starts)
+        lits = array('i')
+        starts = array('i')
+        sizes = array('i')
+        learnt = array('b')
+        lbd = array('i')
+        activity = array('d')
+        for cid, start in enumerate(self.starts):
+            if cid in self._deleted:
+                continue
+            remap[cid] = len(starts)
+            starts.append(len(lits))
+            lits.extend(self.lits[start:start + self.sizes[cid]])
+            sizes.append(self.sizes[cid])
+            learnt.append(self.learnt[cid])
+            lbd.append(self.lbd[cid])
+            activity.append(self.activity[cid])
+        self.lits, self.starts, self.sizes = lits, starts, sizes
+        self.learnt, self.lbd, self.activity = learnt, lbd, activity
+        self.num_learnt = sum(learnt)
+        self._deleted.clear()
+        return remap
+
+    def clause(self, cid: int) -> list[int]:
+        start = self.starts[cid]
+        return self.lits[start:start + self.sizes[cid]].tolist()
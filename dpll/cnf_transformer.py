@@ -1,9 +1,10 @@
 import copy
 from dataclasses import dataclass
 import logging
+from dpll.cardinality import ENCODERS, CardinalityEncoding, negate
 from dpll.logic_tree import LogicTree
 from dpll.semantics import Semantics
-from dpll.types import Operator, Variable
+from dpll.types import Cardinality, CardinalityKind, Contradiction, Operator, Tautology, Variable
 
 
 # used internally by Transformer.naming
@@ -19,9 +20,22 @@ class Config:
         Applies the Tseytin transform, avoiding exponential blowup of clauses
         w.r.t the size of input tree. As this is an asymptotic assumption,
         usage may result in longer clauses for smaller input formulas.
+
+    native_xor (bool):
+        With the Tseytin transform, keeps every chain of equivalences as one parity
+        constraint: a tree of Operator.XOR nodes over literals whose XOR is true. Solver.solve
+        propagates these by Gauss-Jordan elimination rather than clauses, which for each
+        equivalence would otherwise duplicate both sides.
+
+    cardinality_encoding (CardinalityEncoding):
+        How atmost/atleast/exactly(k, ...) constraints become clauses: a sequential counter,
+        or a totalizer, whose balanced tree of adders gives shorter propagation chains. Either
+        counts only up to k + 1, so both take O(n * k) clauses for n operands.
     """
     disable_syntax_check: bool
     use_tseytin_transform: bool
+    native_xor: bool = False
+    cardinality_encoding: CardinalityEncoding = CardinalityEncoding.SEQUENTIAL_COUNTER
 
 
 default_config = Config(
@@ -39,13 +53,19 @@ class Transformer:
     _pedantic: bool = True
 
     @staticmethod
-    def transform(tree: LogicTree, input_config: Config | None = None) -> set[LogicTree]:
+    def transform(tree: LogicTree, input_config: Config | None = None,
+                  provenance: dict[LogicTree, LogicTree] | None = None) -> set[LogicTree]:
         """
         Main entry point. Transforms the input (prop. logic) parse tree into
         an equisatisfiable set of clauses (where each clause is still a tree).
 
         Optionally accepts a Config object, which configures optional features.
         See the dataclass itself
+
+        If a provenance dict is given, it maps every clause to the sub-formula of the input
+        it was generated from: the sub-formula a Tseytin name was defined for, or the whole
+        input for the clauses asserting it. The input tree is changed in place by naming,
+        so these sub-formulas are rebuilt trees that print like the input's nodes.
         """
         config = input_config if input_config is not None else default_config
 
@@ -54,21 +74,50 @@ class Transformer:
 
         _logger.info("Begin CNF transform")
 
+        counter_clauses: list[LogicTree] = []
+        definitions: list[LogicTree] = []
+        sources = provenance is not None  # sub-formulas are only rebuilt for provenance
+        tree = Transformer._lower_cardinality(tree, config.cardinality_encoding, counter_clauses, definitions, [0], sources)
+
         named_clauses: list[LogicTree] = []
         Semantics.polarise(tree)
+        for definition in definitions:
+            Semantics.polarise(definition)
         _logger.debug("Added polarity info to input tree")
 
+        xors: list[LogicTree] | None = [] if config.native_xor else None
         if config.use_tseytin_transform:
-            Transformer._naming(tree=tree, clauses=named_clauses)
+            Transformer._naming(tree=tree, clauses=named_clauses, xors=xors, sources=sources)
             named_clauses.append(tree)
+            for definition in definitions:
+                Transformer._naming(tree=definition, clauses=named_clauses, first=False, xors=xors, sources=sources)
+                named_clauses.append(definition)
             _logger.debug(f"Tseytin transform applied. Resultant formulas: {"\n".join(map(str, named_clauses))}")
         else:
+            named_clauses.append(tree)
+            named_clauses.extend(definitions)
             _logger.debug("Tseytin transform disabled")
 
-        clauses: set[LogicTree] = set()
+        clauses: set[LogicTree] = set(counter_clauses)
+        if provenance is not None:
+            for counter_clause in counter_clauses:
+                provenance[counter_clause] = Transformer._source(counter_clause)
 
         for x in named_clauses:
-            Transformer._generate_clauses(x, clauses)
+            if provenance is None:
+                Transformer._generate_clauses(x, clauses)
+                continue
+            generated: set[LogicTree] = set()
+            Transformer._generate_clauses(x, generated)
+            source = Transformer._source(x)
+            for clause in generated:
+                provenance[clause] = source
+            clauses |= generated
+
+        for xor in xors or ():
+            clauses.add(xor)
+            if provenance is not None:
+                provenance[xor] = Transformer._source(xor)
 
         _logger.debug(f"Generated {len(clauses)} clauses: {'\n'.join(map(str, clauses))}")
         _logger.info("CNF transform done")
@@ -159,6 +208,10 @@ class Transformer:
                 new_right = Transformer._push_negations(new_right)
                 new_tree = LogicTree(inv_op, left=new_left, right=new_right)
                 return new_tree
+            case (Operator.NEGATION, Operator.NEGATION):
+                # ¬¬X is X; X may itself be a negated conjunction or disjunction that needs pushing
+                assert tree.left is not None and tree.left.left is not None
+                return Transformer._push_negations(tree.left.left)
             case (Operator(), _):
                 new_left, new_right = LogicTree.map_lr_if_not_none(Transformer._push_negations, tree)
                 new_tree = LogicTree(tree.value, left=new_left, right=new_right)
@@ -196,8 +249,9 @@ class Transformer:
         temp
         """
         left_tree, right_tree = LogicTree.map_lr_if_not_none(Transformer._dnf_to_cnf, tree)
-        left_tree_value = tree.left_value_if_not_none()
-        right_tree_value = tree.right_value_if_not_none()
+        # Match on the converted children, which may have become conjunctions
+        left_tree_value = left_tree.value if left_tree is not None else None
+        right_tree_value = right_tree.value if right_tree is not None else None
 
         match (tree.value, left_tree_value, right_tree_value):
             case (Operator.NEGATION, _, _):
@@ -246,6 +300,70 @@ class Transformer:
             case _:
                 clauses.add(tree)
 
+    @staticmethod
+    def _source(tree: LogicTree) -> LogicTree:
+        """The input sub-formula a tree stands for, with the names given by _naming expanded back"""
+        if tree.source is not None:
+            return tree.source
+        left_tree, right_tree = LogicTree.map_lr_if_not_none(Transformer._source, tree)
+        return LogicTree(tree.value, left=left_tree, right=right_tree, operands=list(map(Transformer._source, tree.operands)))
+
+    @staticmethod
+    def _lower_cardinality(tree: LogicTree, encoding: CardinalityEncoding, clauses: list[LogicTree],
+                           definitions: list[LogicTree], fresh_num: list[int], sources: bool = False) -> LogicTree:
+        """
+        Returns tree with every cardinality constraint replaced by outputs of a counter over its
+        operands, whose clauses go to clauses. Operands that are not literals get fresh names,
+        defined by the equivalences added to definitions. fresh_num is a singleton list acting
+        like an int by reference. With sources, the new nodes remember the constraint (see _source).
+        """
+        if tree.left is not None:
+            tree.left = Transformer._lower_cardinality(tree.left, encoding, clauses, definitions, fresh_num, sources)
+        if tree.right is not None:
+            tree.right = Transformer._lower_cardinality(tree.right, encoding, clauses, definitions, fresh_num, sources)
+        if not isinstance(tree.value, Cardinality):
+            return tree
+
+        def fresh() -> LogicTree:
+            fresh_num[0] += 1
+            return LogicTree(Variable("Σ" + str(fresh_num[0])))
+
+        source = Transformer._source(tree) if sources else None
+        lits: list[LogicTree] = []
+        for operand in tree.operands:
+            operand = Transformer._lower_cardinality(operand, encoding, clauses, definitions, fresh_num, sources)
+            negated = operand.left if operand.value is Operator.NEGATION else None
+            if isinstance(operand.value, Variable) or negated is not None and isinstance(negated.value, Variable):
+                lits.append(operand)
+                continue
+            name = fresh()
+            definition = LogicTree(Operator.EQUIVALENCE, left=name, right=operand)
+            definition.source = source
+            definitions.append(definition)
+            lits.append(LogicTree(name.value))
+
+        # outputs[j - 1] holds when at least j operands do, counting no further than one past the bound.
+        # negate(negate(output)) copies an output, which must not share nodes with the counter clauses
+        kind, bound = tree.value.kind, tree.value.bound
+        generated: list[LogicTree] = []
+        outputs = ENCODERS[encoding](lits, bound + 1, fresh, generated) if lits else []
+        for counter_clause in generated:
+            counter_clause.source = source
+        clauses.extend(generated)
+
+        at_least = LogicTree(Tautology()) if bound == 0 else (
+            negate(negate(outputs[bound - 1])) if bound <= len(outputs) else LogicTree(Contradiction()))
+        at_most = negate(outputs[bound]) if bound < len(outputs) else LogicTree(Tautology())
+        match kind:
+            case CardinalityKind.ATMOST:
+                replacement = at_most
+            case CardinalityKind.ATLEAST:
+                replacement = at_least
+            case CardinalityKind.EXACTLY:
+                replacement = LogicTree(Operator.CONJUNCTION, left=at_least, right=at_most)
+        replacement.source = source
+        return replacement
+
     @staticmethod
     def _get_lr_pol_mult(tree: LogicTree) -> tuple[int, int]:
         match tree.value:
@@ -261,26 +379,81 @@ class Transformer:
                 return (999, 999)
 
     @staticmethod
-    def _naming(tree: LogicTree, clauses: list[LogicTree], first: bool = True, pol: int = 1) -> None:
+    def _xor_chain(tree: LogicTree, operands: list[LogicTree]) -> int:
+        """
+        Collects the operands of the chain of equivalences and negations at tree, and returns the
+        constant c for which tree = operand_1 ⊕ ... ⊕ operand_k ⊕ c, as a ↔ b = a ⊕ b ⊕ 1
+        """
+        match tree.value:
+            case Operator.EQUIVALENCE:
+                assert tree.left is not None and tree.right is not None
+                return 1 ^ Transformer._xor_chain(tree.left, operands) ^ Transformer._xor_chain(tree.right, operands)
+            case Operator.NEGATION:
+                assert tree.left is not None
+                return 1 ^ Transformer._xor_chain(tree.left, operands)
+            case Tautology():
+                return 1
+            case Contradiction():
+                return 0
+            case _:
+                operands.append(tree)
+                return 0
+
+    @staticmethod
+    def _naming_xor(tree: LogicTree, clauses: list[LogicTree], xors: list[LogicTree], sources: bool = False) -> None:
+        """
+        Names the equivalence chain at tree n and adds n ⊕ operands ⊕ c as one parity constraint
+        (see _xor_chain), naming every operand that is not a variable on its own.
+        """
+        global _current_fresh_num
+
+        operands: list[LogicTree] = []
+        constant = Transformer._xor_chain(tree, operands)
+        for operand in operands:
+            Transformer._naming(operand, clauses, first=False, pol=0, xors=xors, sources=sources)
+
+        newvar = Variable("n"+str(_current_fresh_num))
+        _current_fresh_num += 1
+        # The XOR of the leaves is true: n = operands ⊕ c, so n ⊕ operands = c, flipped by negating n if c = 0
+        xor: LogicTree = LogicTree(newvar) if constant else LogicTree(Operator.NEGATION, left=LogicTree(newvar))
+        for operand in operands:
+            xor = LogicTree(Operator.XOR, left=xor, right=LogicTree(operand.value))
+        xors.append(xor)
+
+        if sources:
+            xor.source = tree.source = Transformer._source(tree)
+        tree.value = newvar
+        tree.left = None
+        tree.right = None
+
+    @staticmethod
+    def _naming(tree: LogicTree, clauses: list[LogicTree], first: bool = True, pol: int = 1,
+                xors: list[LogicTree] | None = None, sources: bool = False) -> None:
         """
         Post-order traversal to name from bottom up
         IMPORTANT: We assume tseytin transformation has been applied already,
                    such that at most there is one embedded equivalenci
         current_fresh_num is a singleton list acting like an int by reference
+        With xors, chains of equivalences become parity constraints there instead (see _naming_xor)
+        With sources, every named node and its definition remember the sub-formula it stood for (see _source)
         """
         global _current_fresh_num
 
         if first:
             _current_fresh_num = 0
 
+        if xors is not None and tree.value is Operator.EQUIVALENCE:
+            Transformer._naming_xor(tree, clauses, xors, sources)
+            return
+
         left_mult, right_mult = Transformer._get_lr_pol_mult(tree)
         left_pol = left_mult * pol
         right_pol = right_mult * pol
 
         if tree.left is not None:
-            Transformer._naming(tree.left, clauses, first=False, pol=left_pol)
+            Transformer._naming(tree.left, clauses, first=False, pol=left_pol, xors=xors, sources=sources)
         if tree.right is not None:
-            Transformer._naming(tree.right, clauses, first=False, pol=right_pol)
+            Transformer._naming(tree.right, clauses, first=False, pol=right_pol, xors=xors, sources=sources)
 
         match tree.value:
             case (Operator.NEGATION):
@@ -288,15 +461,18 @@ class Transformer:
             case Operator():
                 newvar = Variable("n"+str(_current_fresh_num))
                 if pol == 1:
-                    clauses.append(LogicTree(Operator.IMPLICATION, left=LogicTree(newvar), right=copy.deepcopy(tree)))
+                    definition = LogicTree(Operator.IMPLICATION, left=LogicTree(newvar), right=copy.deepcopy(tree))
                 elif pol == 0:
-                    clauses.append(LogicTree(Operator.EQUIVALENCE, left=LogicTree(newvar), right=copy.deepcopy(tree)))
+                    definition = LogicTree(Operator.EQUIVALENCE, left=LogicTree(newvar), right=copy.deepcopy(tree))
                 elif pol == -1:
-                    clauses.append(LogicTree(Operator.IMPLICATION, left=copy.deepcopy(tree), right=LogicTree(newvar)))
+                    definition = LogicTree(Operator.IMPLICATION, left=copy.deepcopy(tree), right=LogicTree(newvar))
                 else:
                     raise RuntimeError(f"Got undefined polarity {pol}")
+                clauses.append(definition)
 
-                # Update current node
+                # Update current node, remembering what it stood for (see _source)
+                if sources:
+                    definition.source = tree.source = Transformer._source(tree)
                 tree.value = newvar
                 tree.left = None
                 tree.right = None
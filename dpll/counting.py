@@ -0,0 +1,192 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import logging
+from typing import Iterable
+
+from dpll.cdcl import CDCLSolver
+
+
+_logger = logging.getLogger(f"{__name__}")
+
+Component = frozenset[tuple[int, ...]]
+
+
+class ModelCounter:
+    """
+    Exact projected model counting (#SAT) by DPLL-style search with component caching.
+
+    The count is the number of assignments to the projection variables (every variable
+    by default) that extend to a model. After unit propagation, the remaining clauses are
+    split into connected components, which share no variables and so can be counted
+    separately and multiplied. Each component is counted by branching on its projection
+    variable with the most occurrences. A component without projection variables counts
+    as 1 if it is satisfiable, which a CDCL search decides, and 0 otherwise.
+
+    Component counts are cached under their clause set. Components come back often in
+    different branches, and the cache keeps at most cache_size of them, evicting the least
+    recently used first.
+    """
+
+    def __init__(self, clauses: Iterable[Iterable[int]], num_vars: int, projection: Iterable[int] | None = None,
+                 cache_size: int = 100000):
+        self.num_vars = num_vars
+        self.cache_size = cache_size
+        self.decisions = 0
+        self.cache_hits = 0
+        self._projection = set(abs(var) for var in projection) if projection is not None else set(range(1, num_vars + 1))
+        self._clauses: list[tuple[int, ...]] = []
+        for clause in clauses:
+            lits = set(clause)
+            if not any(-lit in lits for lit in lits):
+                self._clauses.append(tuple(sorted(lits)))
+        self._cache: OrderedDict[Component, int] = OrderedDict()
+
+    def count(self) -> int:
+        """
+        Counts with an explicit stack of frames rather than recursion, since the search goes
+        one frame deeper for every decision and component split. result carries the value of
+        the frame that just finished back to the one below it, and is None after a push.
+        """
+        stack: list[_Product | _Branch] = []
+        result = self._open_count(self._clauses, self._projection, stack)
+        while stack:
+            frame = stack[-1]
+            if isinstance(frame, _Product):
+                if result is not None:
+                    frame.value *= result
+                if frame.value == 0 or not frame.components:
+                    stack.pop()
+                    result = frame.value
+                    continue
+                result = self._open_component(frame.components.pop(), stack)
+            else:
+                if result is not None:
+                    frame.value += result
+                if not frame.lits:
+                    stack.pop()
+                    self._store(frame.component, frame.value)
+                    result = frame.value
+                    continue
+                conditioned = self._condition(frame.component, frame.lits.pop())
+                result = 0 if conditioned is None else self._open_count(conditioned, frame.scope, stack)
+        assert result is not None
+        return result
+
+    @staticmethod
+    def _condition(clauses: Iterable[tuple[int, ...]], lit: int) -> list[tuple[int, ...]] | None:
+        """The clauses under lit, or None if one of them becomes empty"""
+        result: list[tuple[int, ...]] = []
+        for clause in clauses:
+            if lit in clause:
+                continue
+            if -lit in clause:
+                clause = tuple(other for other in clause if other != -lit)
+                if not clause:
+                    return None
+            result.append(clause)
+        return result
+
+    @staticmethod
+    def _propagate(clauses: list[tuple[int, ...]]) -> tuple[list[tuple[int, ...]], set[int]] | None:
+        """Unit propagation; the simplified clauses and the variables it assigned, or None on a conflict"""
+        assigned: set[int] = set()
+        if any(not clause for clause in clauses):
+            return None
+        while True:
+            unit = next((clause[0] for clause in clauses if len(clause) == 1), 0)
+            if unit == 0:
+                return clauses, assigned
+            conditioned = ModelCounter._condition(clauses, unit)
+            if conditioned is None:
+                return None
+            clauses = conditioned
+            assigned.add(abs(unit))
+
+    @staticmethod
+    def _components(clauses: list[tuple[int, ...]]) -> list[Component]:
+        """Groups clauses connected through shared variables"""
+        parent: dict[int, int] = {}
+
+        def find(var: int) -> int:
+            root = var
+            while parent[root] != root:
+                root = parent[root]
+            while parent[var] != root:
+                parent[var], var = root, parent[var]
+            return root
+
+        for clause in clauses:
+            for lit in clause:
+                parent.setdefault(abs(lit), abs(lit))
+            first = find(abs(clause[0]))
+            for lit in clause[1:]:
+                root = find(abs(lit))
+                if root != first:
+                    parent[root] = first
+
+        groups: dict[int, list[tuple[int, ...]]] = {}
+        for clause in clauses:
+            groups.setdefault(find(abs(clause[0])), []).append(clause)
+        return [frozenset(group) for group in groups.values()]
+
+    def _open_count(self, clauses: list[tuple[int, ...]], scope: set[int], stack: "list[_Product | _Branch]") -> int | None:
+        """
+        Models of clauses projected onto scope, the projection variables still unassigned. Returns
+        the count if it needs no search, else pushes the product of the components' counts.
+        """
+        propagated = self._propagate(clauses)
+        if propagated is None:
+            return 0
+        clauses, assigned = propagated
+        occurring = {abs(lit) for clause in clauses for lit in clause}
+        free = 2 ** len(scope - assigned - occurring)  # projection variables no clause constrains
+        components = self._components(clauses)
+        if not components:
+            return free
+        stack.append(_Product(components[::-1], free))
+        return None
+
+    def _open_component(self, component: Component, stack: "list[_Product | _Branch]") -> int | None:
+        """Returns the count of a cached component or one without projection variables, else pushes a branch on its variable"""
+        cached = self._cache.get(component)
+        if cached is not None:
+            self._cache.move_to_end(component)
+            self.cache_hits += 1
+            return cached
+
+        occurrences: dict[int, int] = {}
+        for clause in component:
+            for lit in clause:
+                occurrences[abs(lit)] = occurrences.get(abs(lit), 0) + 1
+        scope = self._projection.intersection(occurrences)
+        if not scope:
+            value = 1 if CDCLSolver(component, max(occurrences)).solve() else 0
+            self._store(component, value)
+            return value
+
+        var = max(scope, key=lambda v: (occurrences[v], -v))
+        self.decisions += 1
+        scope.discard(var)
+        stack.append(_Branch(component, scope, [-var, var]))
+        return None
+
+    def _store(self, component: Component, value: int) -> None:
+        self._cache[component] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+@dataclass
+class _Product:
+    """Frame multiplying the counts of components, popped from the back"""
+    components: list[Component]
+    value: int
+
+
+@dataclass
+class _Branch:
+    """Frame summing the counts of component under each literal left in lits, popped from the back"""
+    component: Component
+    scope: set[int]
+    lits: list[int]
+    value: int = 0
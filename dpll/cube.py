@@ -0,0 +1,190 @@
+from dataclasses import replace
+import logging
+import multiprocessing
+import os
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple
+
+from dpll.budget import UNKNOWN, Budget, Unknown
+from dpll.cdcl import CDCLSolver
+from dpll.heuristics import Heuristic, make_heuristic
+from dpll.propagation import NO_REASON, WatchedPropagator
+from dpll.restarts import make_restart_policy
+from dpll.stats import SolverStats
+
+if TYPE_CHECKING:
+    from dpll.solver import SolverConfig
+
+
+_logger = logging.getLogger(f"{__name__}")
+
+
+class Lookahead(WatchedPropagator):
+    """
+    Lookahead cuber. Every node of the split tree probes the most promising unassigned
+    variables (by Jeroslow-Wang weight over the input clauses) in both polarities, and
+    measures how many literals each probe assigns through unit propagation.
+
+    A probe that conflicts is a failed literal, so its negation is asserted at that node.
+    Otherwise the node splits on the variable with the highest product of both counts,
+    which favours variables that simplify the formula whichever way they go. Nodes whose
+    two sides both conflict are refuted and yield no cube.
+    """
+
+    def __init__(self, clauses: Iterable[Iterable[int]], num_vars: int, candidates: int = 20):
+        super().__init__(num_vars)
+        self.candidates = candidates
+        for clause in clauses:
+            self.add_clause(clause)
+
+        weights = [0.0] * (self.num_vars + 1)
+        for clause in self._db:
+            for lit in clause:
+                weights[abs(lit)] += 2.0 ** -len(clause)
+        self._order = sorted(range(1, self.num_vars + 1), key=lambda var: -weights[var])
+
+    def _probe(self, lit: int) -> int:
+        """Number of literals assigned by deciding lit, or -1 if that conflicts"""
+        before = len(self._trail)
+        self._trail_lim.append(before)
+        self._assign(lit, NO_REASON)
+        conflict = self.propagate()
+        implied = len(self._trail) - before
+        self._backtrack(len(self._trail_lim) - 1)
+        return -1 if conflict != NO_REASON else implied
+
+    def _lookahead(self) -> int | None:
+        """Asserts failed literals at the current node, then returns the variable to split on (0 if none is left), or None if the node is refuted"""
+        lit_value = self._lit_value
+        failed = True
+        while failed:
+            failed = False
+            best, best_score = 0, -1
+            candidates = [var for var in self._order if lit_value[var] == 0][:self.candidates]
+            for var in candidates:
+                pos, neg = self._probe(var), self._probe(-var)
+                if pos < 0 and neg < 0:
+                    return None
+                if pos < 0 or neg < 0:
+                    self._assign(-var if pos < 0 else var, NO_REASON)
+                    if self.propagate() != NO_REASON:
+                        return None
+                    failed = True
+                    break  # probe again with the new assignment
+                if (pos + 1) * (neg + 1) > best_score:
+                    best, best_score = var, (pos + 1) * (neg + 1)
+        return best
+
+    def _split(self, cube: list[int], depth: int, cubes: list[list[int]]) -> None:
+        var = self._lookahead()
+        if var is None:
+            return
+        if var == 0 or depth == 0:
+            cubes.append(cube)
+            return
+        for lit in (var, -var):
+            self._trail_lim.append(len(self._trail))
+            self._assign(lit, NO_REASON)
+            if self.propagate() == NO_REASON:
+                self._split([*cube, lit], depth - 1, cubes)
+            self._backtrack(len(self._trail_lim) - 1)
+
+    def cubes(self, max_cubes: int) -> list[list[int]]:
+        """
+        Splits the clauses into at most max_cubes cubes (lists of decision literals) that
+        together cover every model. An empty list means the clauses are unsatisfiable.
+        """
+        if not self._ok or self.propagate() != NO_REASON:
+            return []
+        cubes: list[list[int]] = []
+        self._split([], max(max_cubes, 1).bit_length() - 1, cubes)  # 2 ** depth <= max_cubes
+        return cubes
+
+
+class CubeResult(NamedTuple):
+    satisfiable: bool | Unknown
+    values: list[bool]  # value of each variable, index 0 unused; empty if unsatisfiable
+    stats: SolverStats  # summed over the workers
+    cubes: int  # number of cubes the instance was split into
+
+
+# Search engine of each conquer worker process, set up once by _init_worker and reused for every cube
+_worker_search: CDCLSolver | None = None
+_worker_budget: Budget | None = None
+
+
+class CubeAndConquer:
+    """
+    Splits the clauses into cubes with Lookahead and solves them in a process pool.
+
+    Each worker keeps one incremental CDCLSolver and solves every cube it is handed under
+    assumptions, so clauses learned on one cube speed up the next. Cubes are handed out one
+    at a time, which balances the load however uneven they turn out. The answer is SAT as soon
+    as one cube is, and UNSAT once every cube has been refuted.
+    """
+
+    @staticmethod
+    def _init_worker(clauses: list[list[int]], num_vars: int, config: "SolverConfig") -> None:
+        global _worker_search, _worker_budget
+        _worker_budget = Budget.from_config(config)
+        _worker_search = CDCLSolver(clauses, num_vars,
+                                    make_heuristic(config.heuristic if config.heuristic is not None else Heuristic.VSIDS),
+                                    restarts=make_restart_policy(config.restarts), phase_saving=config.phase_saving,
+                                    reduce_interval=config.reduce_interval, max_learned=config.max_learned,
+                                    seed=config.seed)
+
+    @staticmethod
+    def _solve_cube(cube: list[int]) -> tuple[bool | Unknown, list[bool], int, SolverStats]:
+        assert _worker_search is not None
+        satisfiable = _worker_search.solve(cube, _worker_budget)
+        return satisfiable, _worker_search.model() if satisfiable is True else [], os.getpid(), _worker_search.stats
+
+    @staticmethod
+    def solve(clauses: Iterable[Iterable[int]], num_vars: int, config: "SolverConfig",
+              progress: Callable[[int], None] | None = None) -> CubeResult:
+        """
+        Uses config.cubes as the cube budget and config.workers processes (one per CPU if None).
+        progress, if given, is called with the number of cubes remaining after each one is solved.
+
+        The counter limits of config apply to each cube, and a cube that exhausts them makes an
+        UNSAT answer impossible, so the result is then UNKNOWN unless another cube is SAT. The
+        timeout and cancellation token apply to the whole call.
+        """
+        clause_list = [list(clause) for clause in clauses]
+        cubes = Lookahead(clause_list, num_vars).cubes(config.cubes)
+        _logger.info(f"Split into {len(cubes)} cubes")
+        if not cubes:
+            return CubeResult(False, [], SolverStats(), 0)
+
+        worker_stats: dict[int, SolverStats] = {}
+
+        def total_stats() -> SolverStats:
+            stats = SolverStats()
+            for counters in worker_stats.values():
+                stats.merge(counters)
+            return stats
+
+        budget = Budget(timeout=config.timeout, cancel=config.cancel)
+        budget.start(SolverStats())
+        remaining = len(cubes)
+        unknown = False
+        # Tokens and callbacks only work within one process; both are used here instead
+        with multiprocessing.Pool(config.workers, CubeAndConquer._init_worker,
+                                  (clause_list, num_vars, replace(config, cancel=None, progress=None))) as pool:
+            solved = pool.imap_unordered(CubeAndConquer._solve_cube, cubes)
+            while remaining:
+                if budget.out_of_time():
+                    return CubeResult(UNKNOWN, [], total_stats(), len(cubes))
+                try:
+                    satisfiable, values, pid, stats = solved.next(timeout=0.05)
+                except multiprocessing.TimeoutError:
+                    continue
+                worker_stats[pid] = stats  # cumulative per worker, so the latest snapshot counts
+                remaining -= 1
+                if progress is not None:
+                    progress(remaining)
+                _logger.debug(f"{remaining} cubes remaining")
+                if satisfiable is UNKNOWN:
+                    unknown = True
+                elif satisfiable:
+                    return CubeResult(True, values, total_stats(), len(cubes))
+        return CubeResult(UNKNOWN if unknown else False, [], total_stats(), len(cubes))
@@ -0,0 +1,162 @@
+from array import array
+import bz2
+from contextlib import ExitStack
+import gzip
+import io
+import json
+import logging
+import lzma
+import mmap
+import os
+import re
+from typing import IO, Iterable, Iterator, NamedTuple
+
+from dpll.clause_db import ClauseDatabase
+
+
+_logger = logging.getLogger(f"{__name__}")
+
+DimacsSource = str | os.PathLike | bytes | IO
+
+_HEADER = re.compile(rb"^[ \t]*p[ \t]+cnf[ \t]+(\d+)[ \t]+(\d+)", re.M)
+_NON_CLAUSE_LINE = re.compile(rb"^[ \t]*[cp].*$", re.M)
+_END = re.compile(rb"^[ \t]*%", re.M)  # SATLIB files end with a % line and some junk
+_COMPRESSED = ((b"\x1f\x8b", gzip.open), (b"\xfd7zXZ\x00", lzma.open), (b"BZh", bz2.open))
+_COMPRESSED_SUFFIXES = {".gz": gzip.open, ".xz": lzma.open, ".bz2": bz2.open}
+
+
+class DimacsCNF(NamedTuple):
+    num_vars: int  # from the header, or the largest variable if that is larger or missing
+    clauses: ClauseDatabase
+
+
+def _open(source: DimacsSource, stack: ExitStack) -> IO[bytes]:
+    """A binary file over source, decompressed if it starts like gzip, xz or bzip2; stack closes what was opened here"""
+    if isinstance(source, bytes):
+        file: IO[bytes] = io.BytesIO(source)
+    elif isinstance(source, (str, os.PathLike)):
+        file = stack.enter_context(open(source, "rb"))
+    elif isinstance(source, io.TextIOBase):
+        file = source.buffer if hasattr(source, "buffer") else io.BytesIO(source.read().encode())
+    else:
+        file = source
+    if hasattr(file, "peek"):
+        magic = file.peek(6)[:6]
+    elif file.seekable():
+        magic = file.read(6)
+        file.seek(-len(magic), io.SEEK_CUR)
+    else:
+        magic = b""
+    for prefix, decompressor in _COMPRESSED:
+        if magic.startswith(prefix):
+            return stack.enter_context(decompressor(file, "rb"))
+    return file
+
+
+def _chunks(source: DimacsSource, chunk_size: int, use_mmap: bool) -> Iterator[bytes]:
+    """The bytes of source in pieces of about chunk_size that end at line ends"""
+    with ExitStack() as stack:
+        file = _open(source, stack)
+        if use_mmap and isinstance(file, io.BufferedReader) and os.fstat(file.fileno()).st_size > 0:
+            buffer = stack.enter_context(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+            start = 0
+            while start < len(buffer):
+                end = buffer.find(b"\n", start + chunk_size)
+                end = len(buffer) if end < 0 else end + 1
+                yield buffer[start:end]
+                start = end
+            return
+        while chunk := file.read(chunk_size):
+            yield chunk + file.readline()
+
+
+def _packed(source: DimacsSource, chunk_size: int, use_mmap: bool) -> Iterator[tuple[array, int]]:
+    """
+    Literal arrays of whole clauses, each ending with 0, and the variable count of the header
+    (0 until it has been read). Comment lines are cut out of each chunk with one regex pass,
+    and what remains is turned into ints by array() in a single call.
+    """
+    num_vars = 0
+    carry = array('i')
+    for chunk in _chunks(source, chunk_size, use_mmap):
+        end = _END.search(chunk)
+        if end is not None:
+            chunk = chunk[:end.start()]
+        if b"c" in chunk or b"p" in chunk:
+            if num_vars == 0 and (header := _HEADER.search(chunk)) is not None:
+                num_vars = int(header.group(1))
+            chunk = _NON_CLAUSE_LINE.sub(b"", chunk)
+        lits = carry + array('i', map(int, chunk.split()))
+        last = len(lits)
+        while last > 0 and lits[last - 1] != 0:
+            last -= 1  # a clause that continues in the next chunk
+        carry = lits[last:]
+        yield lits[:last], num_vars
+        if end is not None:
+            break
+    if carry:
+        carry.append(0)  # the last clause may lack its 0
+        yield carry, num_vars
+
+
+def iter_dimacs(source: DimacsSource, chunk_size: int = 1 << 20, use_mmap: bool = True) -> Iterator[list[int]]:
+    """Streams the clauses of a DIMACS CNF one at a time, see read_dimacs"""
+    for lits, _ in _packed(source, chunk_size, use_mmap):
+        start = 0
+        while start < len(lits):
+            end = lits.index(0, start)
+            yield lits[start:end].tolist()
+            start = end + 1
+
+
+def read_dimacs(source: DimacsSource, chunk_size: int = 1 << 20, use_mmap: bool = True) -> DimacsCNF:
+    """
+    Loads a DIMACS CNF from a path, bytes or binary file straight into a ClauseDatabase.
+    gzip, xz and bzip2 compression is detected from the first bytes. An uncompressed file on
+    disk is memory-mapped (unless use_mmap is False), anything else read in chunks of about
+    chunk_size bytes, so only one chunk is ever held as text. Clauses may span lines, and a
+    % line ends the clauses like in SATLIB files.
+    """
+    db = ClauseDatabase()
+    num_vars = 0
+    for lits, num_vars in _packed(source, chunk_size, use_mmap):
+        db.add_packed(lits)
+    if num_vars and num_vars < db.num_vars:
+        _logger.warning(f"Header declares {num_vars} variables, but clauses use {db.num_vars}")
+    _logger.debug(f"Read {len(db)} clauses over {max(num_vars, db.num_vars)} variables")
+    return DimacsCNF(max(num_vars, db.num_vars), db)
+
+
+def _write(target: str | os.PathLike | IO, lines: Iterable[str]) -> None:
+    """Writes lines to a path, compressed if it ends in .gz, .xz or .bz2, or to an open text or binary file"""
+    if isinstance(target, (str, os.PathLike)):
+        opener = _COMPRESSED_SUFFIXES.get(os.path.splitext(target)[1], open)
+        with opener(target, "wt", encoding="utf-8") as file:
+            file.writelines(lines)
+    elif isinstance(target, io.TextIOBase):
+        target.writelines(lines)
+    else:
+        target.writelines(line.encode() for line in lines)
+
+
+def write_dimacs(target: str | os.PathLike | IO, clauses: list[list[int]] | ClauseDatabase, num_vars: int,
+                 comments: Iterable[str] = ()) -> None:
+    """
+    Writes clauses as a DIMACS CNF to a path (compressed if it ends in .gz, .xz or .bz2) or an
+    open text or binary file. Every comment becomes a c line ahead of the header.
+    """
+    lines = (f"c {comment}\n" for comment in comments)
+    header = (f"p cnf {num_vars} {len(clauses)}\n",)
+    body = (" ".join([*map(str, clause), "0\n"]) for clause in clauses)
+    _write(target, (line for part in (lines, header, body) for line in part))
+
+
+def write_names(target: str | os.PathLike | IO, names: list[str]) -> None:
+    """Writes the name table of a DIMACS CNF, a JSON list with the name of variable i at index i - 1"""
+    _write(target, (json.dumps(names, ensure_ascii=False),))
+
+
+def read_names(source: DimacsSource) -> list[str]:
+    """The name table written by write_names, from a path, bytes or open file"""
+    with ExitStack() as stack:
+        return json.load(_open(source, stack))
@@ -0,0 +1,249 @@
+from abc import ABC, abstractmethod
+import heapq
+from strenum import StrEnum
+
+from dpll.clause_db import ClauseDatabase
+
+
+class Heuristic(StrEnum):
+    """Branching heuristics that can be selected by name, see make_heuristic"""
+    FIRST_UNSATISFIED = "first"
+    ORDERED = "ordered"
+    VSIDS = "vsids"
+    DLIS = "dlis"
+    JEROSLOW_WANG = "jw"
+    MOMS = "moms"
+
+
+class BranchingHeuristic(ABC):
+    """
+    Chooses decision literals for a search engine.
+
+    The engine calls setup once before searching; db and lit_value are its live clause
+    database and literal assignment (1 true, -1 false, 0 unassigned), which the heuristic
+    must only read. pick returns 0 when there is nothing left to decide.
+    """
+
+    def setup(self, num_vars: int, db: ClauseDatabase, lit_value: list[int]) -> None:
+        self._num_vars = num_vars
+        self._db = db
+        self._lit_value = lit_value
+
+    @abstractmethod
+    def pick(self) -> int:
+        pass
+
+    def on_new_vars(self, num_vars: int) -> None:
+        """Called when the engine grows to num_vars variables, e.g. while solving incrementally"""
+        self._num_vars = num_vars
+
+    def on_conflict(self, vars: list[int]) -> None:
+        """Called once per conflict with the variables involved in it"""
+        pass
+
+    def on_backtrack(self, lits: list[int]) -> None:
+        """Called with the literals that were just unassigned"""
+        pass
+
+
+class FirstUnsatisfied(BranchingHeuristic):
+    """First unassigned literal of the first clause not yet satisfied; the original DPLL choice"""
+
+    def pick(self) -> int:
+        lit_value = self._lit_value
+        lits = self._db.lits
+        sizes = self._db.sizes
+        for cid, start in enumerate(self._db.starts):
+            candidate = 0
+            for lit in lits[start:start + sizes[cid]]:
+                value = lit_value[lit]
+                if value == 1:
+                    break
+                if value == 0 and candidate == 0:
+                    candidate = lit
+            else:
+                if candidate != 0:
+                    return candidate
+        return 0
+
+
+class Ordered(BranchingHeuristic):
+    """Lowest numbered unassigned variable, negative first"""
+
+    def pick(self) -> int:
+        lit_value = self._lit_value
+        for var in range(1, self._num_vars + 1):
+            if lit_value[var] == 0:
+                return -var
+        return 0
+
+
+class VSIDS(BranchingHeuristic):
+    """
+    Variable state independent decaying sum. Variables involved in conflicts are bumped by an
+    increment that grows geometrically, which is equivalent to decaying every other activity.
+
+    The heap holds (-activity, var) entries and is updated lazily: bumping pushes a fresh entry,
+    and entries that are stale or belong to assigned variables are dropped when popped.
+    """
+
+    def __init__(self, decay: float = 0.95):
+        self.decay = decay
+
+    def setup(self, num_vars: int, db: ClauseDatabase, lit_value: list[int]) -> None:
+        super().setup(num_vars, db, lit_value)
+        self._activity: list[float] = [0.0] * (num_vars + 1)
+        self._increment = 1.0
+        self._heap: list[tuple[float, int]] = [(0.0, var) for var in range(1, num_vars + 1)]
+
+    def on_new_vars(self, num_vars: int) -> None:
+        old = self._num_vars
+        super().on_new_vars(num_vars)
+        self._activity.extend([0.0] * (num_vars - old))
+        for var in range(old + 1, num_vars + 1):
+            heapq.heappush(self._heap, (0.0, var))
+
+    def _rebuild(self) -> None:
+        activity = self._activity
+        lit_value = self._lit_value
+        self._heap = [(-activity[var], var) for var in range(1, self._num_vars + 1) if lit_value[var] == 0]
+        heapq.heapify(self._heap)
+
+    def pick(self) -> int:
+        heap = self._heap
+        activity = self._activity
+        lit_value = self._lit_value
+        while heap:
+            score, var = heapq.heappop(heap)
+            if lit_value[var] == 0 and -score == activity[var]:
+                return -var
+        return 0
+
+    def on_conflict(self, vars: list[int]) -> None:
+        activity = self._activity
+        lit_value = self._lit_value
+        increment = self._increment
+        for var in vars:
+            activity[var] += increment
+            if lit_value[var] == 0:
+                heapq.heappush(self._heap, (-activity[var], var))
+        self._increment = increment / self.decay
+
+        if self._increment > 1e100:
+            for var in range(1, self._num_vars + 1):
+                activity[var] *= 1e-100
+            self._increment *= 1e-100
+            self._rebuild()
+        elif len(self._heap) > 4 * self._num_vars:
+            self._rebuild()
+
+    def on_backtrack(self, lits: list[int]) -> None:
+        activity = self._activity
+        heap = self._heap
+        for lit in lits:
+            var = abs(lit)
+            heapq.heappush(heap, (-activity[var], var))
+
+
+class _CountingHeuristic(BranchingHeuristic):
+    """
+    Base for the literal counting heuristics. Every pick scans the clauses that are not yet
+    satisfied and scores their unassigned literals, so it costs one pass over the database.
+    """
+
+    def pick(self) -> int:
+        lit_value = self._lit_value
+        lits = self._db.lits
+        sizes = self._db.sizes
+        free_per_clause: list[list[int]] = []
+        for cid, start in enumerate(self._db.starts):
+            free: list[int] = []
+            for lit in lits[start:start + sizes[cid]]:
+                value = lit_value[lit]
+                if value == 1:
+                    break
+                if value == 0:
+                    free.append(lit)
+            else:
+                if free:
+                    free_per_clause.append(free)
+        if not free_per_clause:
+            return 0
+        return self._choose(free_per_clause)
+
+    @abstractmethod
+    def _choose(self, clauses: list[list[int]]) -> int:
+        pass
+
+    @staticmethod
+    def _best_literal(scores: dict[int, float]) -> int:
+        """Variable with the highest combined score of both literals, in its higher scoring polarity"""
+        combined: dict[int, float] = {}
+        for lit, score in scores.items():
+            combined[abs(lit)] = combined.get(abs(lit), 0.0) + score
+        var = max(combined, key=lambda v: (combined[v], -v))
+        return var if scores.get(var, 0.0) >= scores.get(-var, 0.0) else -var
+
+
+class DLIS(_CountingHeuristic):
+    """Dynamic largest individual sum: the literal occurring in the most unsatisfied clauses"""
+
+    def _choose(self, clauses: list[list[int]]) -> int:
+        counts: dict[int, int] = {}
+        for clause in clauses:
+            for lit in clause:
+                counts[lit] = counts.get(lit, 0) + 1
+        return max(counts, key=lambda lit: (counts[lit], -abs(lit)))
+
+
+class JeroslowWang(_CountingHeuristic):
+    """Two-sided Jeroslow-Wang: each occurrence weighs 2^-k, k being the clause's unassigned length"""
+
+    def _choose(self, clauses: list[list[int]]) -> int:
+        scores: dict[int, float] = {}
+        for clause in clauses:
+            weight = 2.0 ** -len(clause)
+            for lit in clause:
+                scores[lit] = scores.get(lit, 0.0) + weight
+        return self._best_literal(scores)
+
+
+class MOMS(_CountingHeuristic):
+    """Maximum occurrences in clauses of minimum size, scored as (f(x) + f(-x)) * 2^k + f(x) * f(-x)"""
+
+    def __init__(self, k: int = 4):
+        self.k = k
+
+    def _choose(self, clauses: list[list[int]]) -> int:
+        shortest = min(len(clause) for clause in clauses)
+        counts: dict[int, float] = {}
+        for clause in clauses:
+            if len(clause) == shortest:
+                for lit in clause:
+                    counts[lit] = counts.get(lit, 0.0) + 1.0
+
+        def score(var: int) -> float:
+            pos, neg = counts.get(var, 0.0), counts.get(-var, 0.0)
+            return (pos + neg) * 2 ** self.k + pos * neg
+
+        var = max({abs(lit) for lit in counts}, key=lambda v: (score(v), -v))
+        return var if counts.get(var, 0.0) >= counts.get(-var, 0.0) else -var
+
+
+def make_heuristic(heuristic: "Heuristic | BranchingHeuristic") -> BranchingHeuristic:
+    """Instances are returned unchanged, names are built with their default parameters"""
+    if isinstance(heuristic, BranchingHeuristic):
+        return heuristic
+    match Heuristic(heuristic):
+        case Heuristic.FIRST_UNSATISFIED:
+            return FirstUnsatisfied()
+        case Heuristic.ORDERED:
+            return Ordered()
+        case Heuristic.VSIDS:
+            return VSIDS()
+        case Heuristic.DLIS:
+            return DLIS()
+        case Heuristic.JEROSLOW_WANG:
+            return JeroslowWang()
+        case Heuristic.MOMS:
+            return MOMS()
@@ -0,0 +1,112 @@
+import copy
+import logging
+from typing import Iterable, Iterator
+
+from dpll.budget import Budget
+from dpll.cdcl import CDCLSolver
+from dpll.clause_db import VariableMap
+from dpll.cnf_transformer import Config, Transformer
+from dpll.heuristics import Heuristic, make_heuristic
+from dpll.logic_tree import LogicTree
+from dpll.parser import Parser
+from dpll.restarts import make_restart_policy
+from dpll.stats import SolverStats
+from dpll.solver import Solver, SolverConfig, SolverResult, SolverVariable, default_solver_config
+
+
+_logger = logging.getLogger(f"{__name__}")
+
+
+class IncrementalSolver:
+    """
+    Stateful CDCL solver for many related queries over one base formula.
+
+    Clauses and formulas are added once and kept, together with learned clauses and
+    heuristic state, across calls to solve. Assumptions only hold for the call they are
+    passed to, and push()/pop() scope the clauses added in between.
+
+    Models only mention variables that were added by name; the fresh variables of each
+    formula's Tseytin transform and the scope selectors stay internal.
+    """
+
+    def __init__(self, config: SolverConfig | None = None, transform_config: Config | None = None):
+        solver_config = config if config is not None else default_solver_config
+        heuristic = make_heuristic(solver_config.heuristic if solver_config.heuristic is not None else Heuristic.VSIDS)
+        self._search = CDCLSolver((), 0, heuristic,
+                                  restarts=make_restart_policy(solver_config.restarts),
+                                  phase_saving=solver_config.phase_saving,
+                                  reduce_interval=solver_config.reduce_interval,
+                                  max_learned=solver_config.max_learned,
+                                  seed=solver_config.seed)
+        self._budget = Budget.from_config(solver_config)  # started afresh by every solve()
+        self._transform_config = transform_config
+        self._variables = VariableMap()
+        self._visible: dict[str, None] = {}  # names reported in models, in order of appearance
+        self._formulas = 0
+        self._scopes = 0
+
+    def _literal(self, name: str, polarity: bool) -> int:
+        self._visible.setdefault(name)
+        return self._variables.literal(name, polarity)
+
+    def add_clause(self, clause: Iterable[SolverVariable]) -> None:
+        self._search.add_clause([self._literal(var.name, var.polarity) for var in clause])
+
+    def add_formula(self, exp: str) -> None:
+        """Parses exp, transforms it to CNF and adds its clauses"""
+        parsed = Parser.parse(exp)
+        original_vars = LogicTree.get_var_names(parsed)
+        clauses = Transformer.transform(parsed, self._transform_config)
+
+        # Every transform numbers its definitions from n0 again. Give this formula's definitions
+        # names with a space, which the lexer strips, so they can't meet any other variable.
+        # Sorted like Solver.encode, so variables are numbered the same way on every run.
+        self._formulas += 1
+        for tree in sorted(clauses, key=str):
+            literals = Solver.clause_literals(tree)
+            if literals is None:
+                continue
+            clause: list[int] = []
+            for name, polarity in literals:
+                if name in original_vars:
+                    clause.append(self._literal(name, polarity))
+                else:
+                    clause.append(self._variables.literal(f"{name} {self._formulas}", polarity))
+            self._search.add_clause(clause)
+        _logger.debug(f"Added {len(clauses)} clauses for formula {self._formulas}")
+
+    def push(self) -> None:
+        """Clauses and formulas added from now on are removed again by the matching pop()"""
+        self._scopes += 1
+        self._search.push(self._variables.number(f"scope {self._scopes}"))
+
+    def pop(self) -> None:
+        self._search.pop()
+
+    def solve(self, assumptions: Iterable[SolverVariable] = ()) -> SolverResult:
+        """
+        Satisfiability of everything added so far, with each assumption holding for this call only.
+        The budget set in the config applies to every call separately.
+        """
+        lits = [self._literal(var.name, var.polarity) for var in assumptions]
+        satisfiable = self._search.solve(lits, self._budget)
+        if satisfiable is not True:
+            return SolverResult(satisfiable, [], self.stats)
+        values = self._search.model()
+        model = [SolverVariable(name, values[self._variables.number(name)]) for name in self._visible]
+        return SolverResult(True, model, self.stats)
+
+    @property
+    def stats(self) -> SolverStats:
+        """Counters accumulated over every solve() so far, as a snapshot"""
+        return copy.copy(self._search.stats)
+
+    def models(self, projection: Iterable[str] | None = None) -> Iterator[list[SolverVariable]]:
+        """Every model projected onto the given names (all named variables by default), see CDCLSolver.models"""
+        names = list(dict.fromkeys(projection)) if projection is not None else list(self._visible)
+        for lits in self._search.models([self._literal(name, True) for name in names]):
+            yield [SolverVariable(self._variables.name(lit), lit > 0) for lit in lits]
+
+    def failed_assumptions(self) -> list[SolverVariable]:
+        """Assumptions of the last unsatisfiable solve() that caused it; empty if no assumption was needed"""
+        return [SolverVariable(self._variables.name(lit), lit > 0) for lit in self._search.failed_assumptions]
@@ -0,0 +1,206 @@
+import logging
+import random
+from strenum import StrEnum
+from typing import Iterable, Sequence
+
+from dpll.budget import UNKNOWN, Budget, Unknown
+from dpll.stats import SolverStats
+
+
+_logger = logging.getLogger(f"{__name__}")
+
+
+class LocalSearchMethod(StrEnum):
+    """How LocalSearch picks the variable to flip in an unsatisfied clause"""
+    WALKSAT = "walksat"  # fewest breaks, or a random variable with probability noise
+    PROBSAT = "probsat"  # random, weighted by (1 + breaks) ** -noise
+
+
+DEFAULT_NOISE = {LocalSearchMethod.WALKSAT: 0.567, LocalSearchMethod.PROBSAT: 2.3}
+
+
+class LocalSearch:
+    """
+    Stochastic local search over integer clauses. Starting from a random (or given) full
+    assignment, it repeatedly picks an unsatisfied clause at random and flips one of its
+    variables, until no clause is unsatisfied or the flips run out. It can find models of
+    large satisfiable formulas quickly, but never proves unsatisfiability.
+
+    Every flip is incremental. Each clause keeps its number of true literals and the XOR of
+    their variables, which is the variable of the only true literal when there is just one.
+    From those, the break count of a variable (clauses that only it satisfies) and its make
+    count (unsatisfied clauses it occurs in) are kept up to date, and the unsatisfied clauses
+    sit in a list with each clause's position, so both adding and removing one are O(1).
+    A flip therefore only visits the clauses of the flipped variable.
+    """
+
+    _CHECK_MASK = 255  # the clock and cancellation token are read every 256 flips
+
+    def __init__(self, clauses: Iterable[Iterable[int]], num_vars: int,
+                 method: LocalSearchMethod = LocalSearchMethod.PROBSAT, noise: float | None = None,
+                 seed: int | None = None):
+        self.method = method
+        self.noise = noise if noise is not None else DEFAULT_NOISE[method]
+        self.stats = SolverStats()
+        self._random = random.Random(seed)
+
+        self._ok = True
+        self._clauses: list[list[int]] = []
+        for clause in clauses:
+            lits = list(dict.fromkeys(clause))  # de-duplicate, keep order
+            if any(-lit in lits for lit in lits):
+                continue  # tautological clause, always satisfied
+            if not lits:
+                self._ok = False
+            num_vars = max(num_vars, max((abs(lit) for lit in lits), default=0))
+            self._clauses.append(lits)
+        self.num_vars = num_vars
+
+        # Indexed by literal; negative literals wrap around to the back half of the list
+        self._occurs: list[list[int]] = [[] for _ in range(2 * num_vars + 1)]  # ids of the clauses of each literal
+        for cid, lits in enumerate(self._clauses):
+            for lit in lits:
+                self._occurs[lit].append(cid)
+        most = max((len(occurs) for occurs in self._occurs), default=0)
+        self._weights = [(1.0 + breaks) ** -self.noise for breaks in range(most + 1)]  # ProbSAT, by break count
+
+        self._values: list[bool] = [False] * (num_vars + 1)
+        self._true_count: list[int] = [0] * len(self._clauses)
+        self._true_xor: list[int] = [0] * len(self._clauses)
+        self._break: list[int] = [0] * (num_vars + 1)
+        self._make: list[int] = [0] * (num_vars + 1)
+        self._unsat: list[int] = []  # ids of the unsatisfied clauses
+        self._unsat_pos: list[int] = [-1] * len(self._clauses)  # index of each clause in _unsat, -1 if satisfied
+
+        self._best_unsat = len(self._clauses) + 1
+        self._best: list[bool] | None = None  # None while the best assignment is _values with _since_best undone
+        self._since_best: list[int] = []
+
+    def _reset(self, values: Sequence[bool]) -> None:
+        """Makes values (index 0 unused) the current assignment and counts everything from scratch"""
+        self._values = list(values)
+        self._break = [0] * (self.num_vars + 1)
+        self._make = [0] * (self.num_vars + 1)
+        self._unsat = []
+        for cid, lits in enumerate(self._clauses):
+            true_lits = [lit for lit in lits if self._values[abs(lit)] == (lit > 0)]
+            self._true_count[cid] = len(true_lits)
+            self._true_xor[cid] = 0
+            for lit in true_lits:
+                self._true_xor[cid] ^= abs(lit)
+            if not true_lits:
+                self._unsat_pos[cid] = len(self._unsat)
+                self._unsat.append(cid)
+                for lit in lits:
+                    self._make[abs(lit)] += 1
+            else:
+                self._unsat_pos[cid] = -1
+                if len(true_lits) == 1:
+                    self._break[abs(true_lits[0])] += 1
+        self._best_unsat = len(self._unsat)
+        self._best = None
+        self._since_best = []
+
+    def _flip(self, var: int) -> None:
+        values, clauses = self._values, self._clauses
+        true_count, true_xor = self._true_count, self._true_xor
+        breaks, make = self._break, self._make
+        unsat, unsat_pos = self._unsat, self._unsat_pos
+
+        values[var] = not values[var]
+        lit = var if values[var] else -var
+        for cid in self._occurs[lit]:  # now true
+            count = true_count[cid]
+            true_count[cid] = count + 1
+            if count == 0:
+                # Satisfied again: swap the last unsatisfied clause into its place
+                last = unsat.pop()
+                if last != cid:
+                    unsat[unsat_pos[cid]] = last
+                    unsat_pos[last] = unsat_pos[cid]
+                unsat_pos[cid] = -1
+                for other in clauses[cid]:
+                    make[abs(other)] -= 1
+                breaks[var] += 1
+            elif count == 1:
+                breaks[true_xor[cid]] -= 1  # its only true literal is no longer the only one
+            true_xor[cid] ^= var
+        for cid in self._occurs[-lit]:  # now false
+            count = true_count[cid] - 1
+            true_count[cid] = count
+            true_xor[cid] ^= var
+            if count == 0:
+                unsat_pos[cid] = len(unsat)
+                unsat.append(cid)
+                for other in clauses[cid]:
+                    make[abs(other)] += 1
+                breaks[var] -= 1
+            elif count == 1:
+                breaks[true_xor[cid]] += 1
+
+    def _pick(self, lits: list[int]) -> int:
+        """The variable to flip in the unsatisfied clause lits"""
+        breaks, make = self._break, self._make
+        if self.method == LocalSearchMethod.PROBSAT:
+            weights = self._weights
+            return abs(self._random.choices(lits, [weights[breaks[abs(lit)]] for lit in lits])[0])
+
+        fewest = min(breaks[abs(lit)] for lit in lits)
+        if fewest > 0 and self._random.random() < self.noise:
+            return abs(self._random.choice(lits))
+        # Freebies (no breaks) are always taken; ties go to the variable that satisfies most clauses
+        candidates = [abs(lit) for lit in lits if breaks[abs(lit)] == fewest]
+        most = max(make[var] for var in candidates)
+        return self._random.choice([var for var in candidates if make[var] == most])
+
+    def solve(self, max_flips: int, budget: Budget | None = None, start: Sequence[bool] | None = None) -> bool | Unknown:
+        """
+        Searches from start (a value for each variable, index 0 unused), or from a random
+        assignment. True once every clause is satisfied, with the model in values(); False only
+        if there is an empty clause; UNKNOWN once max_flips flips or the budget's time run out.
+        """
+        if not self._ok:
+            return False
+        if start is None:
+            start = [False] + [self._random.random() < 0.5 for _ in range(self.num_vars)]
+        self._reset(start)
+        if budget is not None:
+            budget.start(self.stats)
+
+        stats, clauses, unsat, since_best = self.stats, self._clauses, self._unsat, self._since_best
+        for flip in range(max_flips):
+            if not unsat:
+                return True
+            if budget is not None and not flip & self._CHECK_MASK and budget.out_of_time():
+                break
+            var = self._pick(clauses[unsat[self._random.randrange(len(unsat))]])
+            self._flip(var)
+            stats.flips += 1
+
+            if len(unsat) < self._best_unsat:
+                self._best_unsat = len(unsat)
+                self._best = None
+                since_best.clear()
+            elif self._best is None:
+                since_best.append(var)
+                if len(since_best) > self.num_vars:
+                    # Cheaper to keep a copy than an ever longer list of flips to undo
+                    self._best = self.best_values()
+                    since_best.clear()
+        if not unsat:
+            return True
+        _logger.debug(f"No model after {stats.flips} flips, best assignment leaves {self._best_unsat} clauses unsatisfied")
+        return UNKNOWN
+
+    def values(self) -> list[bool]:
+        """Value of each variable (index 0 unused) in the current assignment, a model after a satisfiable solve()"""
+        return list(self._values)
+
+    def best_values(self) -> list[bool]:
+        """The assignment that left the fewest clauses unsatisfied during the last solve()"""
+        if self._best is not None:
+            return list(self._best)
+        values = list(self._values)
+        for var in self._since_best:
+            values[var] = not values[var]
+        return values
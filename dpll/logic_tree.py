@@ -1,10 +1,10 @@
 from dataclasses import dataclass, field
-from dpll.types import Operator, Atom, Variable, Tautology, Contradiction
+from dpll.types import Cardinality, Operator, Atom, Variable, Tautology, Contradiction
 from typing import Callable, TypeVar
 
 
 VariableName = str
-LogicTreeValue = Operator | Atom
+LogicTreeValue = Operator | Atom | Cardinality
 T = TypeVar("T")
 U = TypeVar("U")
 
@@ -15,18 +15,23 @@ class LogicTree:
     literal: bool = field(init=False)
     left: "LogicTree | None" = None
     right: "LogicTree | None" = None
+    operands: "list[LogicTree]" = field(default_factory=list)  # of a Cardinality node, which has no left or right
+    source: "LogicTree | None" = field(default=None, compare=False, repr=False)  # input sub-formula a transform node stands for
 
     def __post_init__(self: "LogicTree") -> None:
         if self.value is Operator.NEGATION:
             assert self.left is not None
-            self.literal = type(self.left.value) is not Operator
+            self.literal = type(self.left.value) not in (Operator, Cardinality)
         else:
-            self.literal = type(self.value) is not Operator
+            self.literal = type(self.value) not in (Operator, Cardinality)
 
     def __str__(self: "LogicTree", first: bool = True) -> str:
         match self.value:
             case Variable(name=name) | Tautology(name=name) | Contradiction(name=name):
                 return name
+            case Cardinality(kind=kind, bound=bound):
+                operands = "".join("," + operand.__str__(first=False) for operand in self.operands)
+                return f"{kind}({bound}{operands})"
             case Operator.NEGATION:
                 left = "" if self.left is None else self.left.__str__(first=False)
                 return "¬" + left
@@ -56,6 +61,8 @@ class LogicTree:
             self.left._get_var_names(names)
         if self.right is not None:
             self.right._get_var_names(names)
+        for operand in self.operands:
+            operand._get_var_names(names)
 
     def get_var_names(self: "LogicTree") -> set[str]:
         names: set[str] = set()
@@ -96,8 +103,10 @@ class LogicTree:
                 return tree.left is not None and tree.right is None
             case Operator():
                 return tree.left is not None and tree.right is not None
+            case Cardinality(bound=bound):
+                return tree.left is None and tree.right is None and bound >= 0
             case _:
-                return tree.left is None and tree.right is None
+                return tree.left is None and tree.right is None and not tree.operands
 
     @staticmethod
     def check_node_children_and_raise(tree: "LogicTree") -> None:
@@ -110,7 +119,7 @@ class LogicTree:
         if LogicTree.check_node_children(tree):
             left_valid = tree.left is None or LogicTree.validate_tree(tree.left)
             right_valid = tree.right is None or LogicTree.validate_tree(tree.right)
-            return left_valid and right_valid
+            return left_valid and right_valid and all(LogicTree.validate_tree(operand) for operand in tree.operands)
         else:
             return False
 
@@ -1,29 +1,66 @@
-from dpll.cnf_transformer import Transformer
+import os
+from typing import IO, Iterable, Iterator
+
+from dpll.batch import Batch, BatchResult
+from dpll.budget import UNKNOWN, Unknown
+from dpll.cnf_transformer import Config, Transformer
+from dpll.dimacs import write_dimacs, write_names
 from dpll.logic_tree import LogicTree
 from dpll.parser import Parser
-from dpll.solver import Solver, SolverVariable
+from dpll.solver import Solver, SolverAlgorithm, SolverConfig, SolverResult, SolverVariable, UnsatCore
+from dpll.stats import PhaseStats, timed
 
+# Solver.solve propagates chains of equivalences as parity constraints; the other entry points need clauses
+_solve_config = Config(disable_syntax_check=False, use_tseytin_transform=True, native_xor=True)
 
-def dpll(exp: str) -> bool:
-    """Returns True if the given expression is satisfiable, False if unsatisfiable."""
 
-    parsed = Parser.parse(exp)
+def dpll_result(exp: str, algorithm: SolverAlgorithm = SolverAlgorithm.DPLL,
+                config: SolverConfig | None = None) -> SolverResult:
+    """Returns the full SolverResult for the expression, with the model including Tseytin definitions.
+    Its stats time every phase from parsing on, and give the formula size after each (see SolverStats)."""
+
+    phases: dict[str, PhaseStats] = {}
+    with timed(phases, "parse") as phase:
+        parsed = Parser.parse(exp)
+        phase.variables = len(LogicTree.get_var_names(parsed))
+
+    with timed(phases, "transform") as phase:
+        clauses = Transformer.transform(parsed, _solve_config)
+        phase.clauses = len(clauses)
+
+    return Solver.solve(clauses, algorithm=algorithm, config=config, phases=phases)
 
-    clauses = Transformer.transform(parsed)
 
-    return (Solver.solve(clauses)).satisfiable
+def dpll(exp: str, algorithm: SolverAlgorithm = SolverAlgorithm.DPLL, config: SolverConfig | None = None) -> bool | Unknown:
+    """Returns True if the given expression is satisfiable, False if unsatisfiable.
+    algorithm selects the search procedure (see SolverAlgorithm) and config tunes it (see SolverConfig).
+    Returns UNKNOWN if a budget set in config runs out, or its cancellation token is cancelled."""
 
+    return dpll_result(exp, algorithm=algorithm, config=config).satisfiable
 
-def dpll_model(exp: str) -> list[SolverVariable] | None:
-    """Returns a (maybe partial) model if satisfiable, None if unsatisfiable.
+
+def dpll_batch(expressions: Iterable[str], jobs: int | None = 1, ordered: bool = True, chunksize: int = 64,
+               algorithm: SolverAlgorithm = SolverAlgorithm.DPLL, config: SolverConfig | None = None) -> Iterator[BatchResult]:
+    """Lazily yields the dpll() answer for each expression as a BatchResult, in input order unless ordered is False.
+    jobs processes (one per CPU if None) share the work in chunks of chunksize expressions, each keeping a cache
+    of transformed expressions. An expression that raises gets its error in its result, and the batch goes on."""
+
+    return Batch(algorithm, config, _solve_config).run(expressions, jobs=jobs, ordered=ordered, chunksize=chunksize)
+
+
+def dpll_model(exp: str, algorithm: SolverAlgorithm = SolverAlgorithm.DPLL,
+               config: SolverConfig | None = None) -> list[SolverVariable] | None | Unknown:
+    """Returns a (maybe partial) model if satisfiable, None if unsatisfiable, UNKNOWN if the budget ran out.
     This means that it may return an empty list [], if the given expression is a tautology."""
 
     parsed = Parser.parse(exp)
     original_vars = LogicTree.get_var_names(parsed)
 
-    clauses = Transformer.transform(parsed)
+    clauses = Transformer.transform(parsed, _solve_config)
 
-    solution = Solver.solve(clauses)
+    solution = Solver.solve(clauses, algorithm=algorithm, config=config)
+    if solution.satisfiable is UNKNOWN:
+        return UNKNOWN
     if solution.satisfiable:
         model_with_names = solution.model
 
@@ -32,30 +69,107 @@ def dpll_model(exp: str) -> list[SolverVariable] | None:
     else:
         return None
 
+
+def dpll_models(exp: str, projection: Iterable[str] | None = None,
+                config: SolverConfig | None = None) -> Iterator[list[SolverVariable]]:
+    """Lazily yields every model of the expression, projected onto the given variable names (by default
+    the expression's own variables, in sorted order, so Tseytin definitions never show up). Each
+    projected model is yielded once; stop iterating at any time."""
+
+    parsed = Parser.parse(exp)
+    if projection is None:
+        projection = sorted(name for name in LogicTree.get_var_names(parsed) if name not in ("⊤", "⊥"))
+
+    clauses = Transformer.transform(parsed)
+
+    return Solver.models(clauses, projection, config=config)
+
+
+def dpll_count(exp: str, projection: Iterable[str] | None = None) -> int:
+    """Returns the number of models of the expression, over its own variables unless a projection of
+    variable names is given. Tseytin definitions are never counted, since they are not in the projection."""
+
+    parsed = Parser.parse(exp)
+    if projection is None:
+        projection = [name for name in LogicTree.get_var_names(parsed) if name not in ("⊤", "⊥")]
+
+    clauses = Transformer.transform(parsed)
+
+    return Solver.count(clauses, projection)
+
+
+def dpll_core(exp: str, minimize: bool = False, config: SolverConfig | None = None) -> UnsatCore | None | Unknown:
+    """Returns an unsatisfiable core of the expression: the CNF clauses a refutation needs, and the
+    sub-formulas of the expression they come from. None if satisfiable, UNKNOWN if the budget ran out.
+    With minimize, removing any one clause of the core makes it satisfiable (see Solver.unsat_core)."""
+
+    parsed = Parser.parse(exp)
+
+    provenance: dict[LogicTree, LogicTree] = {}
+    clauses = Transformer.transform(parsed, provenance=provenance)
+
+    return Solver.unsat_core(clauses, provenance, minimize=minimize, config=config)
+
+
+def dpll_export(exp: str, target: str | os.PathLike | IO, names_target: str | os.PathLike | IO | None = None) -> list[str]:
+    """Writes the CNF of the expression as DIMACS to target (see write_dimacs), numbering variables the
+    same way every time (see Solver.encode). The name of each variable goes to names_target, by default
+    target with .names.json appended when target is a path (see write_names). Returns those names."""
+
+    clauses = Transformer.transform(Parser.parse(exp))
+    db, variables = Solver.encode(clauses)
+    names = variables.names()
+
+    write_dimacs(target, db, len(variables))
+    if names_target is None and isinstance(target, (str, os.PathLike)):
+        names_target = f"{os.fspath(target)}.names.json"
+    if names_target is not None:
+        write_names(names_target, names)
+    return names
+
 # Util methods
 
 
-def dpll_valid(expr: str, verbose: bool = False) -> bool:
+def _negate(satisfiable: bool | Unknown) -> bool | Unknown:
+    return satisfiable if satisfiable is UNKNOWN else not satisfiable
+
+
+def dpll_valid(expr: str, verbose: bool = False, algorithm: SolverAlgorithm = SolverAlgorithm.DPLL,
+               config: SolverConfig | None = None) -> bool | Unknown:
     formula = f"¬({expr})"
     if verbose:
         print(f"Check if {formula} is UNSAT")
-    return not dpll(formula)
+    return _negate(dpll(formula, algorithm=algorithm, config=config))
 
 
-def dpll_valid_with_cex(expr: str, verbose: bool = False) -> list[SolverVariable] | None:
+def dpll_valid_with_cex(expr: str, verbose: bool = False, algorithm: SolverAlgorithm = SolverAlgorithm.DPLL,
+                        config: SolverConfig | None = None) -> list[SolverVariable] | None | Unknown:
     formula = f"¬({expr})"
     if verbose:
         print(f"Check if {formula} is UNSAT")
-    return dpll_model(formula)
+    return dpll_model(formula, algorithm=algorithm, config=config)
+
+
+def dpll_valid_core(expr: str, minimize: bool = False, config: SolverConfig | None = None) -> UnsatCore | None | Unknown:
+    """The parts of expr that make it valid, as the core of its negation; None if it is not valid"""
+    return dpll_core(f"¬({expr})", minimize=minimize, config=config)
 
 
-def dpll_equiv(expr1: str, expr2: str, verbose: bool = False) -> bool:
+def dpll_equiv(expr1: str, expr2: str, verbose: bool = False, algorithm: SolverAlgorithm = SolverAlgorithm.DPLL,
+               config: SolverConfig | None = None) -> bool | Unknown:
     formula = f"¬(({expr1}) = ({expr2}))"
     if verbose:
         print(f"Check if {formula} is UNSAT")
-    return not dpll(formula)
+    return _negate(dpll(formula, algorithm=algorithm, config=config))
 
 
-def dpll_equiv_with_cex(expr1: str, expr2: str) -> list[SolverVariable] | None:
+def dpll_equiv_with_cex(expr1: str, expr2: str, algorithm: SolverAlgorithm = SolverAlgorithm.DPLL,
+                        config: SolverConfig | None = None) -> list[SolverVariable] | None | Unknown:
     formula = f"¬(({expr1}) = ({expr2}))"
-    return dpll_model(formula)
+    return dpll_model(formula, algorithm=algorithm, config=config)
+
+
+def dpll_equiv_core(expr1: str, expr2: str, minimize: bool = False,
+                    config: SolverConfig | None = None) -> UnsatCore | None | Unknown:
+    """The parts of both expressions that make them equivalent; None if they are not equivalent"""
+    return dpll_core(f"¬(({expr1}) = ({expr2}))", minimize=minimize, config=config)
@@ -2,7 +2,7 @@ from enum import Enum
 import logging
 from typing import Final, NamedTuple
 from dpll.logic_tree import LogicTree
-from dpll.types import Operator, Variable, Tautology, Contradiction
+from dpll.types import Cardinality, CardinalityKind, Operator, Variable, Tautology, Contradiction
 
 # standard logic precedence
 _precedence = {'¬': 5, '∧': 4, '∨': 3, '→': 2, '↔': 1}
@@ -30,9 +30,10 @@ class TokenType(Enum):
 
 class Token():
 
-    def __init__(self, value: str, type: TokenType):
+    def __init__(self, value: str, type: TokenType, tree: LogicTree | None = None):
         self.value: Final = value
         self.type: Final = type
+        self.tree: Final = tree  # already parsed, for cardinality constraints
 
     def __str__(self):
         return f"<Token value: '{self.value}' type: {self.type.name}>"
@@ -52,6 +53,11 @@ class Token():
     def Var(value: str):
         return Token(value, TokenType.ATOM)
 
+    @staticmethod
+    def Cardinality(value: str, tree: LogicTree):
+        """A whole atmost/atleast/exactly(k, ...) call, which parses like an atom"""
+        return Token(value, TokenType.ATOM, tree)
+
     @staticmethod
     def StartBracket():
         return Token('(', TokenType.START_BRACKET)
@@ -109,7 +115,9 @@ class Parser:
         lexeme = ""
         tokens: list[Token] = []
 
-        for i, char in enumerate(newexp):
+        i = 0
+        while i < len(newexp):
+            char = newexp[i]
             match char:
                 case "(" | ")":
                     tokens.append(Token.StartBracket() if char == "(" else Token.EndBracket())
@@ -119,6 +127,13 @@ class Parser:
                     tokens.append(Token.BinaryOp(char))
                 case _:
                     lexeme += char
+                    if lexeme in CardinalityKind and newexp[i+1:i+2] == "(":
+                        end = Parser._closing_bracket(newexp, i + 1)
+                        tokens.append(Token.Cardinality(newexp[i+1-len(lexeme):end+1],
+                                                        Parser._cardinality(lexeme, newexp[i+2:end])))
+                        lexeme = ""
+                        i = end + 1
+                        continue
                     if (i+1 < len(newexp)):  # if not EOL
                         if newexp[i+1] in ["→", "↔", "∧", "∨", "¬", "(", ")"]:  # if operator comes next
                             tokens.append(Token.Var(lexeme))
@@ -126,10 +141,40 @@ class Parser:
                     else:  # EOL
                         if lexeme != "":
                             tokens.append(Token.Var(lexeme))
+            i += 1
         lexer_logger.info("Lexer finished")
         lexer_logger.debug(f"Tokens produced: {" ".join([str(x) for x in tokens])}")
         return tokens
 
+    @staticmethod
+    def _closing_bracket(exp: str, start: int) -> int:
+        """Index of the bracket that closes the one at start"""
+        depth = 0
+        for i in range(start, len(exp)):
+            depth += {"(": 1, ")": -1}.get(exp[i], 0)
+            if depth == 0:
+                return i
+        raise SyntaxError(f"Unclosed bracket in \"{exp}\"!")
+
+    @staticmethod
+    def _cardinality(kind: str, arguments: str) -> LogicTree:
+        """Parses the arguments of kind(k, e1, ..., en): a bound k >= 0, then any expressions"""
+        args: list[str] = []
+        depth = 0
+        current = ""
+        for char in arguments:
+            depth += {"(": 1, ")": -1}.get(char, 0)
+            if char == "," and depth == 0:
+                args.append(current)
+                current = ""
+            else:
+                current += char
+        args.append(current)
+        if not args[0].isdigit():
+            raise SyntaxError(f"{kind} needs a bound k >= 0 first, got \"{args[0]}\"!")
+        operands = [Parser.parse(arg) for arg in args[1:]]
+        return LogicTree(Cardinality(CardinalityKind(kind), int(args[0])), operands=operands)
+
     @staticmethod
     def syntax_check(tokens_with_data: list[Token]) -> bool:
         """Returns True if the given list of tokens produces a valid propositional logic expression"""
@@ -176,6 +221,9 @@ class Parser:
         arguments: list[LogicTree] = []
         tree = None
         for x in postfix_tokens:
+            if x.tree is not None:
+                arguments.append(x.tree)
+                continue
             match x.value:
                 case "¬":
                     node = arguments.pop()
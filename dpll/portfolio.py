@@ -0,0 +1,181 @@
+from dataclasses import replace
+import logging
+import multiprocessing
+import os
+import queue
+import traceback
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from dpll.budget import UNKNOWN, Budget, Unknown
+from dpll.cdcl import CDCLSolver
+from dpll.heuristics import Heuristic, make_heuristic
+from dpll.restarts import Restart, make_restart_policy
+from dpll.stats import SolverStats
+
+if TYPE_CHECKING:
+    from dpll.solver import SolverConfig
+
+
+_logger = logging.getLogger(f"{__name__}")
+
+
+class ClauseExchange:
+    """
+    Learned clause sharing between portfolio workers through shared memory.
+
+    Every worker owns one ring buffer of fixed size slots in a shared int array, which only
+    it writes to. buffer[0] counts the clauses ever written; slot n % slots holds clause n as
+    [n, length, literals...]. The writer blanks the sequence number while it fills a slot,
+    so a reader that sees the same number before and after copying the literals got a whole
+    clause. Readers that fall more than a full ring behind skip what was overwritten.
+    """
+
+    def __init__(self, workers: int, slots: int = 1024, max_length: int = 8, max_lbd: int = 4):
+        self.slots = slots
+        self.max_length = max_length
+        self.max_lbd = max_lbd
+        self._slot_size = 2 + max_length
+        self._buffers = [multiprocessing.Array('i', 1 + slots * self._slot_size, lock=False) for _ in range(workers)]
+        self._worker = -1
+        self._read: list[int] = []
+
+    def attach(self, worker: int) -> None:
+        """Called in each worker process before exporting or collecting"""
+        self._worker = worker
+        self._read = [0] * len(self._buffers)
+
+    def export(self, clause: list[int], lbd: int) -> None:
+        if len(clause) > self.max_length or lbd > self.max_lbd:
+            return
+        buffer = self._buffers[self._worker]
+        n = buffer[0]
+        offset = 1 + (n % self.slots) * self._slot_size
+        buffer[offset] = -1
+        buffer[offset + 1] = len(clause)
+        buffer[offset + 2:offset + 2 + len(clause)] = clause
+        buffer[offset] = n
+        buffer[0] = n + 1
+
+    def collect(self) -> list[list[int]]:
+        """Clauses the other workers exported since the last call"""
+        clauses: list[list[int]] = []
+        for worker, buffer in enumerate(self._buffers):
+            if worker == self._worker:
+                continue
+            count = buffer[0]
+            for n in range(max(self._read[worker], count - self.slots), count):
+                offset = 1 + (n % self.slots) * self._slot_size
+                if buffer[offset] != n:
+                    continue
+                length = buffer[offset + 1]
+                clause = buffer[offset + 2:offset + 2 + length]
+                if buffer[offset] == n:
+                    clauses.append(clause)
+            self._read[worker] = count
+        return clauses
+
+
+class PortfolioResult(NamedTuple):
+    satisfiable: bool | Unknown
+    values: list[bool]  # value of each variable, index 0 unused; empty if unsatisfiable
+    stats: SolverStats
+    worker: int  # index of the configuration that finished first
+
+
+class Portfolio:
+    """
+    Runs differently configured CDCL searches on the same clauses in parallel processes.
+    The first one to finish decides the result and the others are terminated.
+    """
+
+    # Heuristic and restart combinations handed out in turn; workers that share one get different seeds
+    _strategies: list[tuple[Heuristic, Restart, bool]] = [
+        (Heuristic.VSIDS, Restart.LUBY, True),
+        (Heuristic.VSIDS, Restart.GLUCOSE, True),
+        (Heuristic.VSIDS, Restart.GEOMETRIC, True),
+        (Heuristic.VSIDS, Restart.LUBY, False),
+        (Heuristic.VSIDS, Restart.GLUCOSE, False),
+        (Heuristic.JEROSLOW_WANG, Restart.LUBY, True),
+    ]
+
+    @staticmethod
+    def configs(base: "SolverConfig", workers: int | None = None) -> "list[SolverConfig]":
+        """
+        One SolverConfig per worker (os.cpu_count() if workers is None). The first keeps
+        base as is; the rest vary heuristic, restarts, phase saving and seed.
+        """
+        count = workers if workers is not None else (os.cpu_count() or 1)
+        configs = [base]
+        for i in range(1, count):
+            heuristic, restarts, phase_saving = Portfolio._strategies[i % len(Portfolio._strategies)]
+            configs.append(replace(base, heuristic=heuristic, restarts=restarts, phase_saving=phase_saving,
+                                   seed=(base.seed or 0) + i))
+        return configs
+
+    @staticmethod
+    def _worker(index: int, clauses: list[list[int]], num_vars: int, config: "SolverConfig",
+                exchange: ClauseExchange | None, results: multiprocessing.Queue) -> None:
+        try:
+            search = CDCLSolver(clauses, num_vars,
+                                make_heuristic(config.heuristic if config.heuristic is not None else Heuristic.VSIDS),
+                                restarts=make_restart_policy(config.restarts), phase_saving=config.phase_saving,
+                                reduce_interval=config.reduce_interval, max_learned=config.max_learned,
+                                seed=config.seed)
+            if exchange is not None:
+                exchange.attach(index)
+                search.exchange = exchange
+            satisfiable = search.solve(budget=Budget.from_config(config))
+            results.put((index, satisfiable, search.model() if satisfiable is True else [], search.stats, None))
+        except Exception:
+            results.put((index, False, [], SolverStats(), traceback.format_exc()))
+
+    @staticmethod
+    def solve(clauses: Iterable[Iterable[int]], num_vars: int, configs: "list[SolverConfig]", share: bool = True) -> PortfolioResult:
+        """
+        Solves the clauses with one worker process per config. The first config's timeout and
+        cancellation token apply to the whole portfolio; the result is UNKNOWN (with worker -1)
+        once either stops it, or once every worker has run out of its own budget.
+        """
+        clause_list = [list(clause) for clause in clauses]
+        exchange = ClauseExchange(len(configs)) if share and len(configs) > 1 else None
+        results: multiprocessing.Queue = multiprocessing.Queue()
+        # Tokens and callbacks only work within one process; the portfolio polls the token here instead
+        processes = [multiprocessing.Process(target=Portfolio._worker,
+                                             args=(i, clause_list, num_vars, replace(config, cancel=None, progress=None), exchange, results),
+                                             daemon=True)
+                     for i, config in enumerate(configs)]
+        for process in processes:
+            process.start()
+
+        budget = Budget(timeout=configs[0].timeout, cancel=configs[0].cancel)
+        budget.start(SolverStats())
+        try:
+            errors: list[str] = []
+            unknown = 0
+            while len(errors) + unknown < len(processes):
+                if budget.out_of_time():
+                    return PortfolioResult(UNKNOWN, [], SolverStats(), -1)
+                try:
+                    index, satisfiable, values, stats, error = results.get(timeout=0.05)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        raise RuntimeError("Every portfolio worker exited without a result")
+                    continue
+                if error is not None:
+                    _logger.warning(f"Portfolio worker {index} failed:\n{error}")
+                    errors.append(error)
+                    continue
+                if satisfiable is UNKNOWN:
+                    unknown += 1
+                    continue
+                _logger.info(f"Portfolio worker {index} finished first: {'SAT' if satisfiable else 'UNSAT'}")
+                return PortfolioResult(satisfiable, values, stats, index)
+            if unknown:
+                return PortfolioResult(UNKNOWN, [], SolverStats(), -1)
+            raise RuntimeError(f"Every portfolio worker failed, first error:\n{errors[0]}")
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join()
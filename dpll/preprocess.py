@@ -0,0 +1,262 @@
+import logging
+from typing import TYPE_CHECKING, Iterable
+
+from dpll.stats import SolverStats
+
+if TYPE_CHECKING:
+    from dpll.proof import DratWriter
+
+
+_logger = logging.getLogger(f"{__name__}")
+
+
+class Preprocessor:
+    """
+    SatELite style simplification of integer clauses before search.
+
+    run() repeats three steps until none of them changes anything:
+    - backward subsumption drops every clause that contains another clause
+    - self-subsuming resolution removes -l from a clause D when some clause C with l in it
+      has all of its other literals in D, because resolving C and D gives D without -l
+    - bounded variable elimination replaces the clauses of a variable with all their
+      non-tautological resolvents, as long as that does not add clauses
+
+    Units found along the way are assigned and propagated. Tseytin definitions are
+    mostly eliminated, since each one only occurs in the few clauses that define it
+    and in the clauses of its parent.
+
+    Eliminated variables are left out of clauses(); extend_model assigns them from a
+    model of the remaining clauses. Frozen variables, e.g. ones that assumptions or
+    later clauses will mention, are never eliminated.
+
+    With a DratWriter as proof, every derived clause is written as a lemma before the
+    clauses it came from are deleted, so search can continue the proof on clauses().
+    """
+
+    def __init__(self, clauses: Iterable[Iterable[int]], num_vars: int, frozen: Iterable[int] = (),
+                 max_occurrences: int = 16, max_resolvent: int = 24, proof: "DratWriter | None" = None):
+        self.num_vars = num_vars
+        self.max_occurrences = max_occurrences
+        self.max_resolvent = max_resolvent
+        self.proof = proof
+        self.stats = SolverStats()
+
+        self._clauses: list[list[int] | None] = []  # None marks a removed clause
+        # Indexed by literal like WatchedPropagator._lit_value, so negative literals wrap around
+        self._occurs: list[set[int]] = [set() for _ in range(2 * num_vars + 1)]
+        self._lit_value: list[int] = [0] * (2 * num_vars + 1)
+        self._units: list[int] = []
+        self._propagated = 0  # units[:_propagated] have been applied to the clauses
+        self._frozen: set[int] = {abs(lit) for lit in frozen}
+        self._eliminated: set[int] = set()
+        self._elim_stack: list[list[int]] = []  # clauses of eliminated variables, pivot literal first
+
+        self._subsume_queue: list[int] = []
+        self._touched: set[int] = set()
+        self._ok = True
+
+        for clause in clauses:
+            self._add(clause)
+
+    def _add(self, clause: Iterable[int], derived: bool = False) -> None:
+        lits = list(dict.fromkeys(clause))
+        if any(-lit in lits for lit in lits):
+            return
+        if any(self._lit_value[lit] == 1 for lit in lits):
+            return
+        lits = [lit for lit in lits if self._lit_value[lit] == 0]
+        if derived and self.proof is not None:
+            self.proof.add(lits)
+        if not lits:
+            self._ok = False
+        elif len(lits) == 1:
+            self._enqueue(lits[0])
+        else:
+            cid = len(self._clauses)
+            self._clauses.append(lits)
+            for lit in lits:
+                self._occurs[lit].add(cid)
+                self._touched.add(abs(lit))
+            self._subsume_queue.append(cid)
+
+    def _remove(self, cid: int, deleted: bool = False) -> None:
+        """deleted tells that the proof already has the clause deleted"""
+        clause = self._clauses[cid]
+        assert clause is not None
+        if self.proof is not None and not deleted:
+            self.proof.delete(clause)
+        for lit in clause:
+            self._occurs[lit].discard(cid)
+            self._touched.add(abs(lit))
+        self._clauses[cid] = None
+
+    def _strengthen(self, cid: int, lit: int) -> None:
+        """Removes lit from clause cid"""
+        clause = self._clauses[cid]
+        assert clause is not None
+        if self.proof is not None:
+            self.proof.add([other for other in clause if other != lit])
+            self.proof.delete(clause)
+        clause.remove(lit)
+        self._occurs[lit].discard(cid)
+        self._touched.add(abs(lit))
+        if len(clause) == 1:
+            self._remove(cid, deleted=True)
+            self._enqueue(clause[0])
+        else:
+            self._subsume_queue.append(cid)
+
+    def _enqueue(self, lit: int) -> None:
+        if self._lit_value[lit] == -1:
+            self._ok = False
+        elif self._lit_value[lit] == 0:
+            self._lit_value[lit] = 1
+            self._lit_value[-lit] = -1
+            self._units.append(lit)
+
+    def _propagate(self) -> bool:
+        """Removes satisfied clauses and false literals for every unit; False on a conflict"""
+        while self._ok and self._propagated < len(self._units):
+            lit = self._units[self._propagated]
+            self._propagated += 1
+            for cid in list(self._occurs[lit]):
+                self._remove(cid)
+            for cid in list(self._occurs[-lit]):
+                self._strengthen(cid, -lit)
+        return self._ok
+
+    @staticmethod
+    def _subsumes(c: list[int], d: set[int]) -> int | None:
+        """
+        None if c does not subsume d, even with one literal flipped. Otherwise 0 if c subsumes d,
+        or the literal l of c for which d can drop -l (self-subsuming resolution).
+        """
+        flipped = 0
+        for lit in c:
+            if lit in d:
+                continue
+            if flipped == 0 and -lit in d:
+                flipped = lit
+                continue
+            return None
+        return flipped
+
+    def _backward_subsumption(self) -> None:
+        clauses = self._clauses
+        occurs = self._occurs
+        while self._subsume_queue and self._ok:
+            cid = self._subsume_queue.pop()
+            c = clauses[cid]
+            if c is None:
+                continue
+            # Any clause that c subsumes or strengthens contains the variable of c with the fewest occurrences
+            var = min((abs(lit) for lit in c), key=lambda v: len(occurs[v]) + len(occurs[-v]))
+            for other in list(occurs[var] | occurs[-var]):
+                d = clauses[other]
+                if other == cid or d is None or len(d) < len(c):
+                    continue
+                result = self._subsumes(c, set(d))
+                if result == 0:
+                    self._remove(other)
+                    self.stats.subsumed_clauses += 1
+                elif result is not None:
+                    self._strengthen(other, -result)
+                    self.stats.strengthened_clauses += 1
+                if clauses[cid] is None:
+                    break  # c itself became a unit
+            self._propagate()
+
+    def _resolvents(self, var: int) -> list[list[int]] | None:
+        """Non-tautological resolvents on var, or None if eliminating var would add clauses"""
+        pos = [self._clauses[cid] for cid in self._occurs[var]]
+        neg = [self._clauses[cid] for cid in self._occurs[-var]]
+        limit = len(pos) + len(neg)
+        resolvents: list[list[int]] = []
+        for c in pos:
+            assert c is not None
+            rest = [lit for lit in c if lit != var]
+            for d in neg:
+                assert d is not None
+                resolvent = dict.fromkeys(rest)
+                tautology = False
+                for lit in d:
+                    if lit == -var:
+                        continue
+                    if -lit in resolvent:
+                        tautology = True
+                        break
+                    resolvent[lit] = None
+                if tautology:
+                    continue
+                if len(resolvent) > self.max_resolvent or len(resolvents) == limit:
+                    return None
+                resolvents.append(list(resolvent))
+        return resolvents
+
+    def _eliminate(self, var: int) -> bool:
+        occurs = self._occurs
+        if len(occurs[var]) > self.max_occurrences and len(occurs[-var]) > self.max_occurrences:
+            return False
+        resolvents = self._resolvents(var)
+        if resolvents is None:
+            return False
+
+        # Keep the smaller side for extend_model, plus a unit making the other side the default
+        pivot = var if len(occurs[var]) <= len(occurs[-var]) else -var
+        for cid in occurs[pivot]:
+            clause = self._clauses[cid]
+            assert clause is not None
+            self._elim_stack.append([pivot, *(lit for lit in clause if lit != pivot)])
+        self._elim_stack.append([-pivot])
+
+        removed = list(occurs[var] | occurs[-var])
+        for resolvent in resolvents:
+            self._add(resolvent, derived=True)
+        for cid in removed:
+            self._remove(cid)
+        self._eliminated.add(var)
+        self.stats.eliminated_vars += 1
+        return self._propagate()
+
+    def _variable_elimination(self) -> bool:
+        """One pass over the variables touched since the last one; True if any was eliminated"""
+        occurs = self._occurs
+        candidates = [var for var in self._touched
+                      if var not in self._frozen and var not in self._eliminated and self._lit_value[var] == 0]
+        self._touched = set()
+        candidates.sort(key=lambda v: len(occurs[v]) + len(occurs[-v]))
+        eliminated = False
+        for var in candidates:
+            if not self._ok:
+                break
+            if self._lit_value[var] == 0 and self._eliminate(var):
+                eliminated = True
+                self._backward_subsumption()
+        return eliminated
+
+    def run(self) -> bool:
+        """Simplifies the clauses; False if they turn out to be unsatisfiable"""
+        if not self._propagate():
+            return False
+        self._backward_subsumption()
+        while self._ok and self._variable_elimination():
+            pass
+        _logger.debug(f"Eliminated {self.stats.eliminated_vars} variables, subsumed {self.stats.subsumed_clauses} "
+                      f"and strengthened {self.stats.strengthened_clauses} clauses")
+        return self._ok
+
+    def clauses(self) -> list[list[int]]:
+        """The simplified clauses, including a unit clause for every literal fixed along the way"""
+        return [[lit] for lit in self._units] + [clause for clause in self._clauses if clause is not None]
+
+    def extend_model(self, values: list[bool]) -> list[bool]:
+        """
+        Completes a model of clauses() (values indexed by variable, index 0 unused) into a model
+        of the original clauses by assigning the eliminated variables, latest elimination first.
+        """
+        values = list(values) + [False] * (self.num_vars + 1 - len(values))
+        for clause in reversed(self._elim_stack):
+            pivot = clause[0]
+            if not any(values[abs(lit)] == (lit > 0) for lit in clause[1:]):
+                values[abs(pivot)] = pivot > 0
+        return values
@@ -0,0 +1,234 @@
+import io
+import logging
+import os
+import sys
+from typing import IO, Iterable, Iterator
+
+from dpll.dimacs import iter_dimacs, write_dimacs
+from dpll.propagation import NO_REASON, WatchedPropagator
+
+
+_logger = logging.getLogger(f"{__name__}")
+
+ProofSource = str | os.PathLike | bytes | IO
+
+
+class DratWriter:
+    """
+    Writes a DRAT proof, as text or in the binary format, to a path or an open file.
+
+    Lemmas are encoded into an in-memory buffer that is written out whenever it grows past
+    buffer_size bytes, and on flush() or close(), so emitting one costs about as much as
+    formatting it. A text file object receives str, anything else bytes.
+
+    A proof refers to variables by number, so the engines write the formula they were given
+    to cnf (a path or an open file) as DIMACS, with a "c <var> <name>" line per named variable.
+    Use one writer per solve call.
+    """
+
+    def __init__(self, target: str | os.PathLike | IO, binary: bool = False, cnf: str | os.PathLike | IO | None = None,
+                 buffer_size: int = 1 << 16):
+        self.binary = binary
+        self.buffer_size = buffer_size
+        self._owned = isinstance(target, (str, os.PathLike))
+        self._file: IO = open(target, "wb") if isinstance(target, (str, os.PathLike)) else target
+        self._text = isinstance(self._file, io.TextIOBase)
+        self._cnf = cnf
+        self._buffer = bytearray()
+
+    def __enter__(self) -> "DratWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _encode(self, prefix: bytes, clause: Iterable[int]) -> None:
+        buffer = self._buffer
+        if self.binary:
+            buffer += prefix
+            for lit in clause:
+                value = 2 * abs(lit) + (lit < 0)
+                while value > 0x7f:
+                    buffer.append(value & 0x7f | 0x80)
+                    value >>= 7
+                buffer.append(value)
+            buffer.append(0)
+        else:
+            if prefix == b"d":
+                buffer += b"d "
+            buffer += " ".join([*map(str, clause), "0\n"]).encode()
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+
+    def add(self, clause: Iterable[int]) -> None:
+        self._encode(b"a", clause)
+
+    def delete(self, clause: Iterable[int]) -> None:
+        self._encode(b"d", clause)
+
+    def begin(self, clauses: list[list[int]], num_vars: int, names: list[str] | None = None) -> None:
+        """Called by the engine with the formula the proof refers to, before any lemma"""
+        if self._cnf is None:
+            return
+        comments = (f"{var} {name}" for var, name in enumerate(names or [], start=1))
+        write_dimacs(self._cnf, clauses, num_vars, comments)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write(self._buffer.decode() if self._text else bytes(self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._owned:
+            self._file.close()
+
+
+def _read(source: ProofSource) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file:
+            return file.read()
+    data = source.read()
+    return data.encode() if isinstance(data, str) else data
+
+
+def read_drat(source: ProofSource, binary: bool | None = None) -> Iterator[tuple[bool, list[int]]]:
+    """
+    (is_deletion, clause) for every step of a proof in a path, bytes or open file. The format is
+    detected like drat-trim does when binary is None: any byte outside text DRAT means binary.
+    """
+    data = _read(source)
+    if binary is None:
+        binary = any(byte not in b"0123456789-d \t\r\nc" for byte in data[:64])
+    if binary:
+        i = 0
+        while i < len(data):
+            deletion = data[i] == ord("d")
+            i += 1
+            clause: list[int] = []
+            while True:
+                value, shift = 0, 0
+                while data[i] & 0x80:
+                    value |= (data[i] & 0x7f) << shift
+                    shift += 7
+                    i += 1
+                value |= data[i] << shift
+                i += 1
+                if value == 0:
+                    break
+                clause.append(-(value >> 1) if value & 1 else value >> 1)
+            yield deletion, clause
+    else:
+        for line in data.decode().splitlines():
+            tokens = line.split()
+            if not tokens or tokens[0] == "c":
+                continue
+            deletion = tokens[0] == "d"
+            yield deletion, [int(token) for token in tokens[deletion:-1]]
+
+
+def read_cnf(source: ProofSource) -> list[list[int]]:
+    """Clauses of a DIMACS CNF in a path, bytes or open file"""
+    return list(iter_dimacs(source))
+
+
+class DratChecker(WatchedPropagator):
+    """
+    Forward DRAT checker. Each lemma must be a reverse unit propagation (RUP) consequence of
+    the clauses so far, or else have the resolution asymmetric tautology (RAT) property on its
+    first literal; deletions take clauses out again. The proof is valid once the empty
+    clause has been derived.
+
+    Like drat-trim, deletions of unit clauses are ignored, since the assignments they caused
+    at level 0 stay. A RAT check on a literal assigned at level 0 fails, as the clauses that
+    would have to be checked may be gone.
+    """
+
+    def __init__(self, clauses: Iterable[Iterable[int]]):
+        super().__init__(0)
+        self._clause_ids: dict[tuple[int, ...], list[int]] = {}
+        self._deleted: set[int] = set()
+        for clause in clauses:
+            self._add(list(clause))
+
+    def _add(self, clause: list[int]) -> None:
+        before = len(self._db)
+        self.add_clause(clause)
+        if len(self._db) > before:
+            self._clause_ids.setdefault(tuple(sorted(set(clause))), []).append(before)
+        if self._ok and self.propagate() != NO_REASON:
+            self._ok = False
+
+    def _delete(self, clause: list[int]) -> None:
+        ids = self._clause_ids.get(tuple(sorted(set(clause))))
+        if not ids:
+            return  # a unit, or a clause that was satisfied at level 0 and never stored
+        cid = ids.pop()
+        start = self._db.starts[cid]
+        self._watches[self._db.lits[start]].remove(cid)
+        self._watches[self._db.lits[start + 1]].remove(cid)
+        self._deleted.add(cid)
+
+    def _rup(self, lemma: list[int]) -> bool:
+        lit_value = self._lit_value
+        if any(lit_value[lit] == 1 for lit in lemma):
+            return True
+        self._trail_lim.append(len(self._trail))
+        for lit in lemma:
+            if lit_value[lit] == 0:
+                self._assign(-lit, NO_REASON)
+        conflict = self.propagate()
+        self._backtrack(0)
+        return conflict != NO_REASON
+
+    def _rat(self, lemma: list[int]) -> bool:
+        if not lemma or self._lit_value[lemma[0]] != 0:
+            return False
+        pivot = lemma[0]
+        for cid in range(len(self._db)):
+            if cid in self._deleted:
+                continue
+            clause = self._db.clause(cid)
+            if -pivot not in clause:
+                continue
+            resolvent = lemma + [lit for lit in clause if lit != -pivot]
+            if any(-lit in resolvent for lit in resolvent):
+                continue
+            if not self._rup(resolvent):
+                return False
+        return True
+
+    def check(self, proof: Iterable[tuple[bool, list[int]]]) -> bool:
+        """True if the proof derives the empty clause"""
+        for step, (deletion, clause) in enumerate(proof):
+            if not self._ok:
+                break
+            self._grow(max((abs(lit) for lit in clause), default=0))
+            if deletion:
+                self._delete(clause)
+            elif self._rup(clause) or self._rat(clause):
+                self._add(clause)
+            else:
+                _logger.info(f"Proof step {step} {clause} is neither RUP nor RAT")
+                return False
+        return not self._ok
+
+
+def check_drat(formula: Iterable[Iterable[int]] | ProofSource, proof: ProofSource, binary: bool | None = None) -> bool:
+    """
+    Checks that proof refutes formula, given as clauses or as a DIMACS CNF path, bytes or file.
+    Also runs as `python -m dpll.proof formula.cnf proof.drat`.
+    """
+    clauses = read_cnf(formula) if isinstance(formula, (str, os.PathLike, bytes, io.IOBase)) else formula
+    return DratChecker(clauses).check(read_drat(proof, binary))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m dpll.proof FORMULA.cnf PROOF.drat")
+    verified = check_drat(sys.argv[1], sys.argv[2])
+    print("s VERIFIED" if verified else "s NOT VERIFIED")
+    sys.exit(0 if verified else 1)
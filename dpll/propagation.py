@@ -0,0 +1,267 @@
+from typing import Iterable
+
+from dpll.clause_db import ClauseDatabase
+from dpll.heuristics import BranchingHeuristic, Ordered
+from dpll.stats import SolverStats
+from dpll.xor import GaussJordan, XorConstraint
+
+# Literals are DIMACS style signed ints: variable v (1-based) is v when positive, -v when negated
+
+NO_REASON = -1
+
+
+class WatchedPropagator:
+    """
+    Two watched literal unit propagation over a ClauseDatabase.
+
+    The first two literals of every clause of length >= 2 are its watches, and a clause is
+    only visited when one of them becomes false. Unassigning a variable can never break the
+    watch invariant, so backtracking leaves the watch lists untouched.
+
+    Search engines built on it pass the heuristic that picks their decisions (lowest numbered
+    variable first if none is given); it is told about every backtrack.
+
+    Parity constraints added with add_xors are propagated by Gauss-Jordan elimination
+    whenever the clauses are done, until neither has anything left to assign. Every literal
+    the matrix implies gets its explanation clause added as a learned clause, as its reason,
+    and a violated row becomes the conflicting clause, so conflict analysis needs no changes.
+    Engines that never reduce their learned clauses set keep_xor_reasons to False: the
+    explanations then stay unwatched at the end of the database and go again once the
+    backtrack that unassigns their literal comes, so they cannot pile up.
+    """
+
+    keep_xor_reasons = True
+
+    def __init__(self, num_vars: int, heuristic: BranchingHeuristic | None = None):
+        self.num_vars = num_vars
+
+        # Indexed by literal; negative literals wrap around to the back half of the list,
+        # so _lit_value[lit] is 1 if lit is true, -1 if false and 0 if unassigned.
+        self._lit_value: list[int] = [0] * (2 * num_vars + 1)
+        self._level: list[int] = [0] * (num_vars + 1)
+        self._reason: list[int] = [NO_REASON] * (num_vars + 1)  # id of the clause that implied each variable
+
+        self._trail: list[int] = []
+        self._trail_lim: list[int] = []  # trail index at which each decision level starts
+        self._qhead = 0
+
+        self._db = ClauseDatabase()
+        self._gauss: GaussJordan | None = None
+        self._xor_head = 0  # trail index up to which the matrix has been told the assignments
+        self._xor_scratch: list[int] = []  # decision level of each explanation kept only until its backtrack
+        self._watches: list[list[int]] = [[] for _ in range(2 * num_vars + 1)]  # clause ids watching each literal
+        self._ok = True
+        self.stats = SolverStats()
+
+        self._heuristic = heuristic if heuristic is not None else Ordered()
+        self._heuristic.setup(num_vars, self._db, self._lit_value)
+
+    def add_clause(self, clause: Iterable[int]) -> None:
+        """
+        Adds a clause, first backtracking to decision level 0 if a search left assignments behind.
+        Literals already false at level 0 are dropped, and units are assigned rather than stored.
+        """
+        self._backtrack(0)
+        self._free_xor_reasons(-1)
+        lits = list(dict.fromkeys(clause))  # de-duplicate, keep order
+        if any(-lit in lits for lit in lits):
+            return  # tautological clause, always satisfied
+        self._grow(max((abs(lit) for lit in lits), default=0))
+        if any(self._lit_value[lit] == 1 for lit in lits):
+            return  # already satisfied at level 0
+        lits = [lit for lit in lits if self._lit_value[lit] == 0]
+        if not lits:
+            self._ok = False
+            return
+        if len(lits) == 1:
+            lit = lits[0]
+            if self._lit_value[lit] == -1:
+                self._ok = False
+            elif self._lit_value[lit] == 0:
+                self._assign(lit, NO_REASON)
+            return
+        self._attach(self._db.add(lits))
+
+    def add_xors(self, xors: Iterable[XorConstraint]) -> None:
+        """Adds parity constraints, first backtracking to decision level 0 like add_clause"""
+        self._backtrack(0)
+        self._free_xor_reasons(-1)
+        constraints = [*(self._gauss.constraints if self._gauss is not None else ()), *xors]
+        self._grow(max((var for xor in constraints for var in xor.variables), default=0))
+        self._gauss = GaussJordan(constraints)
+        self._xor_head = 0
+        if not self._gauss.ok:
+            self._ok = False
+
+    def _complete_xors(self) -> None:
+        """
+        Decides the variables of the parity constraints a search left unassigned once every clause
+        was satisfied. Each row then still has two of them open, so propagation cannot conflict.
+        """
+        if self._gauss is None:
+            return
+        for var in self._gauss.variables():
+            if self._lit_value[var] == 0:
+                self._trail_lim.append(len(self._trail))
+                self._assign(-var, NO_REASON)
+                conflict = self.propagate()
+                assert conflict == NO_REASON
+
+    def _grow(self, num_vars: int) -> None:
+        """Makes room for variables up to num_vars"""
+        old = self.num_vars
+        if num_vars <= old:
+            return
+        extra = num_vars - old
+        # Literal indexed lists keep negative literals at the back, so new slots go in the middle.
+        # Slice assignment keeps the list objects the heuristic already holds.
+        self._lit_value[old + 1:old + 1] = [0] * (2 * extra)
+        self._watches[old + 1:old + 1] = [[] for _ in range(2 * extra)]
+        self._level.extend([0] * extra)
+        self._reason.extend([NO_REASON] * extra)
+        self.num_vars = num_vars
+        self._heuristic.on_new_vars(num_vars)
+
+    def value(self, lit: int) -> int:
+        """1 if lit is true, -1 if false, 0 if unassigned"""
+        return self._lit_value[lit]
+
+    def assignments(self) -> list[int]:
+        """Assigned literals, in the order they were assigned"""
+        return list(self._trail)
+
+    def _attach(self, cid: int) -> None:
+        start = self._db.starts[cid]
+        self._watches[self._db.lits[start]].append(cid)
+        self._watches[self._db.lits[start + 1]].append(cid)
+
+    def _decision_level(self) -> int:
+        return len(self._trail_lim)
+
+    def _assign(self, lit: int, reason: int) -> None:
+        self._lit_value[lit] = 1
+        self._lit_value[-lit] = -1
+        self._level[abs(lit)] = len(self._trail_lim)
+        self._reason[abs(lit)] = reason
+        self._trail.append(lit)
+
+    def _backtrack(self, target_level: int) -> None:
+        """Unassigns every literal above target_level; costs one step per undone assignment"""
+        self._free_xor_reasons(target_level)
+        if len(self._trail_lim) <= target_level:
+            return
+        lit_value = self._lit_value
+        start = self._trail_lim[target_level]
+        undone = self._trail[start:]
+        for lit in undone:
+            lit_value[lit] = 0
+            lit_value[-lit] = 0
+        self._heuristic.on_backtrack(undone)
+        if self._gauss is not None:
+            self._gauss.unassign(undone)
+            self._xor_head = min(self._xor_head, start)
+        del self._trail[start:]
+        del self._trail_lim[target_level:]
+        self._qhead = len(self._trail)
+
+    def propagate(self) -> int:
+        """Unit propagation of every trail literal not yet processed; returns the id of a conflicting clause, or NO_REASON"""
+        conflict = self._propagate_clauses()
+        while conflict == NO_REASON and self._gauss is not None:
+            implied, conflicting = self._gauss.propagate(self._trail[self._xor_head:])
+            for clause in implied:
+                lit = clause[0]
+                self._assign(lit, self._xor_reason(clause) if self._trail_lim else NO_REASON)
+            self._xor_head = len(self._trail)  # the matrix counts what it implied as assigned already
+            if conflicting is not None:
+                return self._xor_reason(conflicting)
+            if not implied:
+                break
+            conflict = self._propagate_clauses()
+        return conflict
+
+    def _xor_reason(self, clause: list[int]) -> int:
+        """
+        Stores a clause explaining a parity propagation and returns its id. The implied literal
+        (or for a conflict, the one assigned last) is watched first, the latest of the rest second.
+        """
+        level = self._level
+        first = 0 if self._lit_value[clause[0]] == 0 else max(range(len(clause)), key=lambda i: level[abs(clause[i])])
+        clause[0], clause[first] = clause[first], clause[0]
+        if len(clause) > 1:
+            second = max(range(1, len(clause)), key=lambda i: level[abs(clause[i])])
+            clause[1], clause[second] = clause[second], clause[1]
+        cid = self._db.add(clause, learnt=True, lbd=len(clause))
+        if not self.keep_xor_reasons:
+            self._xor_scratch.append(len(self._trail_lim))
+        elif len(clause) > 1:
+            self._attach(cid)
+        return cid
+
+    def _free_xor_reasons(self, level: int) -> None:
+        """Drops the explanations kept only until their backtrack that were made above level"""
+        scratch = self._xor_scratch
+        count = 0
+        while count < len(scratch) and scratch[-1 - count] > level:
+            count += 1
+        if count:
+            del scratch[-count:]
+            self._db.truncate(len(self._db) - count)
+
+    def _propagate_clauses(self) -> int:
+        """propagate() without the parity constraints"""
+        lit_value = self._lit_value
+        level = self._level
+        reason = self._reason
+        watches = self._watches
+        trail = self._trail
+        lits = self._db.lits
+        starts = self._db.starts
+        sizes = self._db.sizes
+        first = self._qhead
+
+        while self._qhead < len(trail):
+            false_lit = -trail[self._qhead]
+            self._qhead += 1
+            watching = watches[false_lit]
+            current_level = len(self._trail_lim)
+
+            # Compact the watch list in place: i reads, j writes back clauses still watching false_lit
+            i = j = 0
+            end = len(watching)
+            while i < end:
+                cid = watching[i]
+                i += 1
+                start = starts[cid]
+                if lits[start] == false_lit:
+                    lits[start] = lits[start + 1]
+                    lits[start + 1] = false_lit
+                other = lits[start]
+                if lit_value[other] == 1:
+                    watching[j] = cid
+                    j += 1
+                    continue
+
+                for k in range(start + 2, start + sizes[cid]):
+                    lit = lits[k]
+                    if lit_value[lit] != -1:
+                        lits[start + 1] = lit
+                        lits[k] = false_lit
+                        watches[lit].append(cid)
+                        break
+                else:
+                    watching[j] = cid
+                    j += 1
+                    if lit_value[other] == -1:
+                        watching[j:] = watching[i:end]
+                        self.stats.propagations += self._qhead - first
+                        self._qhead = len(trail)
+                        return cid
+                    lit_value[other] = 1
+                    lit_value[-other] = -1
+                    level[abs(other)] = current_level
+                    reason[abs(other)] = cid
+                    trail.append(other)
+            del watching[j:]
+        self.stats.propagations += self._qhead - first
+        return NO_REASON
@@ -0,0 +1,147 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from strenum import StrEnum
+
+
+class Restart(StrEnum):
+    """Restart schedules that can be selected by name, see make_restart_policy"""
+    NONE = "none"
+    LUBY = "luby"
+    GEOMETRIC = "geometric"
+    GLUCOSE = "glucose"
+
+
+class RestartPolicy(ABC):
+    """
+    Decides when a search engine abandons its current decisions and restarts from level 0.
+    The engine calls reset once before searching, on_conflict with the literal block distance
+    of every learned clause, and should_restart before each decision.
+    """
+
+    def reset(self) -> None:
+        pass
+
+    def on_conflict(self, lbd: int) -> None:
+        pass
+
+    @abstractmethod
+    def should_restart(self) -> bool:
+        pass
+
+    def on_restart(self) -> None:
+        pass
+
+
+class NoRestarts(RestartPolicy):
+    """Never restarts"""
+
+    def should_restart(self) -> bool:
+        return False
+
+
+class _ConflictLimitPolicy(RestartPolicy):
+    """Restarts once a number of conflicts have passed since the last restart; subclasses choose the number"""
+
+    def reset(self) -> None:
+        self._restarts = 0
+        self._conflicts = 0
+        self._limit = self._next_limit(0)
+
+    @abstractmethod
+    def _next_limit(self, restarts: int) -> float:
+        pass
+
+    def on_conflict(self, lbd: int) -> None:
+        self._conflicts += 1
+
+    def should_restart(self) -> bool:
+        return self._conflicts >= self._limit
+
+    def on_restart(self) -> None:
+        self._restarts += 1
+        self._conflicts = 0
+        self._limit = self._next_limit(self._restarts)
+
+
+def luby(i: int) -> int:
+    """i-th (0-based) element of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ..."""
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i = i % size
+    return 1 << seq
+
+
+class Luby(_ConflictLimitPolicy):
+    """Restart intervals follow the Luby sequence scaled by unit conflicts"""
+
+    def __init__(self, unit: int = 100):
+        self.unit = unit
+
+    def _next_limit(self, restarts: int) -> float:
+        return self.unit * luby(restarts)
+
+
+class Geometric(_ConflictLimitPolicy):
+    """Restart intervals start at first conflicts and grow by factor after each restart"""
+
+    def __init__(self, first: int = 100, factor: float = 1.5):
+        self.first = first
+        self.factor = factor
+
+    def _next_limit(self, restarts: int) -> float:
+        return self.first * self.factor ** restarts
+
+
+class Glucose(RestartPolicy):
+    """
+    Glucose-style dynamic restarts: restart when the average LBD of the last window learned
+    clauses, scaled by k, exceeds the average LBD over the whole search. Recent clauses being
+    worse than usual suggests the current decisions are leading nowhere.
+    """
+
+    def __init__(self, window: int = 50, k: float = 0.8):
+        self.window = window
+        self.k = k
+
+    def reset(self) -> None:
+        self._recent: deque[int] = deque(maxlen=self.window)
+        self._recent_sum = 0
+        self._total_sum = 0
+        self._total_count = 0
+
+    def on_conflict(self, lbd: int) -> None:
+        if len(self._recent) == self.window:
+            self._recent_sum -= self._recent[0]
+        self._recent.append(lbd)
+        self._recent_sum += lbd
+        self._total_sum += lbd
+        self._total_count += 1
+
+    def should_restart(self) -> bool:
+        if len(self._recent) < self.window:
+            return False
+        return self._recent_sum / self.window * self.k > self._total_sum / self._total_count
+
+    def on_restart(self) -> None:
+        self._recent.clear()
+        self._recent_sum = 0
+
+
+def make_restart_policy(restarts: "Restart | RestartPolicy") -> RestartPolicy:
+    """Instances are returned unchanged, names are built with their default parameters"""
+    if isinstance(restarts, RestartPolicy):
+        return restarts
+    match Restart(restarts):
+        case Restart.NONE:
+            return NoRestarts()
+        case Restart.LUBY:
+            return Luby()
+        case Restart.GEOMETRIC:
+            return Geometric()
+        case Restart.GLUCOSE:
+            return Glucose()
@@ -1,8 +1,23 @@
-import copy
+from dataclasses import dataclass
 import logging
-from typing import NamedTuple, Final
-
-from dpll.types import Operator
+from strenum import StrEnum
+from typing import Callable, Iterable, Iterator, NamedTuple, Final
+
+from dpll.budget import UNKNOWN, Budget, CancellationToken, Unknown
+from dpll.cdcl import CDCLSolver
+from dpll.clause_db import ClauseDatabase, VariableMap
+from dpll.counting import ModelCounter
+from dpll.cube import CubeAndConquer
+from dpll.heuristics import BranchingHeuristic, Heuristic, make_heuristic
+from dpll.local_search import LocalSearch, LocalSearchMethod
+from dpll.portfolio import Portfolio
+from dpll.preprocess import Preprocessor
+from dpll.proof import DratWriter
+from dpll.propagation import NO_REASON, WatchedPropagator
+from dpll.restarts import Restart, RestartPolicy, make_restart_policy
+from dpll.stats import PhaseStats, SolverStats, timed
+from dpll.types import Operator, Tautology, Contradiction
+from dpll.xor import XorConstraint
 from dpll.logic_tree import LogicTree
 
 
@@ -19,14 +34,202 @@ class SolverVariable(NamedTuple):
 
 
 class SolverResult(NamedTuple):
-    """For sake of readability at top-level, name the fields"""
-    satisfiable: bool
+    """For sake of readability at top-level, name the fields. stats holds the search counters.
+    satisfiable is UNKNOWN if the search ran out of budget or was cancelled"""
+    satisfiable: bool | Unknown
     model: list[SolverVariable]
+    stats: SolverStats | None = None
+
+
+class UnsatCore(NamedTuple):
+    """clauses is an unsatisfiable subset of the CNF clause trees; formulas are the input
+    sub-formulas those clauses were generated from (see Transformer.transform provenance)"""
+    clauses: list[LogicTree]
+    formulas: list[LogicTree]
 
 
 SolverClause = set[SolverVariable]
 
 
+class SolverAlgorithm(StrEnum):
+    """Search procedure used by Solver.solve"""
+    DPLL = "dpll"
+    CDCL = "cdcl"
+    PORTFOLIO = "portfolio"  # differently configured CDCL searches in parallel processes, see dpll.portfolio
+    CUBE_AND_CONQUER = "cube"  # lookahead splitting into cubes solved in a process pool, see dpll.cube
+    LOCAL_SEARCH = "local"  # stochastic local search, finds models but never proves UNSAT, see dpll.local_search
+
+
+@dataclass(frozen=True)
+class SolverConfig:
+    """
+    Configuration for the search engines behind Solver.solve.
+
+    heuristic (Heuristic | BranchingHeuristic | None):
+        Picks decision literals, either by name or as a BranchingHeuristic instance.
+        None keeps each engine's default: the first literal of the first unsatisfied
+        clause for DPLL, VSIDS for CDCL.
+
+    restarts (Restart | RestartPolicy):
+        CDCL restart schedule, by name or as a RestartPolicy instance. DPLL never
+        restarts, as it learns nothing that would keep a restarted search complete.
+
+    phase_saving (bool):
+        CDCL decides each variable with the polarity it last had, rather than the
+        polarity suggested by the heuristic.
+
+    reduce_interval (int):
+        Conflicts between two reductions of the CDCL learned clause database.
+
+    max_learned (int):
+        Number of stored learned clauses that triggers an early reduction. Glue clauses
+        (LBD <= 2) are never deleted, so they can keep the database above this size.
+
+    preprocess (bool):
+        Simplifies the clauses with subsumption, self-subsuming resolution and bounded
+        variable elimination before searching (see dpll.preprocess). Models still assign
+        every variable of the input, eliminated ones included.
+
+    seed (int | None):
+        Gives CDCL variables random initial phases. None keeps every initial phase negative.
+        Local search is always random, and seeded with it.
+
+    timeout (float | None), max_conflicts, max_decisions, max_propagations (int | None):
+        Budget for one search; once any is used up the result is UNKNOWN. Portfolio and
+        cube-and-conquer workers each get the counter limits for every search they run,
+        while the timeout covers the whole call.
+
+    cancel (CancellationToken | None):
+        Calling cancel() on the token, e.g. from another thread, stops the search with UNKNOWN.
+
+    progress (Callable[[int], None] | None):
+        Called by SolverAlgorithm.CUBE_AND_CONQUER with the number of cubes remaining after
+        each one is solved (see CubeAndConquer.solve). It runs in the calling process only.
+
+    workers (int | None):
+        Number of worker processes for SolverAlgorithm.PORTFOLIO and CUBE_AND_CONQUER; None
+        uses one per CPU. The first portfolio worker runs this config unchanged, the others
+        vary it (see Portfolio.configs).
+
+    share_clauses (bool):
+        Portfolio workers exchange short learned clauses through shared memory.
+
+    cubes (int):
+        Most cubes SolverAlgorithm.CUBE_AND_CONQUER splits the clauses into.
+
+    proof (DratWriter | None):
+        Receives a DRAT refutation when DPLL or CDCL finds the clauses unsatisfiable,
+        preprocessing included, and the numbered clauses it refers to (see dpll.proof).
+        The parallel engines cannot write proofs.
+
+    local_search (LocalSearchMethod):
+        Flip rule of SolverAlgorithm.LOCAL_SEARCH and of the local search before DPLL or CDCL.
+
+    noise (float | None):
+        Random walk probability for WalkSAT, break exponent for ProbSAT. None uses the
+        usual value for each (see local_search.DEFAULT_NOISE).
+
+    max_flips (int):
+        Flips SolverAlgorithm.LOCAL_SEARCH makes before giving up with UNKNOWN.
+
+    local_search_flips (int):
+        Flips of local search DPLL and CDCL first make, stopping early with its model if it
+        finds one. Otherwise CDCL starts from the best assignment it reached, as saved phases.
+        0 skips it.
+    """
+    heuristic: Heuristic | BranchingHeuristic | None = None
+    restarts: Restart | RestartPolicy = Restart.LUBY
+    phase_saving: bool = True
+    reduce_interval: int = 2000
+    max_learned: int = 10000
+    preprocess: bool = False
+    seed: int | None = None
+    workers: int | None = None
+    share_clauses: bool = True
+    cubes: int = 1024
+    timeout: float | None = None
+    max_conflicts: int | None = None
+    max_decisions: int | None = None
+    max_propagations: int | None = None
+    cancel: CancellationToken | None = None
+    progress: Callable[[int], None] | None = None
+    proof: DratWriter | None = None
+    local_search: LocalSearchMethod = LocalSearchMethod.PROBSAT
+    noise: float | None = None
+    max_flips: int = 1000000
+    local_search_flips: int = 0
+
+
+default_solver_config = SolverConfig()
+
+
+class _DPLLSearch(WatchedPropagator):
+    """
+    Chronological backtracking; every branch opens a decision level that is undone from the trail if it fails.
+
+    With a DratWriter as proof, every failed branch is written as the lemma that negates its
+    decisions. It is a RUP consequence of the clauses, or of the lemmas for the two branches
+    below it, so the lemma for the root is the empty clause.
+    """
+
+    proof: DratWriter | None = None
+    keep_xor_reasons = False  # nothing analyses them
+
+    def _refute_branch(self, levels: int) -> None:
+        if self.proof is not None:
+            self.proof.add([-self._trail[start] for start in self._trail_lim[:levels]])
+
+    def search(self, budget: Budget | None = None) -> bool | Unknown:
+        """
+        Iterative DPLL. The trail's decision levels double as the decision stack; flipped
+        records, per level, whether the decision's second branch is the one being explored.
+        Returns UNKNOWN if the budget runs out first.
+        """
+        if not self._ok:
+            self._refute_branch(0)
+            return False
+        if budget is not None:
+            budget.start(self.stats)
+
+        flipped: list[bool] = []
+        while True:
+            conflict = self.propagate()
+            if conflict != NO_REASON:
+                self.stats.conflicts += 1
+                self._heuristic.on_conflict([abs(lit) for lit in self._db.clause(conflict)])
+                self._refute_branch(len(flipped))
+                # Chronological backtrack to the deepest decision with an untried branch
+                while flipped and flipped[-1]:
+                    flipped.pop()
+                    self._refute_branch(len(flipped))  # both branches of that decision failed
+                if not flipped:
+                    return False
+                if budget is not None and budget.exhausted(self.stats):
+                    return UNKNOWN
+                decision_level = len(flipped)
+                lit = self._trail[self._trail_lim[decision_level - 1]]
+                self._backtrack(decision_level - 1)
+                self.stats.decisions += 1
+                flipped[-1] = True
+                self._trail_lim.append(len(self._trail))
+                self._assign(-lit, NO_REASON)
+                continue
+
+            if budget is not None and budget.exhausted(self.stats):
+                return UNKNOWN
+            lit = self._heuristic.pick()
+            if lit == 0:
+                self._complete_xors()
+                return True
+            Solver._logger.debug(f"Current depth {len(flipped)}, branching on {lit}")
+
+            self.stats.decisions += 1
+            flipped.append(False)
+            self._trail_lim.append(len(self._trail))
+            self.stats.max_depth = max(self.stats.max_depth, len(flipped))
+            self._assign(lit, NO_REASON)
+
+
 class Solver:
     """Implements (a naive version) of the DPLL algorithm"""
 
@@ -67,29 +270,112 @@ class Solver:
         return vars
 
     @staticmethod
-    def propagate(clauses: list[SolverClause]) -> list[SolverVariable]:
-        """DPLL unit propagation """
-        new_clauses = copy.deepcopy(clauses)
+    def clause_literals(tree: LogicTree) -> list[tuple[str, bool]] | None:
+        """
+        (name, polarity) pairs of a CNF clause tree, with constant literals that are false left out.
+        None if a constant satisfies the clause.
+        """
+        literals: list[tuple[str, bool]] = []
+        for x in Solver._get_literals(tree):
+            if x.value is Operator.NEGATION:  # At this point, only operator is negation
+                assert x.left is not None
+                atom, polarity = x.left.value, False
+            else:
+                atom, polarity = x.value, True
+            match atom:
+                case Tautology():
+                    if polarity:
+                        return None
+                case Contradiction():
+                    if not polarity:
+                        return None
+                case Operator():
+                    assert False, "Found non-literal operator in set of literals"
+                case _:
+                    literals.append((atom.name, polarity))
+        return literals
 
-        unit_clauses: list[SolverClause] = [clause for clause in clauses if len(clause) == 1]
-        model: list[SolverVariable] = []
+    @staticmethod
+    def xor_literals(tree: LogicTree) -> list[tuple[str, bool]]:
+        """Literals of a parity constraint tree (see Config.native_xor) as (name, polarity) pairs"""
+        match tree.value:
+            case Operator.XOR:
+                assert tree.left is not None and tree.right is not None
+                return Solver.xor_literals(tree.left) + Solver.xor_literals(tree.right)
+            case Operator.NEGATION:
+                assert tree.left is not None
+                return [(name, not polarity) for name, polarity in Solver.xor_literals(tree.left)]
+            case _:
+                return [(str(tree.value), True)]
 
-        while unit_clauses:
-            literal = next(iter(unit_clauses[0]))
-            model.append(literal)
+    @staticmethod
+    def _tree_clauses(old_clauses: Iterable[LogicTree],
+                      xors: list[XorConstraint] | None = None) -> tuple[ClauseDatabase, VariableMap]:
+        """Numbers the variables of CNF clause trees straight into a ClauseDatabase; parity constraints go to xors"""
+        variables = VariableMap()
+        db = ClauseDatabase()
+        for tree in old_clauses:
+            if tree.value is Operator.XOR:
+                if xors is None:
+                    raise ValueError(f"Parity constraint {tree} is only supported by Solver.solve")
+                xors.append(XorConstraint.from_literals(variables.literal(name, polarity)
+                                                        for name, polarity in Solver.xor_literals(tree)))
+                continue
+            literals = Solver.clause_literals(tree)
+            if literals is not None:
+                db.add(variables.literal(name, polarity) for name, polarity in literals)
+        return db, variables
 
-            new_clauses = [clause for clause in new_clauses if literal not in clause]
-            negated_literal = SolverVariable(literal.name, not literal.polarity)
+    @staticmethod
+    def encode(old_clauses: Iterable[LogicTree]) -> tuple[ClauseDatabase, VariableMap]:
+        """
+        Numbers the variables of CNF clause trees the same way on every run: clauses are taken in
+        the order of their string form and variables numbered by first appearance. Clauses
+        satisfied by a constant are dropped. See dpll_export for writing the result as DIMACS.
+        """
+        return Solver._tree_clauses(sorted(old_clauses, key=str))
 
-            for c in new_clauses:
-                if negated_literal in c:
-                    Solver._logger.debug(f"Removing literal {negated_literal} from clause {c}")
-                    c.remove(negated_literal)
+    @staticmethod
+    def _number_clauses(clauses: list[SolverClause]) -> tuple[ClauseDatabase, VariableMap]:
+        """
+        Numbers variables from 1 in order of appearance and packs the clauses into a ClauseDatabase.
+        Clauses satisfied by a constant are dropped.
+        """
+        variables = VariableMap()
+        db = ClauseDatabase()
+        for clause in clauses:
+            if Solver.taut_true_lit in clause or Solver.contra_false_lit in clause:
+                continue
+            db.add(variables.literal(var.name, var.polarity) for var in clause)
+        return db, variables
+
+    @staticmethod
+    def _to_model(lits: list[int], variables: VariableMap) -> list[SolverVariable]:
+        return [SolverVariable(variables.name(lit), lit > 0) for lit in lits]
+
+    @staticmethod
+    def propagate(clauses: list[SolverClause]) -> list[SolverVariable]:
+        """DPLL unit propagation. Satisfied clauses are dropped and false literals removed from the rest, in place"""
+        db, variables = Solver._number_clauses(clauses)
 
-            unit_clauses = unit_clauses = [clause for clause in new_clauses if len(clause) == 1]
+        propagator = WatchedPropagator(len(variables))
+        for clause in db:
+            propagator.add_clause(clause)
+        propagator.propagate()
+
+        def lit_value(var: SolverVariable) -> int:
+            if var.name not in variables:
+                return 0  # only appears in clauses dropped as satisfied by a constant
+            return propagator.value(variables.literal(var.name, var.polarity))
+
+        new_clauses: list[SolverClause] = []
+        for clause in clauses:
+            if any(lit_value(var) == 1 for var in clause):
+                continue
+            new_clauses.append({var for var in clause if lit_value(var) != -1})
 
         clauses[:] = new_clauses
-        return model
+        return Solver._to_model(propagator.assignments(), variables)
 
     @staticmethod
     def pure_literal_elim(clauses: list[SolverClause]) -> list[SolverVariable]:
@@ -108,9 +394,9 @@ class Solver:
         # Needs profiling; may store original variable to avoid reconstructing
         for var_name, counts in var_occurrences.items():
             if counts[True] and not counts[False]:
-                pure_literals.append(SolverVariable(var_name, False))
-            elif counts[False] and not counts[True]:
                 pure_literals.append(SolverVariable(var_name, True))
+            elif counts[False] and not counts[True]:
+                pure_literals.append(SolverVariable(var_name, False))
 
         # Remove clauses containing pure literals and simplify remaining clauses
         new_clauses: list[SolverClause] = []
@@ -145,60 +431,307 @@ class Solver:
     #             uniques.add(y)
     #     return uniques
 
-    # Future TODO: use two watched literals algorithm to optimise backtracking
     @staticmethod
-    def dpll(clauses: list[SolverClause], enable_pure_lit_elim: bool = False, depth: int = 0) -> SolverResult:
-        model: list[SolverVariable] = []
-        new_clauses = copy.deepcopy(clauses)
+    def _run_dpll(db: ClauseDatabase, variables: VariableMap, config: SolverConfig,
+                  xors: list[XorConstraint] | None = None) -> SolverResult:
+        heuristic = make_heuristic(config.heuristic if config.heuristic is not None else Heuristic.FIRST_UNSATISFIED)
+        search = _DPLLSearch(len(variables), heuristic)
+        search.proof = config.proof
+        for clause in db:
+            search.add_clause(clause)
+        if xors:
+            search.add_xors(xors)
+
+        satisfiable = search.search(Budget.from_config(config))
+        if satisfiable is not True:
+            return SolverResult(satisfiable, [], search.stats)
+        return SolverResult(True, Solver._to_model(search.assignments(), variables), search.stats)
 
-        if (enable_pure_lit_elim):
-            model += Solver.pure_literal_elim(new_clauses)
-        Solver.taut_elim(new_clauses)
+    @staticmethod
+    def _cdcl_search(db: ClauseDatabase, num_vars: int, config: SolverConfig) -> CDCLSolver:
+        heuristic = make_heuristic(config.heuristic if config.heuristic is not None else Heuristic.VSIDS)
+        return CDCLSolver(db, num_vars, heuristic,
+                          restarts=make_restart_policy(config.restarts), phase_saving=config.phase_saving,
+                          reduce_interval=config.reduce_interval, max_learned=config.max_learned, seed=config.seed)
 
-        Solver._logger.debug(f"Current depth {depth}, clauses: {clauses}")
+    @staticmethod
+    def _run_cdcl(db: ClauseDatabase, variables: VariableMap, config: SolverConfig,
+                  initial_phases: list[bool] | None = None, xors: list[XorConstraint] | None = None) -> SolverResult:
+        search = Solver._cdcl_search(db, len(variables), config)
+        search.proof = config.proof
+        if xors:
+            search.add_xors(xors)
+        if initial_phases is not None:
+            search.set_phases(initial_phases)
+        satisfiable = search.solve(budget=Budget.from_config(config))
+        if satisfiable is not True:
+            return SolverResult(satisfiable, [], search.stats)
+        values = search.model()
+        model = [SolverVariable(variables.name(v), values[v]) for v in range(1, len(variables) + 1)]
+        return SolverResult(True, model, search.stats)
 
-        model += Solver.propagate(new_clauses)
+    @staticmethod
+    def _run_portfolio(db: ClauseDatabase, variables: VariableMap, config: SolverConfig) -> SolverResult:
+        result = Portfolio.solve(db, len(variables), Portfolio.configs(config, config.workers), share=config.share_clauses)
+        if result.satisfiable is not True:
+            return SolverResult(result.satisfiable, [], result.stats)
+        model = [SolverVariable(variables.name(v), result.values[v]) for v in range(1, len(variables) + 1)]
+        return SolverResult(True, model, result.stats)
 
-        if len(new_clauses) == 0:
-            ret_val = SolverResult(True, model)
-            return ret_val
-        elif set() in new_clauses:
-            ret_val = SolverResult(False, [])
-            return ret_val
+    @staticmethod
+    def _run_cube_and_conquer(db: ClauseDatabase, variables: VariableMap, config: SolverConfig) -> SolverResult:
+        result = CubeAndConquer.solve(db, len(variables), config, progress=config.progress)
+        if result.satisfiable is not True:
+            return SolverResult(result.satisfiable, [], result.stats)
+        model = [SolverVariable(variables.name(v), result.values[v]) for v in range(1, len(variables) + 1)]
+        return SolverResult(True, model, result.stats)
 
-        var = next(iter(new_clauses[0]))
+    @staticmethod
+    def _run_local_search(db: ClauseDatabase, variables: VariableMap, config: SolverConfig,
+                          max_flips: int) -> tuple[SolverResult, list[bool]]:
+        """Local search as config sets it up; also returns the best assignment it reached"""
+        search = LocalSearch(db, len(variables), config.local_search, config.noise, seed=config.seed)
+        satisfiable = search.solve(max_flips, Budget.from_config(config))
+        if satisfiable is not True:
+            if satisfiable is False and config.proof is not None:
+                config.proof.add([])  # there is an empty clause
+            return SolverResult(satisfiable, [], search.stats), search.best_values()
+        values = search.values()
+        model = [SolverVariable(variables.name(v), values[v]) for v in range(1, len(variables) + 1)]
+        return SolverResult(True, model, search.stats), values
 
-        new_clauses_with_not_var = copy.deepcopy(new_clauses)
+    @staticmethod
+    def _run(db: ClauseDatabase, variables: VariableMap, algorithm: SolverAlgorithm, config: SolverConfig,
+             phases: dict[str, PhaseStats] | None = None, xors: list[XorConstraint] | None = None) -> SolverResult:
+        """
+        Runs the chosen engine, preprocessing the clauses first if config asks for it. The
+        result's stats get the phases timed before (e.g. parsing), followed by its own.
+        DPLL and CDCL take parity constraints natively; for everything else, proofs and local
+        search included, they are added to the clauses in CNF.
+        """
+        phases = phases if phases is not None else {}
+        proof = config.proof
+        if xors and (algorithm not in (SolverAlgorithm.DPLL, SolverAlgorithm.CDCL) or proof is not None
+                     or config.local_search_flips > 0):
+            for xor in xors:
+                for clause in xor.clauses(lambda: variables.number(f"⊕{len(variables) + 1}")):
+                    db.add(clause)
+            xors = None
+        if proof is not None:
+            if algorithm in (SolverAlgorithm.PORTFOLIO, SolverAlgorithm.CUBE_AND_CONQUER):
+                raise ValueError(f"{algorithm} cannot write a proof")
+            proof.begin(list(db), len(variables), variables.names())
+
+        preprocessor = None
+        if config.preprocess:
+            with timed(phases, "preprocess") as phase:
+                frozen = [var for xor in xors or () for var in xor.variables]
+                preprocessor = Preprocessor(db, len(variables), frozen=frozen, proof=proof)
+                simplified = preprocessor.run()
+                if simplified:
+                    db = ClauseDatabase(preprocessor.clauses())
+                    phase.variables = len({abs(lit) for clause in db for lit in clause})
+                    phase.clauses = len(db)
+            if not simplified:
+                if proof is not None:
+                    proof.add([])
+                    proof.flush()
+                preprocessor.stats.phases.update(phases)
+                return SolverResult(False, [], preprocessor.stats)
+
+        local = None
+        initial_phases = None
+        if config.local_search_flips > 0 and algorithm in (SolverAlgorithm.DPLL, SolverAlgorithm.CDCL):
+            with timed(phases, "local search"):
+                local, initial_phases = Solver._run_local_search(db, variables, config, config.local_search_flips)
+
+        if local is not None and local.satisfiable is not UNKNOWN:
+            result = local
+        else:
+            with timed(phases, "search"):
+                match algorithm:
+                    case SolverAlgorithm.CDCL:
+                        result = Solver._run_cdcl(db, variables, config, initial_phases, xors)
+                    case SolverAlgorithm.PORTFOLIO:
+                        result = Solver._run_portfolio(db, variables, config)
+                    case SolverAlgorithm.CUBE_AND_CONQUER:
+                        result = Solver._run_cube_and_conquer(db, variables, config)
+                    case SolverAlgorithm.LOCAL_SEARCH:
+                        result, _ = Solver._run_local_search(db, variables, config, config.max_flips)
+                    case _:
+                        result = Solver._run_dpll(db, variables, config, xors)
+            if local is not None:
+                assert result.stats is not None and local.stats is not None
+                result.stats.merge(local.stats)
+        if proof is not None:
+            proof.flush()
+        assert result.stats is not None
+        result.stats.phases.update(phases)
+
+        if preprocessor is None:
+            return result
+        result.stats.eliminated_vars = preprocessor.stats.eliminated_vars
+        result.stats.subsumed_clauses = preprocessor.stats.subsumed_clauses
+        result.stats.strengthened_clauses = preprocessor.stats.strengthened_clauses
+        if result.satisfiable is not True:
+            return result
+
+        # Variables left unassigned by the search are free in the simplified clauses
+        values = [False] * (len(variables) + 1)
+        for var in result.model:
+            values[variables.number(var.name)] = var.polarity
+        values = preprocessor.extend_model(values)
+        model = [SolverVariable(variables.name(v), values[v]) for v in range(1, len(variables) + 1)]
+        return SolverResult(True, model, result.stats)
 
-        not_var = SolverVariable(var.name, not var.polarity)
-        newset: SolverClause = SolverClause()
-        newset.add(var)
-        new_clauses.append(newset)
+    @staticmethod
+    def dpll(clauses: list[SolverClause], enable_pure_lit_elim: bool = False, config: SolverConfig | None = None) -> SolverResult:
+        model: list[SolverVariable] = []
+        new_clauses = list(clauses)
 
-        newset = set()
-        newset.add(not_var)
-        new_clauses_with_not_var.append(newset)
+        if (enable_pure_lit_elim):
+            model += Solver.pure_literal_elim(new_clauses)
 
-        (satisfiable, new_model) = Solver.dpll(new_clauses, depth=depth+1)
-        if (satisfiable):
-            model += new_model
-            return SolverResult(True, model)
-        else:
-            (satisfiable2, new_model_2) = Solver.dpll(new_clauses_with_not_var, depth=depth+1)
-            if (satisfiable2 is False):
-                return SolverResult(False, [])
-            else:
-                model += new_model_2
-                return SolverResult(True, model)
+        phases: dict[str, PhaseStats] = {}
+        with timed(phases, "encode") as phase:
+            db, variables = Solver._number_clauses(new_clauses)
+            phase.variables, phase.clauses = len(variables), len(db)
+        result = Solver._run(db, variables, SolverAlgorithm.DPLL, config if config is not None else default_solver_config,
+                             phases)
+        if result.satisfiable is not True:
+            return result
+        return SolverResult(True, model + result.model, result.stats)
 
     @staticmethod
-    def solve(old_clauses: set[LogicTree]) -> SolverResult:
-        """Returns a tuple in the form (True/False if Satisfiable/Unsat, [list of variables that form the model if sat, else None])"""
-        clauses: list[SolverClause] = list()
-        # unique_var_names = set()
-        for x in old_clauses:
-            vars: set[SolverVariable] = Solver._transform_to_variables(x)
-            clauses.append(vars)
+    def cdcl(clauses: list[SolverClause], config: SolverConfig | None = None) -> SolverResult:
+        """Conflict-driven clause learning; clauses are numbered internally and names restored in the model"""
+        phases: dict[str, PhaseStats] = {}
+        with timed(phases, "encode") as phase:
+            db, variables = Solver._number_clauses(clauses)
+            phase.variables, phase.clauses = len(variables), len(db)
+        return Solver._run(db, variables, SolverAlgorithm.CDCL, config if config is not None else default_solver_config,
+                           phases)
 
-        Solver.contra_elim(clauses)  # Didn't check for Bottom in parser/transformer, so do it now.
-        return Solver.dpll(clauses)
+    @staticmethod
+    def solve(old_clauses: set[LogicTree], algorithm: SolverAlgorithm = SolverAlgorithm.DPLL,
+              config: SolverConfig | None = None, phases: dict[str, PhaseStats] | None = None) -> SolverResult:
+        """Returns a tuple in the form (True/False if Satisfiable/Unsat, [list of variables that form the model if sat, else None])
+        config tunes the chosen engine, see SolverConfig. phases, if given, holds the phases the caller
+        timed before (see SolverStats.phases); the result's stats carry them on. Besides clauses,
+        old_clauses may hold parity constraints (see Config.native_xor)"""
+        solver_config = config if config is not None else default_solver_config
+        phases = phases if phases is not None else {}
+        # Constants are resolved while numbering, so clauses go straight from trees to ints
+        xors: list[XorConstraint] = []
+        with timed(phases, "encode") as phase:
+            db, variables = Solver._tree_clauses(old_clauses, xors)
+            phase.variables, phase.clauses = len(variables), len(db) + len(xors)
+        return Solver._run(db, variables, algorithm, solver_config, phases, xors)
+
+    @staticmethod
+    def solve_cnf(clauses: Iterable[Iterable[int]] | ClauseDatabase, num_vars: int = 0,
+                  algorithm: SolverAlgorithm = SolverAlgorithm.DPLL, config: SolverConfig | None = None,
+                  names: Iterable[str] | None = None) -> SolverResult:
+        """
+        Solves a CNF given as DIMACS style int literals, e.g. from read_dimacs, without going
+        through LogicTree. num_vars counts variables beyond the largest one used. Model variables
+        are named by names (variable i gets the (i - 1)th one, see read_names), else by their number.
+        """
+        phases: dict[str, PhaseStats] = {}
+        with timed(phases, "encode") as phase:
+            db = clauses if isinstance(clauses, ClauseDatabase) else ClauseDatabase(clauses)
+            num_vars = max(num_vars, db.num_vars)
+            variables = VariableMap(names if names is not None else map(str, range(1, num_vars + 1)))
+            if len(variables) < num_vars:
+                raise ValueError(f"{len(variables)} names given for {num_vars} variables")
+            phase.variables, phase.clauses = len(variables), len(db)
+        return Solver._run(db, variables, algorithm, config if config is not None else default_solver_config, phases)
+
+    @staticmethod
+    def models(old_clauses: set[LogicTree], projection: Iterable[str],
+               config: SolverConfig | None = None) -> Iterator[list[SolverVariable]]:
+        """
+        Lazily yields every assignment to the projection variables that extends to a model of
+        the clauses, each exactly once, in constant memory (see CDCLSolver.models). Projection
+        variables the clauses do not mention are free, so both of their values are enumerated.
+        """
+        solver_config = config if config is not None else default_solver_config
+        db, variables = Solver._tree_clauses(old_clauses)
+        projected = [variables.number(name) for name in dict.fromkeys(projection)]
+        if solver_config.preprocess:
+            # Eliminating a variable quantifies it away, which keeps the models projected onto the others
+            preprocessor = Preprocessor(db, len(variables), frozen=projected)
+            if not preprocessor.run():
+                return
+            db = ClauseDatabase(preprocessor.clauses())
+        search = Solver._cdcl_search(db, len(variables), solver_config)
+        for lits in search.models(projected):
+            yield Solver._to_model(lits, variables)
+
+    @staticmethod
+    def count(old_clauses: set[LogicTree], projection: Iterable[str], cache_size: int = 100000) -> int:
+        """
+        Number of assignments to the projection variables that extend to a model of the clauses
+        (see ModelCounter). Projection variables the clauses do not mention double the count.
+        """
+        db, variables = Solver._tree_clauses(old_clauses)
+        projected = [variables.number(name) for name in dict.fromkeys(projection)]
+        counter = ModelCounter(db, len(variables), projected, cache_size=cache_size)
+        result = counter.count()
+        Solver._logger.debug(f"Counted {result} models with {counter.decisions} decisions, {counter.cache_hits} cache hits")
+        return result
+
+    @staticmethod
+    def unsat_core(old_clauses: Iterable[LogicTree], provenance: dict[LogicTree, LogicTree] | None = None,
+                   minimize: bool = False, config: SolverConfig | None = None) -> UnsatCore | None | Unknown:
+        """
+        An unsatisfiable subset of the clauses, or None if they are satisfiable. Every clause is
+        guarded by a selector variable and CDCL solves under the assumption that all selectors
+        hold, so the failed assumptions name the clauses the refutation used.
+
+        minimize drops clauses from that core one at a time, keeping a clause only if the
+        rest is satisfiable without it, until every clause left is needed. The searches reuse
+        one CDCLSolver and its learned clauses, and each failed search shrinks the core to its
+        failed assumptions. The budget in config applies to each search, and one that runs
+        out ends minimization early with the core found so far. Returns UNKNOWN if the
+        first search runs out.
+        """
+        solver_config = config if config is not None else default_solver_config
+        trees: list[LogicTree] = []
+        clauses: list[list[int]] = []
+        variables = VariableMap()
+        for tree in old_clauses:
+            literals = Solver.clause_literals(tree)
+            if literals is not None:
+                trees.append(tree)
+                clauses.append([variables.literal(name, polarity) for name, polarity in literals])
+        # Selector i + first guards clause i
+        first = len(variables) + 1
+        db = ClauseDatabase([*clause, -(first + i)] for i, clause in enumerate(clauses))
+        search = Solver._cdcl_search(db, first + len(clauses) - 1, solver_config)
+        budget = Budget.from_config(solver_config)
+
+        satisfiable = search.solve(range(first, first + len(clauses)), budget)
+        if satisfiable is not False:
+            return None if satisfiable else UNKNOWN
+        core = sorted(search.failed_assumptions)
+        if minimize:
+            i = 0
+            while i < len(core):
+                satisfiable = search.solve(core[:i] + core[i + 1:], budget)
+                if satisfiable is UNKNOWN:
+                    break
+                if satisfiable:
+                    i += 1  # core[i] is needed
+                else:
+                    failed = set(search.failed_assumptions)
+                    core = [selector for selector in core if selector in failed]
+        Solver._logger.debug(f"Core of {len(core)} out of {len(clauses)} clauses")
+
+        core_trees = [trees[selector - first] for selector in core]
+        formulas: dict[int, LogicTree] = {}
+        if provenance is not None:
+            for tree in core_trees:
+                if tree in provenance:
+                    formulas.setdefault(id(provenance[tree]), provenance[tree])
+        return UnsatCore(core_trees, list(formulas.values()))
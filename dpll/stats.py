@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+import json
+import time
+from typing import Any, Iterator
+
+
+@dataclass
+class PhaseStats:
+    """Time spent in one phase of solving, and the size of the formula it left behind"""
+    wall_time: float = 0.0  # seconds
+    cpu_time: float = 0.0  # seconds of this process
+    variables: int | None = None
+    clauses: int | None = None
+
+
+@contextmanager
+def timed(phases: dict[str, PhaseStats], name: str) -> Iterator[PhaseStats]:
+    """Records the time spent in the with block as phases[name]; fill in the sizes on the yielded PhaseStats"""
+    phase = PhaseStats()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield phase
+    finally:
+        phase.wall_time = time.perf_counter() - wall
+        phase.cpu_time = time.process_time() - cpu
+        phases[name] = phase
+
+
+@dataclass
+class SolverStats:
+    """
+    Counters kept by the search engines while solving, and by the preprocessor before.
+    phases holds, in order, the PhaseStats of every phase that led to the result
+    ("parse", "transform", "encode", "preprocess", "local search", "search"), as far as they ran.
+    """
+    decisions: int = 0
+    conflicts: int = 0
+    propagations: int = 0  # trail literals whose watches have been processed
+    restarts: int = 0
+    learned_clauses: int = 0
+    deleted_clauses: int = 0
+    reductions: int = 0
+    imported_clauses: int = 0
+    eliminated_vars: int = 0
+    subsumed_clauses: int = 0
+    strengthened_clauses: int = 0
+    max_depth: int = 0  # most decision levels open at once
+    flips: int = 0  # by local search
+    phases: dict[str, PhaseStats] = field(default_factory=dict)
+
+    def merge(self, other: "SolverStats") -> None:
+        """Adds the counters of other, e.g. of another worker; max_depth becomes the larger one"""
+        for counter in fields(self):
+            match counter.name:
+                case "phases":
+                    continue
+                case "max_depth":
+                    self.max_depth = max(self.max_depth, other.max_depth)
+                case name:
+                    setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Every counter, and every phase as a nested dict, ready for a metrics system"""
+        return asdict(self)
+
+    def to_json(self, **kwargs: Any) -> str:
+        """as_dict() as JSON; kwargs go to json.dumps"""
+        return json.dumps(self.as_dict(), **kwargs)
@@ -0,0 +1,48 @@
+from dpll import CancellationToken, dpll, dpll_batch
+from dpll.batch import Batch
+from dpll.cnf_transformer import Config
+from dpll.solver import SolverAlgorithm, SolverConfig
+
+expressions = ["a ∧ ¬a", "a ∨ b", "(a → b) ∧ a ∧ ¬b", "a ∧", "exactly(1, a, b) ∧ a ∧ b", "¬(a ↔ ¬¬a)", "a ∨ b"] * 5
+
+
+def test_batch():
+    expected = [dpll(exp) if not exp.endswith("∧") else None for exp in expressions]
+    for jobs, ordered in [(1, True), (2, True), (2, False)]:
+        results = list(dpll_batch(iter(expressions), jobs=jobs, ordered=ordered, chunksize=4))
+        assert sorted(result.index for result in results) == list(range(len(expressions)))
+        if ordered:
+            assert [result.index for result in results] == list(range(len(expressions)))
+        for result in results:
+            assert result.expression == expressions[result.index]
+            assert result.satisfiable == expected[result.index]
+            assert (result.error is not None) == (expected[result.index] is None)
+            if result.error is not None:
+                assert result.error.startswith("SyntaxError")
+
+
+def test_input_is_read_lazily():
+    read = 0
+
+    def generate():
+        nonlocal read
+        for i in range(10000):
+            read += 1
+            yield f"x{i} ∨ ¬x{i + 1}"
+
+    results = dpll_batch(generate(), jobs=2, chunksize=4, config=SolverConfig(seed=1))
+    assert next(results).index == 0
+    assert read <= 4 * 2 * 2  # two chunks in flight per process
+    results.close()
+
+
+def test_cache_and_cancellation():
+    batch = Batch(SolverAlgorithm.CDCL, None, Config(disable_syntax_check=False, use_tseytin_transform=True), cache_size=2)
+    list(batch.run(["a", "b", "a", "c", "b", "a ∧", "a ∧", "c"]))
+    assert batch.cache_hits == 2  # the second "a", then "c"; "b" has been pushed out by then, and errors are never cached
+
+    token = CancellationToken()
+    results = dpll_batch(expressions, config=SolverConfig(cancel=token))
+    next(results)
+    token.cancel()
+    assert list(results) == []
@@ -0,0 +1,74 @@
+import json
+import os
+
+import pytest
+
+from dpll.benchmark import INSTANCE_DIR, Benchmark, Families, main
+from dpll.dimacs import iter_dimacs
+from dpll.solver import SolverAlgorithm, SolverConfig
+
+
+def test_families_load():
+    for family in Families.names():
+        instances = Families.load(family)
+        assert instances, family
+        assert all(instance.family == family for instance in instances)
+    assert [instance.name for instance in Families.load("rand3-20")] == ["rand3-20-01", "rand3-20-02", "rand3-20-03"]
+    assert [instance.expected for instance in Families.load("uf50") + Families.load("uuf50")] == [True, False]
+    with pytest.raises(ValueError):
+        Families.load("rand3-30")
+
+
+def test_brute_force():
+    assert Families.brute_force([[1, 2], [-1, 2], [1, -2], [-1, -2]], 2) is False
+    assert Families.brute_force([[1, 2], [-1, 2], [1, -2], [-1, -3]], 3) is True
+    assert Families.brute_force([], 1) is True
+
+
+def test_labels(monkeypatch):
+    instances = Families.load("rand3-20") + Families.load("uf50") + Families.load("uuf50")
+    for brute_force_vars, dpll_vars in ((Families.BRUTE_FORCE_VARS, Families.DPLL_VARS), (0, 0)):
+        # (0, 0) labels them all the way the largest instances are
+        monkeypatch.setattr(Families, "BRUTE_FORCE_VARS", brute_force_vars)
+        monkeypatch.setattr(Families, "DPLL_VARS", dpll_vars)
+        for instance, file in zip(instances, ["rand3-20-01", "rand3-20-02", "rand3-20-03", "uf50-01", "uuf50-01"]):
+            path = os.path.join(INSTANCE_DIR, f"{file}.cnf")
+            assert Families.label(list(iter_dimacs(path)), 50 if "uf" in file else 20)[0] is instance.expected, file
+
+
+def test_small_instances_answer_as_expected():
+    for family in ("rand3-20", "uf50", "uuf50", "pigeonhole", "parity", "equivalence"):
+        for instance in Families.load(family)[:2]:
+            for algorithm in (SolverAlgorithm.DPLL, SolverAlgorithm.CDCL):
+                assert instance.solve(algorithm, SolverConfig()).satisfiable is instance.expected, instance.name
+
+
+def test_run_and_regressions():
+    entry = Benchmark.run(["rand3-20", "pigeonhole"], repeats=2)
+    record = entry["results"]["php4"]
+    assert record["min_time"] <= record["median_time"]
+    assert record["peak_memory"] > 0
+    assert record["stats"]["conflicts"] > 0 and record["deterministic"]
+    assert Benchmark.regressions(entry, entry) == []
+
+    baseline = json.loads(json.dumps(entry))
+    baseline["results"]["php4"]["median_time"] = record["median_time"] / 4 - 1
+    baseline["results"]["php5"]["stats"]["conflicts"] //= 2
+    messages = Benchmark.regressions(entry, baseline)
+    assert len(messages) == 2
+    assert messages[0].startswith("php4: median time") and messages[1].startswith("php5: conflicts")
+
+
+def test_cli_history_and_baseline(tmp_path, capsys):
+    history, baseline = tmp_path / "history.json", tmp_path / "baseline.json"
+    args = ["--families", "rand3-20", "--repeats", "1", "--no-memory", "--history", str(history), "--baseline", str(baseline)]
+    assert main([*args, "--save-baseline"]) == 0
+    assert main(args) == 0
+    assert len(json.loads(history.read_text())) == 2
+
+    saved = json.loads(baseline.read_text())
+    saved["results"]["rand3-20-01"]["stats"]["decisions"] = 0
+    baseline.write_text(json.dumps(saved))
+    capsys.readouterr()
+    assert main(args) == 1
+    assert "REGRESSION rand3-20-01: decisions" in capsys.readouterr().out
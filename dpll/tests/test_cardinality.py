@@ -0,0 +1,56 @@
+import itertools
+import random
+
+from dpll import dpll, dpll_core, dpll_count, dpll_model
+from dpll.cardinality import CardinalityEncoding
+from dpll.cnf_transformer import Config, Transformer
+from dpll.parser import Parser
+from dpll.solver import Solver
+
+operands = {"a": lambda v: v["a"], "¬b": lambda v: not v["b"], "c": lambda v: v["c"], "a ∧ c": lambda v: v["a"] and v["c"],
+            "b ∨ ¬c": lambda v: v["b"] or not v["c"], "a ↔ b": lambda v: v["a"] == v["b"]}
+kinds = {"atmost": int.__le__, "atleast": int.__ge__, "exactly": int.__eq__}
+
+
+def test_lowering_against_truth_table():
+    rand = random.Random(3)
+    for encoding, tseytin in itertools.product(CardinalityEncoding, (True, False)):
+        config = Config(disable_syntax_check=False, use_tseytin_transform=tseytin, cardinality_encoding=encoding)
+        for _ in range(150):
+            chosen = [rand.choice(list(operands)) for _ in range(rand.randint(0, 5))]
+            kind = rand.choice(list(kinds))
+            bound = rand.randint(0, len(chosen) + 1)
+            negated = rand.random() < 0.5
+            exp = f"{"¬" if negated else ""}{kind}({bound}{"".join(f", ({op})" for op in chosen)})"
+
+            expected = 0
+            for bits in itertools.product((False, True), repeat=3):
+                values = dict(zip("abc", bits))
+                holds = kinds[kind](sum(operands[op](values) for op in chosen), bound)
+                expected += holds is not negated
+
+            # Mentioning every variable keeps them all in the projection
+            clauses = Transformer.transform(Parser.parse(f"{exp} ∧ (a ∨ ¬a ∨ b ∨ c)"), config)
+            assert Solver.count(clauses, ["a", "b", "c"]) == expected, (exp, encoding, tseytin)
+
+
+def test_constraints():
+    assert dpll_count("atleast(1, atmost(1, a, b, c), exactly(2, a ↔ b, c, d))") == 12
+    assert dpll("atleast(3, a, b) ∨ exactly(1)") is False
+    assert dpll("atmost(0) ∧ exactly(0, ⊥)") is True
+
+    model = {var.name: var.polarity for var in dpll_model("exactly(2, a, b, c) ∧ ¬a")}
+    assert model == {"a": False, "b": True, "c": True}
+
+    core = dpll_core("atleast(2, a, b, c) ∧ ¬a ∧ ¬b ∧ d")
+    assert core is not None and "atleast(2,a,b,c)" in map(str, core.formulas)
+
+
+def test_encodings_stay_small():
+    names = ", ".join(f"x{i}" for i in range(60))
+    for encoding in CardinalityEncoding:
+        config = Config(disable_syntax_check=False, use_tseytin_transform=True, cardinality_encoding=encoding)
+        clauses = Transformer.transform(Parser.parse(f"exactly(5, {names})"), config)
+        assert len(clauses) < 60 * 6 * 4
+        result = Solver.solve(clauses)
+        assert sum(var.polarity for var in result.model if var.name.startswith("x")) == 5
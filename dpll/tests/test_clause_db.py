@@ -0,0 +1,50 @@
+from dpll.clause_db import ClauseDatabase, VariableMap
+
+
+def test_variable_map():
+    variables = VariableMap()
+    assert variables.literal("a", True) == 1
+    assert variables.literal("b", False) == -2
+    assert variables.literal("a", False) == -1
+    assert len(variables) == 2
+    assert variables.name(-2) == "b"
+    assert variables.names() == ["a", "b"]
+    assert "a" in variables and "c" not in variables
+
+
+def test_clause_database():
+    db = ClauseDatabase([[1, -2, 3], [4], [-1, 2]])
+    assert len(db) == 3
+    assert db.num_vars == 4
+    assert list(db) == [[1, -2, 3], [4], [-1, 2]]
+    assert db.lits.tolist() == [1, -2, 3, 4, -1, 2]
+    assert db.add([]) == 3
+    assert db.clause(3) == []
+
+
+def test_compact():
+    db = ClauseDatabase([[1, 2], [-1, 3]])
+    db.add([2, -3, 4], learnt=True, lbd=3)
+    db.add([1, -4], learnt=True, lbd=2)
+    db.activity[3] = 5.0
+    assert db.num_learnt == 2
+
+    db.delete(2)
+    remap = db.compact()
+
+    assert remap.tolist() == [0, 1, -1, 2]
+    assert list(db) == [[1, 2], [-1, 3], [1, -4]]
+    assert db.learnt.tolist() == [0, 0, 1]
+    assert db.lbd[2] == 2 and db.activity[2] == 5.0
+    assert db.num_learnt == 1
+
+
+def test_truncate():
+    db = ClauseDatabase([[1, 2], [-1, 3]])
+    db.add([2, -3], learnt=True, lbd=2)
+    db.add([1, -2, 3], learnt=True, lbd=3)
+    db.delete(3)
+    db.truncate(2)
+    assert list(db) == [[1, 2], [-1, 3]] and db.num_learnt == 0
+    assert db.add([4], learnt=True) == 2
+    assert db.compact().tolist() == [0, 1, 2]
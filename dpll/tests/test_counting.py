@@ -0,0 +1,36 @@
+import itertools
+
+from dpll.counting import ModelCounter
+from dpll.main import dpll_count, dpll_models
+
+
+def brute_force_count(clauses: list[list[int]], num_vars: int, projection: list[int]) -> int:
+    models = set()
+    for bits in itertools.product((False, True), repeat=num_vars):
+        if all(any(bits[abs(lit) - 1] == (lit > 0) for lit in clause) for clause in clauses):
+            models.add(tuple(bits[var - 1] for var in projection))
+    return len(models)
+
+
+def test_counts():
+    clauses = [[1, 2], [-1, 3], [4, 5], [-4, -5], [6, -7, 2]]
+    assert ModelCounter(clauses, 7).count() == brute_force_count(clauses, 7, list(range(1, 8)))
+    assert ModelCounter(clauses, 8).count() == 2 * brute_force_count(clauses, 7, list(range(1, 8)))  # 8 is free
+    assert ModelCounter(clauses, 7, [1, 4]).count() == brute_force_count(clauses, 7, [1, 4])
+    assert ModelCounter([[1], [-1]], 1).count() == 0
+    assert ModelCounter([], 0).count() == 1
+
+
+def test_cache_is_bounded():
+    clauses = [[i, i + 1] for i in range(1, 30)]
+    counter = ModelCounter(clauses, 30, cache_size=8)
+    assert counter.count() == 2178309  # Fibonacci(32): no two adjacent variables are both false
+    assert len(counter._cache) <= 8
+
+
+def test_dpll_count():
+    for formula in ("(a ∨ b) ∧ (c → a)", "(sunny → sunglasses) ↔ (¬sunny → ¬sunglasses)", "a ∧ ¬a", "a ∨ T"):
+        assert dpll_count(formula) == len(list(dpll_models(formula)))
+    # Tseytin definitions would multiply the count if they were not projected away
+    assert dpll_count("((a ∧ b) ∨ (c ∧ d)) ∧ ((a ∨ c) → (b ∨ d))") == len(list(dpll_models("((a ∧ b) ∨ (c ∧ d)) ∧ ((a ∨ c) → (b ∨ d))")))
+    assert dpll_count("a ∨ b", projection=["a"]) == 2
@@ -0,0 +1,51 @@
+import itertools
+
+from dpll.cnf_transformer import Transformer
+from dpll.cube import CubeAndConquer, Lookahead
+from dpll.main import dpll, dpll_model
+from dpll.parser import Parser
+from dpll.solver import Solver, SolverAlgorithm, SolverConfig
+
+
+def test_cubes_cover_every_model():
+    clauses = [[1, 2, -3], [-1, 3, 4], [2, -4, 5], [-2, -5, 6], [3, -6, 1], [-3, 4, -5], [5, 6, -1]]
+    cubes = Lookahead(clauses, 6, candidates=4).cubes(8)
+    assert 1 < len(cubes) <= 8
+    for bits in itertools.product((False, True), repeat=6):
+        def holds(lit):
+            return bits[abs(lit) - 1] == (lit > 0)
+        if all(any(holds(lit) for lit in clause) for clause in clauses):
+            assert any(all(holds(lit) for lit in cube) for cube in cubes)
+
+
+def test_cube_cap():
+    clauses = [[var, var + 1, -(var + 2)] for var in range(1, 19)]
+    for max_cubes in (1, 3, 5, 100):
+        assert len(Lookahead(clauses, 20).cubes(max_cubes)) <= max_cubes
+    assert len(Lookahead(clauses, 20).cubes(5)) == 4
+
+
+def test_refuted_by_lookahead():
+    assert Lookahead([[1, 2], [-1, 2], [1, -2], [-1, -2]], 2).cubes(16) == []
+
+
+def test_cube_and_conquer():
+    remaining: list[int] = []
+    clauses = [[1, 2, 3], [-1, -2], [-2, -3], [-1, -3], [1, -4], [4, 5, -6], [-5, 6]]
+    result = CubeAndConquer.solve(clauses, 6, SolverConfig(workers=2, cubes=4), progress=remaining.append)
+    assert result.satisfiable
+    assert all(any(result.values[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+    assert remaining and remaining == sorted(remaining, reverse=True)
+
+    config = SolverConfig(workers=2, cubes=16)
+    assert not dpll("¬((p → q) ∧ (p ∧ q → r ) → (p → r ))", algorithm=SolverAlgorithm.CUBE_AND_CONQUER, config=config)
+    assert dpll_model("(a ∨ b) ∧ (¬a ∨ c) ∧ (¬b ∨ ¬c)", algorithm=SolverAlgorithm.CUBE_AND_CONQUER, config=config) is not None
+
+
+def test_progress_through_solver():
+    remaining: list[int] = []
+    config = SolverConfig(workers=2, cubes=8, progress=remaining.append)
+    pigeons = [f"atleast(1, p{i}1, p{i}2, p{i}3, p{i}4)" for i in range(4)] + [f"atmost(1, p0{j}, p1{j}, p2{j}, p3{j})" for j in range(1, 5)]
+    clauses = Transformer.transform(Parser.parse(" ∧ ".join(pigeons)))
+    assert Solver.solve(clauses, SolverAlgorithm.CUBE_AND_CONQUER, config).satisfiable is True
+    assert remaining and remaining == sorted(remaining, reverse=True)
@@ -0,0 +1,97 @@
+from array import array
+import bz2
+import gzip
+import io
+import lzma
+
+from dpll import dpll_export
+from dpll.clause_db import ClauseDatabase
+from dpll.dimacs import iter_dimacs, read_dimacs, read_names, write_dimacs, write_names
+from dpll.solver import Solver, SolverAlgorithm
+from dpll.tests.test_solver import sat_case
+
+formula = b"""c a comment, with p and 0 in it
+p cnf 6 4
+1 -2 3 0
+-4
+ 5 0
+0
+c between clauses 1 2 0
+6 -1 0
+%
+0
+"""
+clauses = [[1, -2, 3], [-4, 5], [], [6, -1]]
+
+
+def test_read():
+    cnf = read_dimacs(formula)
+    assert cnf.num_vars == 6
+    assert list(cnf.clauses) == clauses
+    assert list(iter_dimacs(formula)) == clauses
+    assert read_dimacs(b"p cnf 3 1\n1 -2").num_vars == 3  # no final 0, and a variable never used
+    assert list(read_dimacs(b"1 -2 0 3").clauses) == [[1, -2], [3]]
+    assert read_dimacs(b"").num_vars == 0
+
+
+def test_chunks_split_clauses():
+    for chunk_size in (1, 2, 5, 13):
+        assert list(read_dimacs(formula, chunk_size=chunk_size).clauses) == clauses
+        assert list(iter_dimacs(formula, chunk_size=chunk_size)) == clauses
+    assert len(read_dimacs(sat_case.encode(), chunk_size=64).clauses) == 218
+
+
+def test_sources(tmp_path):
+    for compress in (lambda data: data, gzip.compress, lzma.compress, bz2.compress):
+        data = compress(formula)
+        path = tmp_path / "formula.cnf"
+        path.write_bytes(data)
+        for source in (data, io.BytesIO(data), path, str(path)):
+            assert list(read_dimacs(source, chunk_size=8).clauses) == clauses
+        with open(path, "rb") as file:
+            assert list(iter_dimacs(file)) == clauses
+        assert list(read_dimacs(path, use_mmap=False).clauses) == clauses
+    assert list(read_dimacs(io.StringIO(formula.decode())).clauses) == clauses
+
+
+def test_add_packed():
+    db = ClauseDatabase([[7]])
+    db.add_packed(array('i', [1, -2, 0, 0, -9, 3, 4, 0]))
+    assert list(db) == [[7], [1, -2], [], [-9, 3, 4]]
+    assert db.num_vars == 9
+    assert db.learnt.tolist() == [0] * 4 and db.lbd.tolist() == [0] * 4
+
+
+def test_write_round_trip(tmp_path):
+    for name in ("formula.cnf", "formula.cnf.gz", "formula.cnf.xz", "formula.cnf.bz2"):
+        write_dimacs(tmp_path / name, clauses, 6, comments=["written back"])
+        cnf = read_dimacs(tmp_path / name)
+        assert cnf.num_vars == 6 and list(cnf.clauses) == clauses
+    text, binary = io.StringIO(), io.BytesIO()
+    write_dimacs(text, ClauseDatabase(clauses), 7)
+    write_dimacs(binary, clauses, 7)
+    assert text.getvalue().encode() == binary.getvalue()
+    assert text.getvalue().startswith("p cnf 7 4\n1 -2 3 0\n")
+
+    write_names(tmp_path / "names.json", ["p", "q", "¬x"])
+    assert read_names(tmp_path / "names.json") == ["p", "q", "¬x"]
+
+
+def test_export_is_stable(tmp_path):
+    exp = "(a ∧ ¬b) ∨ (c → (d ∨ ¬a))"
+    names = dpll_export(exp, tmp_path / "first.cnf")
+    for _ in range(3):
+        assert dpll_export(exp, tmp_path / "again.cnf") == names
+        assert (tmp_path / "again.cnf").read_bytes() == (tmp_path / "first.cnf").read_bytes()
+    assert read_names(tmp_path / "first.cnf.names.json") == names
+    assert {"a", "b", "c", "d"} <= set(names)
+
+    cnf = read_dimacs(tmp_path / "first.cnf")
+    result = Solver.solve_cnf(cnf.clauses, cnf.num_vars, names=names)
+    assert result.satisfiable and result.stats.phases["encode"].clauses == len(cnf.clauses)
+    model = {var.name: var.polarity for var in result.model}
+    a, b, c, d = (model.get(name, False) for name in "abcd")  # a partial model works with any completion
+    assert (a and not b) or not c or d or not a
+
+    dpll_export("p ∧ ¬p", tmp_path / "unsat.cnf")
+    assert Solver.solve_cnf(iter_dimacs(tmp_path / "unsat.cnf"), algorithm=SolverAlgorithm.CDCL).satisfiable is False
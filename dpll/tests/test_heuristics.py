@@ -0,0 +1,70 @@
+import pytest
+
+from dpll.clause_db import ClauseDatabase
+from dpll.heuristics import BranchingHeuristic, Heuristic, DLIS, JeroslowWang, MOMS, VSIDS, make_heuristic
+from dpll.solver import Solver, SolverConfig
+from dpll.tests.test_solver import dimacs_cnf_to_clauses, sat_case, unsat_case
+
+
+def setup(heuristic, clauses, num_vars):
+    db = ClauseDatabase(clauses)
+    lit_value = [0] * (2 * num_vars + 1)
+    heuristic.setup(num_vars, db, lit_value)
+    return lit_value
+
+
+def test_counting_heuristics():
+    clauses = [[1, 2], [-1, 2, 3], [2, -3], [-2, 3, 4]]
+
+    dlis = DLIS()
+    setup(dlis, clauses, 4)
+    assert dlis.pick() == 2  # occurs in three clauses
+
+    jw = JeroslowWang()
+    lit_value = setup(jw, clauses, 4)
+    assert jw.pick() == 2
+    lit_value[2], lit_value[-2] = 1, -1
+    assert jw.pick() in (3, 4, -4)  # only [-2, 3, 4] is left
+
+    moms = MOMS()
+    setup(moms, clauses, 4)
+    assert abs(moms.pick()) in (1, 2, 3)  # variables of the binary clauses
+
+
+def test_vsids_prefers_bumped_variables():
+    vsids = VSIDS()
+    lit_value = setup(vsids, [[1, 2, 3]], 3)
+    vsids.on_conflict([3])
+    vsids.on_conflict([2, 3])
+    assert vsids.pick() == -3
+    lit_value[-3], lit_value[3] = 1, -1
+    assert vsids.pick() == -2
+    lit_value[-3], lit_value[3] = 0, 0
+    vsids.on_backtrack([-3])
+    assert vsids.pick() == -3
+
+
+@pytest.mark.parametrize("heuristic", list(Heuristic))
+def test_heuristics_solve(heuristic):
+    config = SolverConfig(heuristic=heuristic)
+    sat_clauses = dimacs_cnf_to_clauses(sat_case)
+    unsat_clauses = dimacs_cnf_to_clauses(unsat_case)
+
+    for run in (Solver.dpll, Solver.cdcl):
+        result = run(sat_clauses, config=config)
+        assert result.satisfiable is True
+        model = set(result.model)
+        assert all(clause & model for clause in sat_clauses)
+        assert run(unsat_clauses, config=config).satisfiable is False
+
+
+def test_make_heuristic():
+    instance = VSIDS(decay=0.8)
+    assert make_heuristic(instance) is instance
+    assert isinstance(make_heuristic("jw"), JeroslowWang)
+
+    class Incomplete(BranchingHeuristic):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,93 @@
+from dpll.cdcl import CDCLSolver
+from dpll.incremental import IncrementalSolver
+from dpll.solver import SolverConfig, SolverVariable
+from dpll.tests.test_solver import dimacs_cnf_to_clauses, sat_case, unsat_case
+
+
+def test_assumptions():
+    solver = CDCLSolver([[1, 2], [-1, 3], [-2, 3]], 3)
+    assert solver.solve()
+    assert solver.solve([-3, 1]) is False
+    assert set(solver.failed_assumptions) <= {-3, 1} and -3 in solver.failed_assumptions
+    assert solver.solve([1])
+    assert solver.model()[3]
+    assert solver.solve([-3]) is False
+    assert solver.failed_assumptions == [-3]  # [-3] alone is enough: it implies neither 1 nor 2
+    assert solver.solve()  # assumptions do not stick
+
+
+def test_push_pop():
+    solver = CDCLSolver([[1, 2]], 2)
+    solver.push()
+    solver.add_clause([-1])
+    solver.add_clause([-2])
+    assert solver.solve() is False
+    assert solver.failed_assumptions == []
+    solver.pop()
+    assert solver.solve()
+    solver.add_clause([-1])
+    assert solver.solve()
+    assert solver.model()[2]
+
+
+def test_incremental_matches_batch():
+    for case, expected in ((sat_case, True), (unsat_case, False)):
+        solver = IncrementalSolver()
+        for clause in dimacs_cnf_to_clauses(case):
+            solver.add_clause(clause)
+        assert solver.solve().satisfiable is expected
+        assert solver.solve().satisfiable is expected
+
+
+def test_incremental_solver_formulas():
+    solver = IncrementalSolver()
+    solver.add_formula("(a ∨ b) ∧ (a → c)")
+    result = solver.solve()
+    assert result.satisfiable
+    assert {var.name for var in result.model} == {"a", "b", "c"}
+
+    # A second formula gets its own Tseytin definitions
+    solver.add_formula("¬c ∧ (b → d)")
+    result = solver.solve()
+    assert result.satisfiable
+    values = dict(result.model)
+    assert not values["c"] and not values["a"] and values["b"] and values["d"]
+
+    result = solver.solve([SolverVariable("d", False)])
+    assert not result.satisfiable
+    assert SolverVariable("d", False) in solver.failed_assumptions()
+    assert solver.solve().satisfiable
+
+
+def test_incremental_solver_scopes():
+    solver = IncrementalSolver()
+    solver.add_clause([SolverVariable("x", True), SolverVariable("y", True)])
+    solver.push()
+    solver.add_formula("¬x ∧ ¬y")
+    assert not solver.solve().satisfiable
+    solver.pop()
+    result = solver.solve()
+    assert result.satisfiable
+    assert [var.name for var in result.model] == ["x", "y"]
+    assert result.stats is not None and result.stats.conflicts >= 0
+
+
+def test_incremental_solver_models():
+    solver = IncrementalSolver()
+    solver.add_formula("a → b")
+    assert len(list(solver.models())) == 3
+    solver.push()
+    solver.add_clause([SolverVariable("a", True)])
+    assert list(solver.models()) == [[SolverVariable("a", True), SolverVariable("b", True)]]
+    solver.pop()
+    assert len(list(solver.models(["b"]))) == 2
+
+
+def test_incremental_solver_seed():
+    def model(seed):
+        solver = IncrementalSolver(SolverConfig(seed=seed))
+        solver.add_formula(" ∨ ".join(f"x{i}" for i in range(20)))
+        return solver.solve().model
+
+    assert model(3) == model(3)
+    assert len({tuple(model(seed)) for seed in range(5)}) > 1  # the seed sets the initial phases
@@ -0,0 +1,67 @@
+import random
+
+from dpll.budget import UNKNOWN, CancellationToken
+from dpll.dimacs import iter_dimacs
+from dpll.local_search import LocalSearch, LocalSearchMethod
+from dpll.solver import Solver, SolverAlgorithm, SolverConfig
+from dpll.tests.test_solver import sat_case, unsat_case
+
+
+def satisfies(values: list[bool], clauses: list[list[int]]) -> bool:
+    return all(any(values[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+
+
+def test_counts_stay_consistent():
+    rand = random.Random(7)
+    for seed in range(100):
+        num_vars = rand.randint(1, 10)
+        clauses = [[rand.choice((1, -1)) * rand.randint(1, num_vars) for _ in range(rand.randint(1, 4))]
+                   for _ in range(rand.randint(1, 30))]
+        search = LocalSearch(clauses, num_vars, rand.choice(list(LocalSearchMethod)), seed=seed)
+        search.solve(rand.randint(0, 100))
+
+        fresh = LocalSearch(clauses, num_vars)
+        fresh._reset(search.values())
+        assert (fresh._break, fresh._make) == (search._break, search._make)
+        assert sorted(fresh._unsat) == sorted(search._unsat)
+        assert all(search._unsat[search._unsat_pos[cid]] == cid for cid in search._unsat)
+        fresh._reset(search.best_values())
+        assert len(fresh._unsat) == search._best_unsat
+
+
+def test_finds_models():
+    clauses = list(iter_dimacs(sat_case.encode()))
+    for method in LocalSearchMethod:
+        search = LocalSearch(clauses, 0, method, seed=1)
+        assert search.solve(100000) is True
+        assert satisfies(search.values(), clauses)
+        assert 0 < search.stats.flips < 100000
+
+
+def test_unsat_is_unknown():
+    clauses = list(iter_dimacs(unsat_case.encode()))
+    search = LocalSearch(clauses, 0, seed=1)
+    assert search.solve(2000) is UNKNOWN and search.stats.flips == 2000
+    assert LocalSearch([[1], []], 1).solve(10) is False
+
+    cancel = CancellationToken()
+    cancel.cancel()
+    assert Solver.solve_cnf(clauses, algorithm=SolverAlgorithm.LOCAL_SEARCH,
+                            config=SolverConfig(cancel=cancel)).satisfiable is UNKNOWN
+
+
+def test_solver_entries():
+    clauses = list(iter_dimacs(sat_case.encode()))
+    result = Solver.solve_cnf(clauses, algorithm=SolverAlgorithm.LOCAL_SEARCH, config=SolverConfig(seed=3))
+    assert result.satisfiable and len(result.model) == max(abs(lit) for clause in clauses for lit in clause)
+    assert satisfies([False] + [var.polarity for var in result.model], clauses)
+
+    # As a first phase, a model found by local search is the answer; otherwise the complete search runs
+    for flips, phases in ((100000, ["encode", "local search"]), (1, ["encode", "local search", "search"])):
+        config = SolverConfig(local_search=LocalSearchMethod.WALKSAT, local_search_flips=flips, seed=3)
+        for algorithm in (SolverAlgorithm.DPLL, SolverAlgorithm.CDCL):
+            result = Solver.solve_cnf(clauses, algorithm=algorithm, config=config)
+            assert result.satisfiable and list(result.stats.phases) == phases
+            assert 0 < result.stats.flips <= flips
+    unsat = list(iter_dimacs(unsat_case.encode()))
+    assert Solver.solve_cnf(unsat, algorithm=SolverAlgorithm.CDCL, config=SolverConfig(local_search_flips=100)).satisfiable is False
@@ -133,3 +133,13 @@ def test_syntax_check():
 
 def test_parser():
     pass
+
+
+def test_cardinality():
+    assert str(parser.parse("atmost(1, a, ¬b, (c && d) || e) -> exactly(0)")) == "(atmost(1,a,¬b,((c&d)|e))>exactly(0))"
+    assert str(parser.parse("¬atleast(2, atmost(1, a, b), c) /\\ atleast")) == "(¬atleast(2,atmost(1,a,b),c)&atleast)"
+    assert [x.value for x in parser.lexer("atmost(1, a)&&b")] == ["atmost(1,a)", "∧", "b"]
+
+    for bad in ["atmost(a, b)", "atmost(-1, a)", "exactly(1, a"]:
+        with pytest.raises(SyntaxError):
+            parser.parse(bad)
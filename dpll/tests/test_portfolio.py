@@ -0,0 +1,47 @@
+from dpll.clause_db import ClauseDatabase
+from dpll.portfolio import ClauseExchange, Portfolio
+from dpll.main import dpll
+from dpll.solver import SolverAlgorithm, SolverConfig
+from dpll.tests.test_solver import dimacs_cnf_to_clauses, sat_case, unsat_case
+
+
+def test_clause_exchange():
+    exchange = ClauseExchange(2, slots=4, max_length=3)
+    exchange.attach(0)
+    exchange.export([1, -2], 2)
+    exchange.export([1, 2, 3, 4], 2)  # too long to share
+    exchange.export([3, 4], 9)  # LBD too high
+    exchange.attach(1)
+    assert exchange.collect() == [[1, -2]]
+    exchange.export([5, 6, 7], 3)
+    exchange.attach(0)
+    assert exchange.collect() == [[5, 6, 7]]  # a worker's own clauses are skipped
+    assert exchange.collect() == []
+    for i in range(6):
+        exchange.attach(1)
+        exchange.export([i + 1, i + 2], 2)
+    exchange.attach(0)
+    assert exchange.collect() == [[3, 4], [4, 5], [5, 6], [6, 7]]  # the oldest were overwritten
+
+
+def test_portfolio_configs():
+    configs = Portfolio.configs(SolverConfig(), 4)
+    assert len(configs) == 4
+    assert configs[0] == SolverConfig()
+    assert len({(config.restarts, config.seed) for config in configs}) == 4
+
+
+def test_portfolio():
+    config = SolverConfig(workers=3)
+    assert dpll("((p ↔ ¬q) → r) → r ∧ ¬p", algorithm=SolverAlgorithm.PORTFOLIO, config=config)
+    assert not dpll("¬((p → q) ∧ (p ∧ q → r ) → (p → r ))", algorithm=SolverAlgorithm.PORTFOLIO, config=config)
+
+    for case, expected in ((sat_case, True), (unsat_case, False)):
+        db = ClauseDatabase([[int(var.name) if var.polarity else -int(var.name) for var in clause]
+                             for clause in dimacs_cnf_to_clauses(case)])
+        assert Portfolio.solve(db, db.num_vars, Portfolio.configs(config, 3)).satisfiable is expected
+
+    db = ClauseDatabase([[1, 2], [-1, 2], [-2, 3]])
+    result = Portfolio.solve(db, 3, Portfolio.configs(SolverConfig(), 2))
+    assert result.satisfiable and result.values[2] and result.values[3]
+    assert result.worker in (0, 1)
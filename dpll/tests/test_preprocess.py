@@ -0,0 +1,49 @@
+from dpll.main import dpll, dpll_model
+from dpll.preprocess import Preprocessor
+from dpll.solver import Solver, SolverAlgorithm, SolverConfig
+from dpll.tests.test_solver import dimacs_cnf_to_clauses, sat_case, unsat_case
+
+
+def satisfies(values: list[bool], clauses: list[list[int]]) -> bool:
+    return all(any(values[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+
+
+def test_subsumption_and_strengthening():
+    preprocessor = Preprocessor([[1, 2], [1, 2, 3], [-1, 2, 4], [5, 6, 7], [5, -6, 7]], 7, frozen=range(1, 8))
+    assert preprocessor.run()
+    clauses = [sorted(clause) for clause in preprocessor.clauses()]
+    assert [1, 2, 3] not in clauses  # subsumed by [1, 2]
+    assert [2, 4] in clauses  # [-1, 2, 4] strengthened by [1, 2]
+    assert [5, 7] in clauses
+    assert preprocessor.stats.subsumed_clauses >= 1
+    assert preprocessor.stats.strengthened_clauses >= 2
+
+
+def test_variable_elimination_and_model_extension():
+    # 3 <-> (1 and 2), as the Tseytin transform would define it, and the definition asserted
+    clauses = [[-3, 1], [-3, 2], [3, -1, -2], [3, 4]]
+    preprocessor = Preprocessor(clauses, 4)
+    assert preprocessor.run()
+    assert preprocessor.stats.eliminated_vars > 0
+    values = [False] * 5
+    for clause in preprocessor.clauses():
+        assert len(clause) == 1  # what is left is a fixed assignment
+        values[abs(clause[0])] = clause[0] > 0
+    assert satisfies(preprocessor.extend_model(values), clauses)
+
+
+def test_unsat_detection():
+    assert not Preprocessor([[1, 2], [-1, 2], [1, -2], [-1, -2]], 2).run()
+
+
+def test_solver_with_preprocessing():
+    config = SolverConfig(preprocess=True)
+    assert Solver.dpll(dimacs_cnf_to_clauses(sat_case), config=config).satisfiable
+    assert not Solver.cdcl(dimacs_cnf_to_clauses(unsat_case), config=config).satisfiable
+
+    formula = "((p ↔ ¬q) → r) → r ∧ ¬p"
+    model = dpll_model(formula, algorithm=SolverAlgorithm.CDCL, config=config)
+    assert model is not None
+    assert {var.name for var in model} == {"p", "q", "r"}
+    fixed = " ∧ ".join(var.name if var.polarity else f"¬{var.name}" for var in model)
+    assert dpll(f"({formula}) ∧ {fixed}")
@@ -1,6 +1,13 @@
 # Check valid propositional expressions
 
-from dpll import dpll, dpll_model
+import json
+import random
+
+from dpll import (dpll, dpll_core, dpll_equiv, dpll_equiv_core, dpll_model, dpll_models, dpll_result, dpll_valid, dpll_valid_core,
+                  SolverAlgorithm, SolverConfig, UNKNOWN)
+from dpll.cnf_transformer import Config, Transformer
+from dpll.parser import Parser
+from dpll.solver import Solver
 
 example4 = "(a <-> b) -> c"
 example = "((p <-> ~q) -> r) -> r /\\ ~p"
@@ -46,3 +53,105 @@ def test_unsat():
     for case in unsat_cases:
         assert (dpll(case) is False), f"Problem: {case}, expected UNSAT, returned SAT"
         assert (dpll_model(case) is None), f"Problem: {case}, expected UNSAT, returned SAT"
+
+
+def test_cdcl():
+    for case in sat_cases:
+        assert (dpll(case, algorithm=SolverAlgorithm.CDCL) is True), f"Problem: {case}, expected SAT, returned UNSAT"
+        assert (dpll_model(case, algorithm=SolverAlgorithm.CDCL) is not None), f"Problem: {case}, expected SAT, returned UNSAT"
+    for case in unsat_cases:
+        assert (dpll(case, algorithm=SolverAlgorithm.CDCL) is False), f"Problem: {case}, expected UNSAT, returned SAT"
+        assert (dpll_model(case, algorithm=SolverAlgorithm.CDCL) is None), f"Problem: {case}, expected UNSAT, returned SAT"
+
+
+def test_budget_exhausted():
+    config = SolverConfig(max_decisions=0)
+    for algorithm in (SolverAlgorithm.DPLL, SolverAlgorithm.CDCL):
+        assert dpll(example_unsat3, algorithm=algorithm, config=config) is UNKNOWN
+        assert dpll_model(example_unsat3, algorithm=algorithm, config=config) is UNKNOWN
+        assert dpll_valid(f"¬({example_unsat3})", algorithm=algorithm, config=config) is UNKNOWN
+    assert dpll_valid(f"¬({example_unsat3})", config=SolverConfig(max_decisions=1000)) is True
+
+
+def test_models():
+    models = list(dpll_models(example_sunny))
+    assert len(models) == 2  # sunny and sunglasses agree
+    assert all(model[0].polarity == model[1].polarity for model in models)
+    assert list(dpll_models(example_unsat5)) == []
+
+    # Variables outside the clauses are free, and the consumer may stop at any time
+    assert len(list(dpll_models("a ∨ T", projection=["a", "b"]))) == 4
+    models = dpll_models(" ∨ ".join(f"x{i}" for i in range(40)))
+    assert len([next(models) for _ in range(5)]) == 5
+
+
+def test_equiv():
+    # A disjunction whose side only becomes a conjunction during the CNF conversion still distributes
+    assert dpll_equiv("a", "a") is True
+    assert dpll_equiv("a ∧ (b ∨ c)", "(a ∧ b) ∨ (a ∧ c)") is True
+    assert dpll_equiv("a ∧ (b ∨ c)", "(a ∧ b) ∨ c") is False
+    assert dpll_valid("(a <-> b) \\/ (a <-> ¬b)") is True
+
+
+def test_unsat_core():
+    core = dpll_core("(a ∧ ¬a) ∧ ((b ∨ c) ∧ (d → e))", minimize=True)
+    assert core is not None
+    assert {str(formula) for formula in core.formulas} == {"(a&¬a)", "((a&¬a)&((b|c)&(d>e)))"}
+    assert dpll_core(example_sunny) is None
+    for case in unsat_cases:
+        assert dpll_core(case) is not None, f"Problem: {case}, expected UNSAT, returned SAT"
+
+    # The implication from the premises is needed, the unrelated disjunct is not
+    core = dpll_valid_core("((p ∧ (p → q)) → q) ∨ (r ∧ s)", minimize=True)
+    assert core is not None
+    formulas = {str(formula) for formula in core.formulas}
+    assert "(p>q)" in formulas and "(r&s)" not in formulas
+    assert dpll_equiv_core("a ∧ b", "a ∨ b") is None
+    assert dpll_equiv_core("a ∧ b", "b ∧ a") is not None
+
+    # Sub-formulas are only kept when provenance is asked for
+    tree = Parser.parse("((a ∧ b) ∨ atmost(1, a ↔ c, b ∨ c)) ∧ ¬(d ↔ e)")
+    clauses = Transformer.transform(tree, Config(disable_syntax_check=False, use_tseytin_transform=True, native_xor=True))
+    nodes = [tree, *clauses]
+    while nodes:
+        node = nodes.pop()
+        assert node.source is None
+        nodes.extend(child for child in (node.left, node.right, *node.operands) if child is not None)
+
+
+def test_result_stats():
+    for algorithm, config in ((SolverAlgorithm.DPLL, None), (SolverAlgorithm.CDCL, SolverConfig(preprocess=True))):
+        result = dpll_result(example_unsat3, algorithm=algorithm, config=config)
+        assert result.satisfiable is False and result.stats is not None
+        phases = result.stats.phases
+        assert list(phases)[:3] == ["parse", "transform", "encode"]
+        assert ("preprocess" in phases) == (config is not None)  # which refutes it, so no search follows
+        assert phases["parse"].variables == 3
+        assert phases["encode"].clauses == phases["transform"].clauses  # 8 clauses, plus Tseytin definitions
+        assert phases["encode"].variables > 3
+        assert all(phase.wall_time >= 0 and phase.cpu_time >= 0 for phase in phases.values())
+
+    stats = dpll_result(example_unsat3).stats
+    assert stats is not None and stats.max_depth > 0
+    exported = json.loads(stats.to_json())
+    assert exported == stats.as_dict()
+    assert exported["decisions"] == stats.decisions
+    assert exported["phases"]["parse"]["variables"] == 3
+
+
+def test_without_tseytin():
+    def formula(rand: random.Random, depth: int) -> str:
+        if depth == 0 or rand.random() < 0.2:
+            return rand.choice("abce")
+        if rand.random() < 0.3:
+            return f"¬{formula(rand, depth - 1)}"
+        return f"({formula(rand, depth - 1)} {rand.choice("↔∧∨→")} {formula(rand, depth - 1)})"
+
+    rand = random.Random(11)
+    direct = Config(disable_syntax_check=False, use_tseytin_transform=False)
+    tseytin = Config(disable_syntax_check=False, use_tseytin_transform=True)
+    for exp in ["(e ↔ ¬(c ↔ a))", "¬(a ↔ ¬(b ↔ c))", "¬¬(a ∧ ¬¬¬(b ∨ c))"] + [formula(rand, 3) for _ in range(150)]:
+        # Mentioning every variable keeps them all in the projection
+        tree = f"({exp}) ∧ (a ∨ ¬a ∨ b ∨ c ∨ e)"
+        expected = Solver.count(Transformer.transform(Parser.parse(tree), tseytin), list("abce"))
+        assert Solver.count(Transformer.transform(Parser.parse(tree), direct), list("abce")) == expected, exp
@@ -0,0 +1,92 @@
+import io
+import random
+
+import pytest
+
+from dpll.main import dpll_valid
+from dpll.proof import DratWriter, check_drat, read_cnf, read_drat
+from dpll.solver import Solver, SolverAlgorithm, SolverClause, SolverConfig, SolverVariable
+from dpll.tests.test_solver import dimacs_cnf_to_clauses, unsat_case
+
+
+def solver_clauses(clauses: list[list[int]]) -> list[SolverClause]:
+    return [{SolverVariable(str(abs(lit)), lit > 0) for lit in clause} for clause in clauses]
+
+
+def refute(clauses: list[SolverClause], algorithm: SolverAlgorithm, config: SolverConfig) -> bool:
+    if algorithm == SolverAlgorithm.CDCL:
+        return Solver.cdcl(clauses, config).satisfiable is False
+    return Solver.dpll(clauses, config=config).satisfiable is False
+
+
+def pigeonhole(holes: int) -> list[list[int]]:
+    """holes + 1 pigeons in holes holes; variable p * holes + h + 1 puts pigeon p in hole h"""
+    def var(p: int, h: int) -> int:
+        return p * holes + h + 1
+    clauses = [[var(p, h) for h in range(holes)] for p in range(holes + 1)]
+    for h in range(holes):
+        for p in range(holes + 1):
+            for q in range(p + 1, holes + 1):
+                clauses.append([-var(p, h), -var(q, h)])
+    return clauses
+
+
+def test_round_trip():
+    steps = [(False, [1, -2, 300]), (True, [1, -2, 300]), (False, [-70000]), (False, [])]
+    for binary in (False, True):
+        target = io.BytesIO()
+        with DratWriter(target, binary=binary, buffer_size=4) as writer:
+            for deletion, clause in steps:
+                (writer.delete if deletion else writer.add)(clause)
+        assert list(read_drat(target.getvalue())) == steps
+        assert list(read_drat(target.getvalue(), binary=binary)) == steps
+
+    text = io.StringIO()
+    with DratWriter(text) as writer:
+        writer.add([1, -2])
+        writer.delete([3])
+    assert text.getvalue() == "1 -2 0\nd 3 0\n"
+
+
+@pytest.mark.parametrize("algorithm", [SolverAlgorithm.DPLL, SolverAlgorithm.CDCL])
+@pytest.mark.parametrize("preprocess", [False, True])
+def test_refutations_check(algorithm, preprocess):
+    for clauses in (dimacs_cnf_to_clauses(unsat_case), solver_clauses(pigeonhole(4))):
+        proof, cnf = io.BytesIO(), io.StringIO()
+        config = SolverConfig(preprocess=preprocess, proof=DratWriter(proof, binary=True, cnf=cnf))
+        assert refute(clauses, algorithm, config)
+        assert check_drat(cnf.getvalue().encode(), proof.getvalue())
+
+
+def test_random_refutations_check():
+    rng = random.Random(3)
+    checked = 0
+    for _ in range(40):
+        clauses = [[rng.choice((-1, 1)) * rng.randint(1, 12) for _ in range(3)] for _ in range(70)]
+        for algorithm in (SolverAlgorithm.DPLL, SolverAlgorithm.CDCL):
+            proof, cnf = io.StringIO(), io.StringIO()
+            config = SolverConfig(preprocess=rng.random() < 0.5, proof=DratWriter(proof, cnf=cnf))
+            if refute(solver_clauses(clauses), algorithm, config):
+                assert check_drat(read_cnf(cnf.getvalue().encode()), proof.getvalue().encode())
+                checked += 1
+    assert checked > 0
+
+
+def test_bogus_proof_fails():
+    clauses = pigeonhole(3)
+    assert not check_drat(clauses, b"1 0\n0\n")
+    assert not check_drat(clauses, b"")
+
+
+def test_valid_with_proof():
+    proof, cnf = io.StringIO(), io.StringIO()
+    assert dpll_valid("(a ∧ b) → (b ∨ c)", algorithm=SolverAlgorithm.CDCL,
+                      config=SolverConfig(proof=DratWriter(proof, cnf=cnf)))
+    assert "c 1 " in cnf.getvalue()
+    assert check_drat(cnf.getvalue().encode(), proof.getvalue().encode())
+
+
+def test_parallel_engines_refuse_proofs():
+    config = SolverConfig(proof=DratWriter(io.BytesIO()))
+    with pytest.raises(ValueError):
+        Solver.solve(set(), SolverAlgorithm.PORTFOLIO, config)
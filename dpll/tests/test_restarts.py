@@ -0,0 +1,62 @@
+import pytest
+
+from dpll.restarts import Geometric, Glucose, Luby, Restart, RestartPolicy, luby
+from dpll.solver import Solver, SolverConfig
+from dpll.tests.test_solver import dimacs_cnf_to_clauses, sat_case, unsat_case
+
+
+def test_luby_sequence():
+    assert [luby(i) for i in range(15)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+
+def test_conflict_limit_policies():
+    policy = Geometric(first=2, factor=2)
+    policy.reset()
+    limits = []
+    for _ in range(3):
+        conflicts = 0
+        while not policy.should_restart():
+            policy.on_conflict(1)
+            conflicts += 1
+        policy.on_restart()
+        limits.append(conflicts)
+    assert limits == [2, 4, 8]
+
+    class Incomplete(RestartPolicy):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_glucose_restarts_on_worse_recent_lbd():
+    policy = Glucose(window=3, k=0.8)
+    policy.reset()
+    for _ in range(10):
+        policy.on_conflict(2)
+    assert not policy.should_restart()
+    for _ in range(3):
+        policy.on_conflict(10)
+    assert policy.should_restart()
+    policy.on_restart()
+    assert not policy.should_restart()
+
+
+@pytest.mark.parametrize("restarts", [*Restart, Luby(unit=1)])
+@pytest.mark.parametrize("phase_saving", [True, False])
+def test_cdcl_restarts(restarts, phase_saving):
+    config = SolverConfig(restarts=restarts, phase_saving=phase_saving)
+    sat_clauses = dimacs_cnf_to_clauses(sat_case)
+
+    result = Solver.cdcl(sat_clauses, config=config)
+    assert result.satisfiable is True
+    model = set(result.model)
+    assert all(clause & model for clause in sat_clauses)
+
+    result = Solver.cdcl(dimacs_cnf_to_clauses(unsat_case), config=config)
+    assert result.satisfiable is False
+    assert result.stats is not None
+    if restarts == Restart.NONE:
+        assert result.stats.restarts == 0
+    elif isinstance(restarts, Luby):
+        assert result.stats.restarts > 0
@@ -1,42 +1,95 @@
 # Tests only the solver; not the transformer
 
-from dpll.solver import Solver, SolverClause, SolverVariable
+import random
+import threading
+import time
+
+import pytest
+
+from dpll.budget import UNKNOWN, Budget, CancellationToken
+from dpll.cdcl import CDCLSolver
+from dpll.counting import ModelCounter
+from dpll.dimacs import iter_dimacs
+from dpll.solver import Solver, SolverAlgorithm, SolverClause, SolverConfig, SolverVariable
 
 
 def dimacs_cnf_to_clauses(file: str) -> list[SolverClause]:
     """Small helper methods to parse test cases from online source"""
-    clauses = []
+    return [{SolverVariable(str(abs(lit)), lit > 0) for lit in clause} for clause in iter_dimacs(file.encode())]
+
 
-    for line in file.split("\n"):
-        vars = line.strip().split()
-        new_clause = SolverClause()
+def test_sat_case():
+    clauses = dimacs_cnf_to_clauses(sat_case)
 
-        if line[0] == "%":
-            break
-        if line[0] == "p" or line[0] == "c":
-            continue
+    assert (Solver.dpll(clauses).satisfiable is True)
 
-        for var in vars[0:3]:  # all clauses have 3 literals so safe
-            if var[0] == "-":
-                new_clause.add(SolverVariable(var[1:].strip(), False))
-            else:
-                new_clause.add(SolverVariable(var[0:].strip(), True))
 
-        clauses.append(new_clause)
+def test_unsat_cases():
+    clauses = dimacs_cnf_to_clauses(unsat_case)
 
-    return clauses
+    assert (Solver.dpll(clauses).satisfiable is False)
 
 
-def test_sat_case():
+def test_deep_search():
+    # Every decision satisfies at most two clauses, so the search goes ~1250 levels deep
+    chain = [{SolverVariable(f"x{i}", True), SolverVariable(f"x{i + 1}", True)} for i in range(2500)]
+    chain.append({SolverVariable("x0", False), SolverVariable("x2500", False)})
+
+    result = Solver.dpll(chain)
+
+    assert result.satisfiable is True
+    model = set(result.model)
+    assert all(clause & model for clause in chain)
+
+
+def test_deep_count():
+    # Every decision on the chain x1 ∨ x2, x2 ∨ x3, ... leaves one component, ~1000 levels deep
+    chain = [[i, i + 1] for i in range(1, 1000)]
+    fibonacci = [1, 1]
+    while len(fibonacci) < 1002:
+        fibonacci.append(fibonacci[-1] + fibonacci[-2])
+    assert ModelCounter(chain, 1000).count() == fibonacci[-1]  # no two adjacent variables are both false
+
+
+def test_cdcl_learned_clause_reduction():
+    config = SolverConfig(reduce_interval=20, max_learned=30)
+    for case, expected in ((sat_case, True), (unsat_case, False)):
+        clauses = dimacs_cnf_to_clauses(case)
+        result = Solver.cdcl(clauses, config=config)
+        assert result.satisfiable is expected
+        assert result.stats is not None
+        if not expected:  # a lucky SAT run can finish before the first reduction
+            assert result.stats.reductions > 0
+            assert result.stats.deleted_clauses > 0
+        if expected:
+            model = set(result.model)
+            assert all(clause & model for clause in clauses)
+
+
+def test_propagate():
+    a, b, c, d = (SolverVariable(name, True) for name in "abcd")
+    not_a, not_b = SolverVariable("a", False), SolverVariable("b", False)
+    clauses = [{a}, {not_a, b}, {not_b, c, d}, {a, d}]
+
+    model = Solver.propagate(clauses)
+
+    assert model == [a, b]
+    assert clauses == [{c, d}]
+
+
+def test_cdcl_sat_case():
     clauses = dimacs_cnf_to_clauses(sat_case)
+    result = Solver.cdcl(clauses)
 
-    assert (Solver.dpll(clauses).satisfiable is True)
+    assert (result.satisfiable is True)
+    model = set(result.model)
+    assert all(clause & model for clause in clauses), "CDCL model does not satisfy every clause"
 
 
-def test_unsat_cases():
+def test_cdcl_unsat_case():
     clauses = dimacs_cnf_to_clauses(unsat_case)
 
-    assert (Solver.dpll(clauses).satisfiable is False)
+    assert (Solver.cdcl(clauses).satisfiable is False)
 
 
 # Test case uuf50-218/uuf50-01.cnf from https://www.cs.ubc.ca/%7Ehoos/SATLIB/benchm.html
@@ -498,3 +551,55 @@ p cnf 50  218
 -11 33 49 0
 %
 0""" # noqa
+
+
+def test_budgets():
+    clauses = dimacs_cnf_to_clauses(unsat_case)
+    result = Solver.cdcl(clauses, config=SolverConfig(max_conflicts=5))
+    assert result.satisfiable is UNKNOWN
+    assert result.stats is not None and result.stats.conflicts == 5
+    assert Solver.dpll(clauses, config=SolverConfig(max_decisions=3)).satisfiable is UNKNOWN
+    assert Solver.cdcl(clauses, config=SolverConfig(max_propagations=10)).satisfiable is UNKNOWN
+    assert Solver.cdcl(clauses, config=SolverConfig(max_conflicts=100000)).satisfiable is False
+
+    token = CancellationToken()
+    token.cancel()
+    assert Solver.dpll(clauses, config=SolverConfig(cancel=token)).satisfiable is UNKNOWN
+    assert Solver.cdcl(clauses, config=SolverConfig(timeout=0.0)).satisfiable is UNKNOWN
+
+    with pytest.raises(TypeError):
+        bool(UNKNOWN)
+
+
+def test_cancel_from_another_thread():
+    rng = random.Random(5)
+    clauses = [[rng.choice((1, -1)) * rng.randint(1, 250) for _ in range(3)] for _ in range(1065)]
+    token = CancellationToken()
+    timer = threading.Timer(0.05, token.cancel)
+    timer.start()
+    start = time.monotonic()
+    result = CDCLSolver(clauses, 250).solve(budget=Budget(cancel=token))
+    timer.join()
+    assert result is UNKNOWN  # solving this instance takes about a minute
+    assert time.monotonic() - start < 5
+
+
+def test_projected_models():
+    clauses = [[1, 2], [-1, 3], [-2, 4], [-3, -4]]
+    assert sorted(CDCLSolver(clauses, 4).models([1, 2, 3, 4])) == [[-1, 2, -3, 4], [1, -2, 3, -4]]
+    assert sorted(CDCLSolver(clauses, 4).models([3])) == [[-3], [3]]
+    assert list(CDCLSolver(clauses + [[-3], [-4]], 4).models([1])) == []
+
+
+def test_solve_cnf():
+    clauses = list(iter_dimacs(sat_case.encode()))
+    for algorithm in (SolverAlgorithm.DPLL, SolverAlgorithm.CDCL):
+        result = Solver.solve_cnf(clauses, algorithm=algorithm)
+        assert result.satisfiable
+        values = {int(var.name): var.polarity for var in result.model}
+        assert all(any(values.get(abs(lit)) == (lit > 0) for lit in clause) for clause in clauses)
+
+    result = Solver.solve_cnf([[1], [-1, 2]], num_vars=3, names=["p", "q", "r"])
+    assert {SolverVariable("p", True), SolverVariable("q", True)} <= set(result.model)
+    with pytest.raises(ValueError):
+        Solver.solve_cnf([[1, 2]], names=["p"])
@@ -0,0 +1,113 @@
+import itertools
+import random
+
+from dpll import dpll, dpll_equiv, dpll_model
+from dpll.cdcl import CDCLSolver
+from dpll.cnf_transformer import Config, Transformer
+from dpll.parser import Parser
+from dpll.propagation import NO_REASON, WatchedPropagator
+from dpll.solver import Solver, SolverAlgorithm, SolverConfig
+from dpll.types import Operator
+from dpll.xor import GaussJordan, XorConstraint
+
+xor_config = Config(disable_syntax_check=False, use_tseytin_transform=True, native_xor=True)
+
+
+def parity_holds(values: list[bool], xors: list[XorConstraint]) -> bool:
+    return all(sum(values[var] for var in xor.variables) % 2 == xor.parity for xor in xors)
+
+
+def brute_force(num_vars: int, clauses: list[list[int]], xors: list[XorConstraint]) -> bool:
+    for bits in itertools.product((False, True), repeat=num_vars):
+        values = [False, *bits]
+        if all(any(values[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses) and parity_holds(values, xors):
+            return True
+    return False
+
+
+def test_constraints():
+    assert XorConstraint.from_literals([1, -2, 3, 1]) == XorConstraint((2, 3), False)
+    assert GaussJordan([XorConstraint((1, 2), True), XorConstraint((2, 3), True), XorConstraint((1, 3), True)]).ok is False
+    assert len(GaussJordan([XorConstraint((1, 2), True), XorConstraint((2, 3), True), XorConstraint((1, 3), False)])) == 2
+
+    xor = XorConstraint(tuple(range(1, 9)), True)
+    fresh = iter(range(9, 20))
+    clauses = xor.clauses(lambda: next(fresh))
+    solver = CDCLSolver(clauses + [[-var] for var in range(1, 8)], 12)
+    assert solver.solve() and solver.model()[8] is True  # the only odd one out
+    assert CDCLSolver(clauses + [[-var] for var in range(1, 9)], 12).solve() is False
+
+
+def test_propagation_against_brute_force():
+    rand = random.Random(5)
+    for _ in range(400):
+        num_vars = rand.randint(1, 8)
+        clauses = [[rand.choice((1, -1)) * rand.randint(1, num_vars) for _ in range(rand.randint(1, 3))]
+                   for _ in range(rand.randint(0, 10))]
+        xors = [XorConstraint.from_literals([rand.choice((1, -1)) * rand.randint(1, num_vars) for _ in range(rand.randint(1, 5))])
+                for _ in range(rand.randint(1, 5))]
+        expected = brute_force(num_vars, clauses, xors)
+
+        solver = CDCLSolver(clauses, num_vars, reduce_interval=3, max_learned=4)
+        solver.add_xors(xors)
+        assert solver.solve() is expected, (clauses, xors)
+        if expected:
+            assert parity_holds(solver.model(), xors)
+
+
+def test_transform_keeps_chains():
+    clauses = Transformer.transform(Parser.parse("(a ↔ ¬b ↔ (c ∧ d) ↔ e) ∨ f"), xor_config)
+    xors = [clause for clause in clauses if clause.value is Operator.XOR]
+    assert len(xors) == 1
+    assert sorted(name for name, _ in Solver.xor_literals(xors[0]))[:3] == ["a", "b", "e"]
+
+    # The same answers as with clauses only, whichever engine takes them
+    for exp in ["a ↔ a", "¬(a ↔ a)", "(a ↔ b) ∧ (b ↔ c) ∧ ¬(a ↔ c)", "(a ↔ (b ∨ ⊤)) ∧ ¬a", "((p ↔ ¬q) → r) → r ∧ ¬p"]:
+        expected = Solver.solve(Transformer.transform(Parser.parse(exp))).satisfiable
+        for algorithm in (SolverAlgorithm.DPLL, SolverAlgorithm.CDCL, SolverAlgorithm.PORTFOLIO):
+            result = Solver.solve(Transformer.transform(Parser.parse(exp), xor_config), algorithm, SolverConfig(workers=2))
+            assert result.satisfiable is expected, (exp, algorithm)
+        assert dpll(exp, config=SolverConfig(preprocess=True)) is expected
+        model = dpll_model(exp)
+        assert (model is not None) is expected
+
+
+def test_equivalence_chains():
+    chain = " ↔ ".join(f"x{i}" for i in range(40))
+    reversed_chain = " ↔ ".join(f"x{i}" for i in reversed(range(40)))
+    assert dpll_equiv(chain, reversed_chain) is True
+    assert dpll_equiv(chain, f"¬({reversed_chain})") is False
+    model = {var.name: var.polarity for var in dpll_model(f"¬({chain})")}
+    assert sum(model[f"x{i}"] for i in range(40)) % 2 == 1  # a chain of 40 is true when an even number are true
+
+
+def test_incremental_matrix():
+    gauss = GaussJordan([XorConstraint((1, 2, 3), True), XorConstraint((3, 4), False)])
+    implied, conflicting = gauss.propagate([1, -2])
+    assert conflicting is None and sorted(clause[0] for clause in implied) == [-4, -3]
+    gauss.unassign([-2, -3, -4])
+    implied, conflicting = gauss.propagate([2, 5])  # 5 is not in the matrix
+    assert conflicting is None and sorted(clause[0] for clause in implied) == [3, 4]
+    gauss.unassign([1, 2, 3, 4])
+    implied, conflicting = gauss.propagate([1, 2, -3])
+    true = {1, 2, -3, *(clause[0] for clause in implied)}
+    assert conflicting is not None and all(-lit in true for lit in conflicting)
+
+
+def test_dpll_frees_parity_explanations():
+    class Scratch(WatchedPropagator):
+        keep_xor_reasons = False
+
+    # x1 ⊕ x2, x2 ⊕ x3, ...: deciding x1 implies all the others
+    propagator = Scratch(30)
+    propagator.add_clause([1, 2, 3])
+    propagator.add_xors([XorConstraint((var, var + 1), True) for var in range(1, 30)])
+    for _ in range(20):
+        for lit in (1, -1):
+            propagator._trail_lim.append(len(propagator._trail))
+            propagator._assign(lit, NO_REASON)
+            assert propagator.propagate() == NO_REASON
+            assert [propagator.value(var) for var in (2, 30)] == [-lit, -lit]
+            assert len(propagator._db) == 1 + 29
+            propagator._backtrack(0)
+            assert len(propagator._db) == 1
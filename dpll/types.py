@@ -38,9 +38,29 @@ class Contradiction:
 Atom = Variable | Tautology | Contradiction
 
 
+class CardinalityKind(StrEnum):
+    ATMOST = "atmost"
+    ATLEAST = "atleast"
+    EXACTLY = "exactly"
+
+
+@dataclass
+class Cardinality:
+    """Value of a LogicTree node that holds when at most/at least/exactly bound of its operands do"""
+    kind: CardinalityKind
+    bound: int
+
+    def __str__(self):
+        return f"{self.kind}({self.bound},...)"
+
+    def __repr__(self):
+        return self.__str__()
+
+
 class Operator(StrEnum):
     NEGATION = "¬"
     CONJUNCTION = "&"
     DISJUNCTION = "|"
     IMPLICATION = ">"
     EQUIVALENCE = "="
+    XOR = "⊕"  # only produced by Transformer, for parity constraints (see Config.native_xor)
@@ -0,0 +1,182 @@
+from typing import Callable, Iterable, NamedTuple
+
+
+class XorConstraint(NamedTuple):
+    """The values of the variables XOR to parity, e.g. (1, 2, 3), True for x1 ⊕ x2 ⊕ x3"""
+    variables: tuple[int, ...]
+    parity: bool
+
+    @staticmethod
+    def from_literals(lits: Iterable[int]) -> "XorConstraint":
+        """The constraint that the XOR of the literals is true; negations flip the parity, and variables that occur twice cancel"""
+        odd: dict[int, None] = {}
+        parity = True
+        for lit in lits:
+            parity ^= lit < 0
+            if abs(lit) in odd:
+                del odd[abs(lit)]
+            else:
+                odd[abs(lit)] = None
+        return XorConstraint(tuple(odd), parity)
+
+    def clauses(self, new_var: Callable[[], int], cut: int = 4) -> list[list[int]]:
+        """
+        The constraint as CNF, for engines without native XOR support. Longer constraints are cut
+        into pieces of at most cut variables chained by fresh variables from new_var; a piece of
+        k variables takes the 2^(k-1) clauses that rule out its assignments of the wrong parity.
+        """
+        variables = list(self.variables)
+        if not variables:
+            return [] if not self.parity else [[]]
+        pieces = []
+        while len(variables) > cut:
+            link = new_var()
+            pieces.append((variables[:cut - 1] + [link], False))  # link is the XOR of the piece
+            variables = [link] + variables[cut - 1:]
+        pieces.append((variables, self.parity))
+
+        clauses = []
+        for piece, parity in pieces:
+            for mask in range(1 << len(piece)):
+                if bin(mask).count("1") % 2 != parity:
+                    # Rule out the assignment with the variables of mask true, the rest false
+                    clauses.append([-var if mask >> i & 1 else var for i, var in enumerate(piece)])
+        return clauses
+
+
+class GaussJordan:
+    """
+    Parity constraints as the rows of a GF(2) matrix, with one Python int bit mask per row
+    over the columns of their variables, kept in reduced row echelon form: every row has a
+    pivot column no other row contains.
+
+    The elimination is incremental in the way of Han and Jiang's simplex-like Gauss-Jordan
+    elimination. Whenever the pivot variable of a row is assigned, another unassigned variable
+    of the row becomes its pivot and is eliminated from every other row. Rows only ever change
+    by adding other rows, so the matrix stays equivalent to the constraints and nothing needs
+    undoing on backtracks. As long as each row has its pivot unassigned, a combination of rows
+    has at least two unassigned variables, so checking single rows finds every implied
+    literal and every conflict.
+
+    The assignment is kept as two masks over the columns, of the assigned and of the true
+    variables. propagate() is given the literals assigned since its last call and unassign()
+    those a backtrack undid, so neither walks every column.
+    """
+
+    def __init__(self, constraints: Iterable[XorConstraint]):
+        self.constraints = list(constraints)
+        self._vars = sorted({var for xor in self.constraints for var in xor.variables})
+        column = {var: col for col, var in enumerate(self._vars)}
+        self._column = column
+        self._assigned = 0
+        self._true = 0
+        self.ok = True
+
+        rows: list[int] = []
+        parity: list[int] = []
+        for xor in self.constraints:
+            row = 0
+            for var in xor.variables:
+                row ^= 1 << column[var]
+            rows.append(row)
+            parity.append(int(xor.parity))
+
+        self._rows: list[int] = []
+        self._parity: list[int] = []
+        self._pivots: list[int] = []  # bit of the pivot column of each row
+        for row, odd in zip(rows, parity):
+            for other, other_odd, pivot in zip(self._rows, self._parity, self._pivots):
+                if row & pivot:
+                    row ^= other
+                    odd ^= other_odd
+            if row == 0:
+                self.ok = self.ok and not odd  # 0 = 1 if odd
+                continue
+            pivot = row & -row
+            for i in range(len(self._rows)):
+                if self._rows[i] & pivot:
+                    self._rows[i] ^= row
+                    self._parity[i] ^= odd
+            self._rows.append(row)
+            self._parity.append(odd)
+            self._pivots.append(pivot)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def variables(self) -> list[int]:
+        return list(self._vars)
+
+    def _clause(self, row: int, true: int, implied: int = 0) -> list[int]:
+        """The literals of row's variables false under the assignment true, after the one of the implied bit if given"""
+        clause = []
+        head = []
+        variables = self._vars
+        while row:
+            bit = row & -row
+            row ^= bit
+            var = variables[bit.bit_length() - 1]
+            lit = -var if true & bit else var
+            if bit == implied:
+                head.append(-lit)  # it has just been set true in true
+            else:
+                clause.append(lit)
+        return head + clause
+
+    def unassign(self, lits: Iterable[int]) -> None:
+        """Forgets the assignments of lits, e.g. those undone by a backtrack"""
+        column = self._column
+        cleared = 0
+        for lit in lits:
+            col = column.get(abs(lit))
+            if col is not None:
+                cleared |= 1 << col
+        self._assigned &= ~cleared
+        self._true &= ~cleared
+
+    def propagate(self, lits: Iterable[int]) -> tuple[list[list[int]], list[int] | None]:
+        """
+        Adds the newly assigned literals lits, then checks the rows. Returns the implied
+        literals, each as the clause that explains it (the literal first, the rest false), and a
+        clause with every literal false if a row is violated, else None. Implied literals count
+        as assigned from then on.
+        """
+        rows, parity, pivots, column = self._rows, self._parity, self._pivots, self._column
+        assigned, true = self._assigned, self._true
+        for lit in lits:
+            col = column.get(abs(lit))
+            if col is not None:
+                assigned |= 1 << col
+                if lit > 0:
+                    true |= 1 << col
+
+        implied: list[list[int]] = []
+        changed = True
+        while changed:
+            changed = False
+            for i in range(len(rows)):
+                row = rows[i]
+                free = row & ~assigned
+                if free == 0:
+                    if (row & true).bit_count() & 1 != parity[i]:
+                        self._assigned, self._true = assigned, true
+                        return implied, self._clause(row, true)
+                    continue
+                if free & (free - 1) == 0:
+                    # One unassigned variable left, which must give the row its parity
+                    assigned |= free
+                    if (row & true).bit_count() & 1 != parity[i]:
+                        true |= free
+                    implied.append(self._clause(row, true, free))
+                    changed = True
+                    continue
+                if not free & pivots[i]:
+                    pivot = free & -free
+                    pivots[i] = pivot
+                    for j in range(len(rows)):
+                        if j != i and rows[j] & pivot:
+                            rows[j] ^= row
+                            parity[j] ^= parity[i]
+                            changed = True
+        self._assigned, self._true = assigned, true
+        return implied, None